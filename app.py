@@ -23,9 +23,12 @@ st.set_page_config(
 # Initialize services
 @st.cache_resource
 def init_services():
-    weather_service = WeatherService()
+    # Serve forecasts up to 10 minutes past expiry while they refresh in the background
+    weather_service = WeatherService(max_staleness=600)
     crop_recommendations = CropRecommendations()
     price_service = PriceService()
+    # Today's forecasts fill in while the first page renders
+    price_service.start_precompute()
     return weather_service, crop_recommendations, price_service
 
 weather_service, crop_recommendations, price_service = init_services()
@@ -81,6 +84,7 @@ if location_method == "🔍 Search by Place Name":
                 
                 if st.sidebar.button("📍 Use This Location", type="primary"):
                     selected_location = search_results[selected_idx]
+                    weather_service.remember_location(selected_location)
                     st.session_state.selected_latitude = selected_location['latitude']
                     st.session_state.selected_longitude = selected_location['longitude'] 
                     st.session_state.selected_location_name = selected_location['name']
@@ -241,6 +245,7 @@ growth_stage = st.sidebar.selectbox(
 # Refresh button
 if st.sidebar.button("🔄 Refresh Weather Data"):
     st.cache_data.clear()
+    weather_service.clear_cache()
     st.rerun()
 
 # Auto-refresh toggle
@@ -257,14 +262,18 @@ with tab1:
     try:
         # Fetch weather data
         with st.spinner("Fetching weather data..."):
-            current_weather = weather_service.get_current_weather(latitude, longitude)
-            daily_forecast = weather_service.get_daily_forecast(latitude, longitude, days=7)
-            hourly_forecast = weather_service.get_hourly_forecast(latitude, longitude, hours=24)
+            weather_bundle = weather_service.get_weather_bundle(latitude, longitude, days=7, hours=24)
+            current_weather = weather_bundle["current"] if weather_bundle else None
+            daily_forecast = weather_bundle["daily"] if weather_bundle else None
+            hourly_forecast = weather_bundle["hourly"] if weather_bundle else None
     
         if current_weather and daily_forecast and hourly_forecast:
             # Current conditions section with enhanced location info
             st.header(f"🏠 Current Conditions - {location_name}")
-            st.caption(f"📍 Coordinates: {latitude:.4f}°, {longitude:.4f}°")
+            grid_cell = weather_bundle["grid_cell"]
+            st.caption(f"📍 Coordinates: {latitude:.4f}°, {longitude:.4f}° · "
+                       f"Forecast grid cell: {grid_cell['latitude']:.3f}°, {grid_cell['longitude']:.3f}° · "
+                       f"Updated {weather_bundle['age_seconds'] / 60:.0f} min ago")
         
             col1, col2, col3, col4 = st.columns(4)
         
@@ -297,16 +306,19 @@ with tab1:
                 )
         
             # Weather alerts
-            alerts = weather_service.check_weather_alerts(current_weather, daily_forecast[0])
+            alerts = weather_service.check_weather_alerts(current_weather, daily_forecast, hourly_forecast)
             if alerts:
                 st.header("⚠️ Weather Alerts")
                 for alert in alerts:
+                    message = f"**{alert['type']}**: {alert['message']}"
+                    if 'start' in alert:
+                        message += f" ({alert['start'].replace('T', ' ')} → {alert['end'].replace('T', ' ')})"
                     if alert['severity'] == 'warning':
-                        st.warning(f"**{alert['type']}**: {alert['message']}")
+                        st.warning(message)
                     elif alert['severity'] == 'error':
-                        st.error(f"**{alert['type']}**: {alert['message']}")
+                        st.error(message)
                     else:
-                        st.info(f"**{alert['type']}**: {alert['message']}")
+                        st.info(message)
             
             # Crop recommendations
             st.header(f"🌱 Recommendations for {crop_type} ({growth_stage})")
@@ -346,10 +358,8 @@ with tab1:
             with col1:
                 # Temperature trend
                 st.subheader("📈 24-Hour Temperature Trend")
-                temp_df = pd.DataFrame({
-                    'Time': [datetime.fromisoformat(h['time'].replace('Z', '+00:00')) for h in hourly_forecast],
-                    'Temperature': [h['temperature'] for h in hourly_forecast]
-                })
+                hourly_df = hourly_forecast.to_dataframe(parse_times=True)
+                temp_df = hourly_df.rename(columns={'time': 'Time', 'temperature': 'Temperature'})
                 
                 fig_temp = px.line(temp_df, x='Time', y='Temperature', 
                                   title='Temperature (°C)',
@@ -360,10 +370,7 @@ with tab1:
             with col2:
                 # Precipitation forecast
                 st.subheader("🌧️ 24-Hour Precipitation Forecast")
-                precip_df = pd.DataFrame({
-                    'Time': [datetime.fromisoformat(h['time'].replace('Z', '+00:00')) for h in hourly_forecast],
-                    'Precipitation': [h['precipitation'] for h in hourly_forecast]
-                })
+                precip_df = hourly_df.rename(columns={'time': 'Time', 'precipitation': 'Precipitation'})
                 
                 fig_precip = px.bar(precip_df, x='Time', y='Precipitation',
                                    title='Precipitation (mm)',
@@ -374,20 +381,16 @@ with tab1:
             
             # 7-day forecast
             st.header("📅 7-Day Forecast")
-            forecast_data = []
-            for day in daily_forecast:
-                date = datetime.fromisoformat(day['date'])
-                forecast_data.append({
-                    'Date': date.strftime('%m/%d'),
-                    'Day': date.strftime('%A'),
-                    'High': f"{day['temp_max']:.0f}°C",
-                    'Low': f"{day['temp_min']:.0f}°C",
-                    'Precipitation': f"{day['precipitation']:.1f}mm",
-                    'Humidity': f"{day['humidity']:.0f}%",
-                    'Wind': f"{day['wind_speed']:.0f} km/h"
-                })
-            
-            forecast_df = pd.DataFrame(forecast_data)
+            daily_df = daily_forecast.to_dataframe(parse_times=True)
+            forecast_df = pd.DataFrame({
+                'Date': daily_df['date'].dt.strftime('%m/%d'),
+                'Day': daily_df['date'].dt.strftime('%A'),
+                'High': daily_df['temp_max'].map("{:.0f}°C".format),
+                'Low': daily_df['temp_min'].map("{:.0f}°C".format),
+                'Precipitation': daily_df['precipitation'].map("{:.1f}mm".format),
+                'Humidity': daily_df['humidity'].map("{:.0f}%".format),
+                'Wind': daily_df['wind_speed'].map("{:.0f} km/h".format)
+            })
             st.dataframe(forecast_df, width="stretch", hide_index=True)
             
             # Growing conditions summary
@@ -460,7 +463,7 @@ with tab2:
     
     with col1:
         st.markdown("#### 📈 Historical Price Trend (30 Days)")
-        historical_data = price_service.generate_historical_data(crop_type, 30)
+        historical_data = price_service.historical_prices(crop_type, 30)
         if historical_data is not None:
             # Create enhanced historical price chart
             fig_history = go.Figure()
@@ -581,8 +584,8 @@ with tab2:
             ))
             
             # Add confidence interval
-            upper_bound = predictions['Predicted_Price'] * 1.08
-            lower_bound = predictions['Predicted_Price'] * 0.92
+            upper_bound = predictions['Upper']
+            lower_bound = predictions['Lower']
             
             fig_forecast.add_trace(go.Scatter(
                 x=predictions['Date'],
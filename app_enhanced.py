@@ -22,6 +22,7 @@ from irrigation_calculator import IrrigationCalculator
 from farm_calendar import FarmCalendar
 from crop_rotation import CropRotationPlanner
 from fertilizer_calculator import FertilizerCalculator
+from gdd_accumulator import GDDAccumulator
 
 # Page configuration
 st.set_page_config(
@@ -109,20 +110,23 @@ else:
 # Initialize services
 @st.cache_resource
 def init_services():
-    weather_service = WeatherService()
+    weather_service = WeatherService(max_staleness=600)
     crop_recommendations = CropRecommendations()
     price_service = PriceService()
+    # Today's forecasts fill in while the first page renders
+    price_service.start_precompute()
     unit_converter = UnitConverter()
     financial_calc = FinancialCalculator()
     irrigation_calc = IrrigationCalculator()
     farm_calendar = FarmCalendar()
-    rotation_planner = CropRotationPlanner()
+    rotation_planner = CropRotationPlanner(financial_calc)
     fertilizer_calc = FertilizerCalculator()
+    gdd_tracker = GDDAccumulator()
     return (weather_service, crop_recommendations, price_service, unit_converter,
-            financial_calc, irrigation_calc, farm_calendar, rotation_planner, fertilizer_calc)
+            financial_calc, irrigation_calc, farm_calendar, rotation_planner, fertilizer_calc, gdd_tracker)
 
 (weather_service, crop_recommendations, price_service, unit_converter,
- financial_calc, irrigation_calc, farm_calendar, rotation_planner, fertilizer_calc) = init_services()
+ financial_calc, irrigation_calc, farm_calendar, rotation_planner, fertilizer_calc, gdd_tracker) = init_services()
 
 # Main header
 col1, col2 = st.columns([6, 1])
@@ -177,6 +181,7 @@ if location_method == "🔍 Search by Place Name":
                 
                 if st.sidebar.button("📍 Use This Location", type="primary"):
                     selected_location = search_results[selected_idx]
+                    weather_service.remember_location(selected_location)
                     st.session_state.selected_latitude = selected_location['latitude']
                     st.session_state.selected_longitude = selected_location['longitude']
                     st.session_state.selected_location_name = selected_location['name']
@@ -349,8 +354,7 @@ with tabs[0]:
         if st.button("📥 Export Weather Data"):
             forecast = weather_service.get_daily_forecast(latitude, longitude, 7)
             if forecast:
-                df = pd.DataFrame(forecast)
-                csv = df.to_csv(index=False)
+                csv = forecast.to_csv()
                 st.download_button(
                     "Download CSV",
                     csv,
@@ -500,6 +504,30 @@ with tabs[4]:
                     st.write("**Activities:**")
                     for activity in stage['activities']:
                         st.write(f"- {activity}")
+            
+            if planting_date < datetime.now().date():
+                # Growth stage by thermal time accumulated since planting
+                base_temp, upper_temp = farm_calendar.thermal_thresholds(crop_type)
+                plot_id = (latitude, longitude, crop_type, planting_date.isoformat())
+                gdd_tracker.register_plot(plot_id, latitude, longitude, planting_date, base_temp, upper_temp)
+                history = weather_service.get_weather_history(
+                    latitude, longitude, planting_date.isoformat(), datetime.now().date().isoformat()
+                )
+                gdd_tracker.load_history(latitude, longitude, history)
+                gdd = gdd_tracker.gdd_since_planting(plot_id)
+                stage = farm_calendar.get_current_stage(
+                    crop_type, datetime.combine(planting_date, datetime.min.time()), gdd
+                )
+                
+                st.subheader("🌡️ Growth by Thermal Time")
+                st.metric("Degree Days Since Planting", f"{gdd:.0f} °C·d",
+                          help=f"Base {base_temp}°C, upper cutoff {upper_temp}°C")
+                st.write(f"**Current Stage:** {stage['current_stage']}")
+                if 'gdd_to_harvest' in stage:
+                    st.write(f"**Degree Days to Harvest:** {stage['gdd_to_harvest']:.0f}")
+                missing_days = gdd_tracker.coverage(plot_id)['missing_days']
+                if missing_days:
+                    st.caption(f"{missing_days} recent day(s) not yet in the weather archive")
     
     with col2:
         st.subheader("🗓️ Best Planting Time")
@@ -515,7 +543,15 @@ with tabs[5]:
     st.header("🔄 Crop Rotation Planner")
     
     rotation_years = st.slider("Plan for how many years?", 2, 5, 3)
-    rotation = rotation_planner.suggest_rotation(crop_type, rotation_years)
+    if st.checkbox("Optimize across all crops (soil health, pests and current prices)"):
+        prices = {}
+        for candidate in rotation_planner.optimizer.default_candidates():
+            price_data = price_service.get_current_price(candidate)
+            if price_data:
+                prices[candidate] = price_data['current']
+        rotation = rotation_planner.optimize_rotation(crop_type, rotation_years, prices=prices)
+    else:
+        rotation = rotation_planner.suggest_rotation(crop_type, rotation_years)
     
     st.subheader("📋 Recommended Rotation Sequence")
     for i, year_plan in enumerate(rotation['rotation_plan']):
@@ -709,4 +745,5 @@ with col2:
 with col3:
     if st.button("🔄 Refresh All"):
         st.cache_data.clear()
+        weather_service.clear_cache()
         st.rerun()
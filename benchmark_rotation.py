@@ -0,0 +1,119 @@
+"""
+Benchmark CropRotationPlanner on many fields.
+
+Usage:
+    python benchmark_rotation.py [--fields 10000] [--years 4] [--plan-years 6] [--candidates 50]
+                                 [--farm-fields 500] [--groups 4] [--processes N]
+
+Each field starts from a random crop in the planner's tables (spelled as
+users type it about a third of the time) and gets a full rotation plan.
+Family and nitrogen lookups are also timed against a linear scan of the
+family lists, which is how they used to be resolved. The optimizer is
+timed on a long plan over a padded candidate list, cold and memoized, and
+the farm planner on many fields with a cereal share cap and a legume rule.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from crop_rotation import CropRotationPlanner
+from farm_planner import FarmRotationPlanner, Field, MaxFamilyShare, RequireFamily
+
+
+def scan_family(planner: CropRotationPlanner, crop: str) -> str:
+    """Family lookup by scanning every family list"""
+    for family, crops in planner.crop_families.items():
+        if crop in crops:
+            return family
+    return "other"
+
+
+def scan_nitrogen(planner: CropRotationPlanner, crop: str) -> str:
+    """Nitrogen category lookup by scanning every category list"""
+    for category, crops in planner.nitrogen_needs.items():
+        if crop in crops:
+            return category
+    return "medium"
+
+
+def field_crops(planner: CropRotationPlanner, fields: int) -> list:
+    """Current crop for each field"""
+    rng = np.random.default_rng(0)
+    names = sorted({crop for crops in planner.crop_families.values() for crop in crops}
+                   | {crop for crops in planner.nitrogen_needs.values() for crop in crops})
+    crops = [names[i] for i in rng.integers(len(names), size=fields)]
+    retyped = rng.random(fields) < 0.3
+    return [crop.lower() if typed else crop for crop, typed in zip(crops, retyped)]
+
+
+def time_lookups(planner: CropRotationPlanner, crops: list, family, nitrogen) -> float:
+    """Milliseconds to look up the family and nitrogen category of every crop"""
+    start = time.perf_counter()
+    for crop in crops:
+        family(crop)
+        nitrogen(crop)
+    return (time.perf_counter() - start) * 1000
+
+
+def time_optimizer(planner: CropRotationPlanner, years: int, candidates: int) -> tuple:
+    """Milliseconds for a cold and a memoized optimizer plan over ``candidates`` crops"""
+    names = planner.optimizer.default_candidates()
+    names = (names + [f"Crop {i}" for i in range(candidates)])[:candidates]
+    prices = {crop: 10.0 + 3 * i for i, crop in enumerate(names[:10])}
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        planner.optimize_rotation(names[0], years, names, prices)
+        timings.append((time.perf_counter() - start) * 1000)
+    return tuple(timings)
+
+
+def time_farm(planner: CropRotationPlanner, crops: list, groups: int, processes: int) -> tuple:
+    """Seconds to plan every field jointly, and the number of constraint violations left"""
+    rng = np.random.default_rng(1)
+    fields = [Field(f"field-{i}", crop, float(rng.uniform(1, 20)), f"group-{i % groups}")
+              for i, crop in enumerate(crops)]
+    constraints = [MaxFamilyShare("cereals", 0.3), RequireFamily("legumes", 4)]
+    result = FarmRotationPlanner(planner).plan(fields, 4, constraints, processes=processes)
+    return result["wall_time"], len(result["violations"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fields", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--plan-years", type=int, default=6)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--farm-fields", type=int, default=500)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    planner = CropRotationPlanner()
+    crops = field_crops(planner, args.fields)
+    # The scan only knows exact names
+    exact = [planner.family_index.name(crop) or crop for crop in crops]
+
+    scan_ms = time_lookups(planner, exact, lambda c: scan_family(planner, c), lambda c: scan_nitrogen(planner, c))
+    index_ms = time_lookups(planner, crops, planner._find_crop_family, planner._find_nitrogen_category)
+
+    start = time.perf_counter()
+    plans = [planner.suggest_rotation(crop, args.years) for crop in crops]
+    plan_ms = (time.perf_counter() - start) * 1000
+    cold_ms, memo_ms = time_optimizer(planner, args.plan_years, args.candidates)
+    farm_s, violations = time_farm(planner, crops[:args.farm_fields], args.groups, args.processes)
+
+    print(f"Fields: {args.fields}, years per plan: {args.years}")
+    print(f"Lookups, linear scan:  {scan_ms:8.2f} ms")
+    print(f"Lookups, indexed:      {index_ms:8.2f} ms")
+    print(f"Rotation plans:        {plan_ms:8.2f} ms ({plan_ms * 1000 / len(plans):.1f} us/field)")
+    print(f"Optimizer, {args.plan_years} years x {args.candidates} crops: {cold_ms:8.2f} ms cold, "
+          f"{memo_ms:.3f} ms memoized")
+    print(f"Farm plan, {args.farm_fields} fields in {args.groups} groups: {farm_s:8.2f} s "
+          f"({violations} violations left)")
+
+
+if __name__ == "__main__":
+    main()
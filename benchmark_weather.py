@@ -0,0 +1,216 @@
+"""
+Benchmark WeatherService against a local Open-Meteo stub server.
+
+Usage:
+    python benchmark_weather.py [--renders 20] [--handshake-ms 30] [--latency-ms 50] [--locations 20] [--farms 500]
+
+The stub answers /forecast with a fixed payload and sleeps once per new
+connection to stand in for the TCP+TLS handshake cost of the real API, and
+once per request to stand in for upstream processing time.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from cache_backend import MemoryCache
+from forecast_frame import ForecastFrame
+from weather_alerts import AlertEngine
+from weather_service import AsyncWeatherService, WeatherService
+
+HOURS = 24
+DAYS = 7
+
+STUB_PAYLOAD = {
+    "latitude": 28.625,
+    "longitude": 77.25,
+    "current": {
+        "time": "2025-01-01T12:00",
+        "temperature_2m": 24.5,
+        "relative_humidity_2m": 55,
+        "precipitation": 0.0,
+        "wind_speed_10m": 8.2,
+        "wind_direction_10m": 270
+    },
+    "daily": {
+        "time": [f"2025-01-{d + 1:02d}" for d in range(DAYS)],
+        "temperature_2m_max": [28.0] * DAYS,
+        "temperature_2m_min": [14.0] * DAYS,
+        "precipitation_sum": [0.0] * DAYS,
+        "wind_speed_10m_max": [12.0] * DAYS,
+        "relative_humidity_2m_mean": [60] * DAYS
+    },
+    "hourly": {
+        "time": [f"2025-01-01T{h:02d}:00" for h in range(HOURS)],
+        "temperature_2m": [22.0] * HOURS,
+        "relative_humidity_2m": [60] * HOURS,
+        "precipitation": [0.0] * HOURS,
+        "wind_speed_10m": [8.0] * HOURS
+    }
+}
+
+
+def start_stub_server(handshake_ms: float, latency_ms: float = 0.0) -> ThreadingHTTPServer:
+    """Start a keep-alive capable stub server on a free local port"""
+    body = json.dumps(STUB_PAYLOAD).encode()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            time.sleep(handshake_ms / 1000)  # Paid once per connection
+            super().setup()
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self):
+            time.sleep(latency_ms / 1000)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class StubServer(ThreadingHTTPServer):
+        request_queue_size = 128  # The default of 5 drops concurrent connects into a 1 s SYN retry
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def render_weather_tab(service: WeatherService, latitude: float, longitude: float):
+    """Issue the same cold-cache calls as the Weather tab in app.py"""
+    service.clear_cache()
+    service.get_current_weather(latitude, longitude)
+    service.get_daily_forecast(latitude, longitude, days=DAYS)
+    service.get_hourly_forecast(latitude, longitude, hours=HOURS)
+
+
+def render_weather_tab_bundled(service: WeatherService, latitude: float, longitude: float):
+    """Fetch the Weather tab's data with one combined request"""
+    service.clear_cache()
+    service.get_weather_bundle(latitude, longitude, days=DAYS, hours=HOURS)
+
+
+def time_renders(service: WeatherService, renders: int, render=render_weather_tab) -> float:
+    """Average milliseconds per cold-cache render"""
+    render(service, 28.6139, 77.2090)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(renders):
+        render(service, 28.6139, 77.2090)
+    return (time.perf_counter() - start) * 1000 / renders
+
+
+async def time_locations(base_url: str, locations: int, concurrent: bool) -> float:
+    """Milliseconds to fetch current weather for distinct locations"""
+    limit = max(locations, 1)
+    async with AsyncWeatherService(pool_size=limit, max_concurrency=limit, per_host_limit=limit,
+                                   cache=MemoryCache()) as service:
+        service.base_url = base_url
+        await service.get_current_weather(0.0, 0.0)  # Warm-up connection
+        coordinates = [(20.0 + i * 0.1, 77.0) for i in range(locations)]
+        start = time.perf_counter()
+        if concurrent:
+            await asyncio.gather(*(service.get_current_weather(lat, lon) for lat, lon in coordinates))
+        else:
+            for lat, lon in coordinates:
+                await service.get_current_weather(lat, lon)
+        return (time.perf_counter() - start) * 1000
+
+
+async def time_herd(base_url: str, callers: int) -> dict:
+    """Concurrent cold-cache callers for the same location; returns the single-flight counters"""
+    async with AsyncWeatherService(cache=MemoryCache()) as service:
+        service.base_url = base_url
+        await asyncio.gather(*(service.get_current_weather(28.6139, 77.2090) for _ in range(callers)))
+        return service.flight_stats()
+
+
+def time_alerts(farms: int, days: int = 16) -> tuple:
+    """Milliseconds to evaluate the default alert rules for ``farms`` synthetic forecasts"""
+    rng = np.random.default_rng(0)
+    hours = np.arange(days * 24)
+    times = (np.datetime64("2025-01-01T00:00") + hours.astype("timedelta64[h]")).astype(str)
+    dates = (np.datetime64("2025-01-01") + np.arange(days).astype("timedelta64[D]")).astype(str)
+    forecasts = {}
+    for farm in range(farms):
+        # Diurnal temperature cycle around a farm-specific mean
+        temperature = rng.uniform(5, 30) + 8 * np.sin((hours % 24 - 9) * np.pi / 12)
+        forecasts[farm] = {
+            "hourly": ForecastFrame({
+                "time": times,
+                "temperature": temperature,
+                "humidity": np.clip(95 - 2 * temperature + rng.normal(0, 5, hours.size), 5, 100),
+                "precipitation": np.where(rng.random(hours.size) < 0.05, rng.gamma(2, 2, hours.size), 0.0),
+                "wind_speed": rng.gamma(2, 6, hours.size)
+            }, "time"),
+            "daily": ForecastFrame({"date": dates, "precipitation": rng.gamma(0.5, 10, days)}, "date")
+        }
+    engine = AlertEngine()
+    start = time.perf_counter()
+    alerts = engine.evaluate_many(forecasts)
+    return (time.perf_counter() - start) * 1000, sum(len(farm_alerts) for farm_alerts in alerts.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renders", type=int, default=20)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--locations", type=int, default=20)
+    parser.add_argument("--farms", type=int, default=500)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.handshake_ms)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    # Baseline: a fresh connection per request, as with module-level requests.get
+    unpooled = WeatherService(max_keepalive=0)
+    unpooled.base_url = base_url
+
+    pooled = WeatherService()
+    pooled.base_url = base_url
+
+    unpooled_ms = time_renders(unpooled, args.renders)
+    pooled_ms = time_renders(pooled, args.renders)
+    bundled_ms = time_renders(pooled, args.renders, render_weather_tab_bundled)
+    unpooled.close()
+    pooled.close()
+    server.shutdown()
+
+    slow_server = start_stub_server(args.handshake_ms, args.latency_ms)
+    slow_url = f"http://127.0.0.1:{slow_server.server_port}"
+    sequential_ms = asyncio.run(time_locations(slow_url, args.locations, concurrent=False))
+    concurrent_ms = asyncio.run(time_locations(slow_url, args.locations, concurrent=True))
+    herd = asyncio.run(time_herd(slow_url, args.locations))
+    slow_server.shutdown()
+    alerts_ms, alert_count = time_alerts(args.farms)
+
+    print(f"Renders: {args.renders}, simulated handshake: {args.handshake_ms:.0f} ms")
+    print(f"New connection per request: {unpooled_ms:8.2f} ms/render")
+    print(f"Pooled keep-alive session:  {pooled_ms:8.2f} ms/render")
+    print(f"Pooled, bundled request:    {bundled_ms:8.2f} ms/render")
+    print(f"Speed-up (pooled):          {unpooled_ms / pooled_ms:8.2f}x")
+    print(f"Speed-up (pooled + bundle): {unpooled_ms / bundled_ms:8.2f}x")
+    print()
+    print(f"Locations: {args.locations}, simulated upstream latency: {args.latency_ms:.0f} ms")
+    print(f"Sequential fetches:         {sequential_ms:8.2f} ms")
+    print(f"Concurrent fetches:         {concurrent_ms:8.2f} ms")
+    print(f"Same-location callers:      {args.locations:8d} -> "
+          f"{herd['issued']} upstream request(s), {herd['coalesced']} coalesced")
+    print()
+    print(f"Alert engine, {args.farms} farms x 16 days hourly: {alerts_ms:8.2f} ms ({alert_count} alerts)")
+
+
+if __name__ == "__main__":
+    main()
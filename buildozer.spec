@@ -13,14 +13,14 @@ package.domain = com.agri
 source.dir = .
 
 # (list) Source files to include (let empty to include all the files)
-source.include_exts = py,png,jpg,kv,atlas,txt
+source.include_exts = py,png,jpg,kv,atlas,txt,csv
 
 # (str) Application versioning (method 1)
 version = 1.0.0
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy,kivymd,requests,pandas,numpy,plotly
+requirements = python3,kivy,kivymd,requests,httpx,httpcore,h11,anyio,sniffio,pandas,numpy,plotly
 
 # (str) Custom source folders for requirements
 # Sets custom source for any requirements with recipes
@@ -0,0 +1,277 @@
+"""Framework-independent cache backends shared by the data services"""
+import os
+import pickle
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+class CacheEntry(NamedTuple):
+    """A cached value with its timestamps (seconds since the epoch)"""
+    value: Any
+    stored_at: float
+    expires_at: float
+    
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+    
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+def make_key(namespace: str, *parts: Any, precision: int = 4) -> str:
+    """Build a cache key, rounding floats so nearly identical coordinates share an entry"""
+    normalized = []
+    for part in parts:
+        if isinstance(part, float):
+            part = f"{round(part, precision):.{precision}f}"
+        normalized.append(str(part))
+    return f"{namespace}:" + "|".join(normalized)
+
+class CacheBackend(ABC):
+    """Base class for TTL caches with hit/miss counters"""
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired"""
+        entry = self.get_entry(key)
+        if entry is None or not entry.is_fresh:
+            return default
+        return entry.value
+    
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry even if expired, as long as it is inside its stale window"""
+        entry = self._get(key)
+        with self._stats_lock:
+            if entry is not None and entry.is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+    
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = 0):
+        """Store a value for ``ttl`` seconds, kept ``stale_ttl`` more seconds for stale reads.
+        
+        ``None`` values are not cached.
+        """
+        if value is not None:
+            now = time.time()
+            self._set(key, CacheEntry(value, now, now + ttl), now + ttl + stale_ttl)
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self)
+        }
+    
+    @abstractmethod
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        """The stored entry, or None if missing or past its stale window"""
+    
+    @abstractmethod
+    def _set(self, key: str, entry: CacheEntry, evict_at: float):
+        """Store ``entry`` until ``evict_at`` (seconds since the epoch)"""
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Drop one entry"""
+    
+    @abstractmethod
+    def clear(self, prefix: str = ""):
+        """Drop every entry whose key starts with ``prefix``"""
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries"""
+
+class MemoryCache(CacheBackend):
+    """In-process TTL cache with least-recently-used eviction"""
+    
+    def __init__(self, max_entries: int = 2048):
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, evict_at = item
+            if evict_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+    
+    def _set(self, key: str, entry: CacheEntry, evict_at: float):
+        with self._lock:
+            self._entries[key] = (entry, evict_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self, prefix: str = ""):
+        with self._lock:
+            if not prefix:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def _private_directory(directory: str) -> str:
+    """Create ``directory`` readable only by this user, refusing one that someone else could write"""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"Cache directory is not a directory: {directory}")
+    if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o077):
+        raise PermissionError(f"Cache directory must be owned by this user with mode 0700: {directory}")
+    return directory
+
+class SQLiteCache(CacheBackend):
+    """On-disk cache that several processes (Streamlit, Kivy, CLI) can share.
+    
+    Values are pickled, so the database file is created readable and writable
+    by its owner only (SQLite gives its journal files the same mode).
+    """
+    
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, path: str, max_entries: int = 20000):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        if hasattr(os, "getuid") and os.stat(path).st_uid != os.getuid():
+            raise PermissionError(f"Cache file is owned by another user: {path}")
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # A cache can always be rebuilt, so an outdated layout is simply dropped
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS cache")
+            self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL, "
+            "evict_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+    
+    def _get(self, key: str) -> Optional[CacheEntry]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at, evict_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[3] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return CacheEntry(pickle.loads(row[0]), row[1], row[2])
+    
+    def _set(self, key: str, entry: CacheEntry, evict_at: float):
+        blob = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, expires_at, evict_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, entry.stored_at, entry.expires_at, evict_at, time.time())
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def clear(self, prefix: str = ""):
+        with self._lock:
+            if prefix:
+                # substr() avoids LIKE wildcards in the prefix
+                self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+            else:
+                self._conn.execute("DELETE FROM cache")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class SharedMemoryCache(SQLiteCache):
+    """SQLite cache on a RAM-backed filesystem (``/dev/shm``) shared by one user's local processes.
+    
+    The file lives in a per-user directory with mode 0700, so other users
+    can neither read it nor plant pickles in it first.
+    """
+    
+    def __init__(self, name: str = "agri_assistant_cache.sqlite", max_entries: int = 20000):
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+        directory = _private_directory(os.path.join(base, f"agri_assistant-{user}"))
+        super().__init__(os.path.join(directory, name), max_entries)
+
+def create_cache(kind: str = "memory", path: Optional[str] = None) -> CacheBackend:
+    """Create a backend by name: ``memory``, ``sqlite`` or ``shm``"""
+    kind = kind.lower()
+    if kind == "memory":
+        return MemoryCache()
+    if kind == "sqlite":
+        return SQLiteCache(path or os.path.join(os.path.expanduser("~"), ".agri_assistant", "cache.sqlite"))
+    if kind == "shm":
+        return SharedMemoryCache()
+    raise ValueError(f"Unknown cache backend: {kind}")
+
+_default_cache: Optional[CacheBackend] = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> CacheBackend:
+    """Process-wide cache shared by all services.
+    
+    Configured with the ``AGRI_CACHE_BACKEND`` (memory/sqlite/shm) and
+    ``AGRI_CACHE_PATH`` environment variables; defaults to in-memory.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = create_cache(
+                os.environ.get("AGRI_CACHE_BACKEND", "memory"),
+                os.environ.get("AGRI_CACHE_PATH")
+            )
+        return _default_cache
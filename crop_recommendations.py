@@ -1,5 +1,6 @@
 from typing import Dict, List
 import streamlit as st
+from crop_registry import CropIndex
 
 class CropRecommendations:
     """Service for providing crop-specific recommendations based on weather conditions"""
@@ -337,12 +338,13 @@ class CropRecommendations:
                 "sensitive_stages": ["flowering"]
             }
         }
+        self.crop_index = CropIndex(self.crop_requirements)
     
     def get_recommendations(self, crop_type: str, growth_stage: str, 
                           current_weather: Dict, daily_forecast: Dict) -> Dict:
         """Generate comprehensive recommendations for the crop"""
         
-        crop_data = self.crop_requirements.get(crop_type, {})
+        crop_data = self.crop_index.get(crop_type, {})
         if not crop_data:
             return self._default_recommendations()
         
@@ -358,7 +360,7 @@ class CropRecommendations:
     def _get_irrigation_advice(self, crop_type: str, growth_stage: str, 
                               current_weather: Dict, daily_forecast: Dict) -> Dict:
         """Determine irrigation needs"""
-        crop_data = self.crop_requirements[crop_type]
+        crop_data = self.crop_index[crop_type]
         
         # Base water needs by crop
         water_needs_multiplier = {
@@ -456,7 +458,7 @@ class CropRecommendations:
         
         # Planting conditions
         if growth_stage.lower() == "planting":
-            crop_data = self.crop_requirements[crop_type]
+            crop_data = self.crop_index[crop_type]
             temp_range = crop_data["temp_range"]
             
             if temp_range[0] <= temp <= temp_range[1] and humidity > 60:
@@ -534,7 +536,7 @@ class CropRecommendations:
                            current_weather: Dict, daily_forecast: Dict) -> List[str]:
         """Generate general farming advice"""
         advice = []
-        crop_data = self.crop_requirements[crop_type]
+        crop_data = self.crop_index[crop_type]
         temp = current_weather["temperature"]
         optimal_temp = crop_data["optimal_temp"]
         
@@ -571,7 +573,7 @@ class CropRecommendations:
     
     def analyze_growing_conditions(self, crop_type: str, current_weather: Dict, daily_forecast: List[Dict]) -> Dict:
         """Analyze overall growing conditions"""
-        crop_data = self.crop_requirements.get(crop_type, {})
+        crop_data = self.crop_index.get(crop_type, {})
         if not crop_data:
             return {"overall": "Unknown", "temperature": "Unknown", "moisture": "Unknown"}
         
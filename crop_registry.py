@@ -0,0 +1,244 @@
+"""Interned crop names: integer crop IDs with alias and fuzzy (trigram) name resolution"""
+import threading
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# Common alternative names -> the display name services use
+CROP_ALIASES = {
+    "Corn": ["maize", "makka"],
+    "Rice": ["paddy", "dhan", "chawal"],
+    "Wheat": ["gehun", "gehu"],
+    "Soybeans": ["soya", "soyabean", "soya bean"],
+    "Groundnut": ["peanut", "peanuts", "moongphali"],
+    "Chickpea": ["gram", "chana", "bengal gram"],
+    "Eggplant": ["brinjal", "baingan", "aubergine"],
+    "Okra": ["ladies finger", "lady finger", "bhindi"],
+    "Peppers": ["capsicum", "shimla mirch"],
+    "Green Chili": ["chilli", "chili", "green chilli", "mirchi"],
+    "Potatoes": ["aloo"],
+    "Onions": ["pyaz", "pyaaz"],
+    "Tomatoes": ["tamatar"],
+    "Sugarcane": ["ganna"],
+    "Cotton": ["kapas"],
+    "Mustard": ["sarson", "rapeseed"],
+    "Coriander": ["dhania"],
+    "Fenugreek": ["methi"],
+    "Turmeric": ["haldi"],
+    "Cauliflower": ["gobi", "phool gobi"],
+    "Cabbage": ["patta gobi", "band gobi"]
+}
+
+# Trigram similarity (Dice coefficient) a fuzzy match needs
+FUZZY_THRESHOLD = 0.6
+
+# Free-text spellings remembered per index before the memo is reset
+RESOLVED_MEMO_SIZE = 4096
+
+def normalize_name(name: str) -> str:
+    """Case-, underscore- and whitespace-insensitive form of a crop name"""
+    return " ".join(str(name).lower().replace("_", " ").replace("-", " ").split())
+
+def name_variants(key: str) -> List[str]:
+    """Singular/plural spellings of a normalized name ("tomato" <-> "tomatoes", "berry" <-> "berries")"""
+    variants = []
+    if key.endswith("ies"):
+        variants.append(key[:-3] + "y")
+    elif key.endswith("es"):
+        variants.extend((key[:-2], key[:-1]))
+    elif key.endswith("s"):
+        variants.append(key[:-1])
+    else:
+        variants.extend((key + "s", key + "es"))
+        if key.endswith("y"):
+            variants.append(key[:-1] + "ies")
+    return variants
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CropRegistry:
+    """Every crop name the services know, interned to a dense integer ID.
+    
+    Exact names, aliases and singular/plural variants resolve with dictionary
+    lookups. Free text typed by a user can also fall back to a trigram index
+    (``fuzzy=True``), so a misspelt "tomatos" still finds "Tomatoes"; service
+    lookups never do, since "Cherry Tomato" is not "Cherry".
+    """
+    
+    def __init__(self, aliases: Optional[Dict[str, List[str]]] = None):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._aliases: Dict[str, int] = {}
+        aliases = CROP_ALIASES if aliases is None else aliases
+        self._pending_aliases = {normalize_name(name): list(spellings) for name, spellings in aliases.items()}
+        # Alias -> the name it stands for, so interning "Maize" before "Corn" still gives one crop
+        self._alias_targets = {normalize_name(alias): name for name, spellings in aliases.items() for alias in spellings}
+        # Every indexed spelling (names and aliases), its crop ID and its trigrams
+        self._spellings: List[Tuple[str, int, int]] = []
+        self._trigrams: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __getstate__(self) -> Dict:
+        # Locks don't pickle; a copy sent to another process gets its own
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def _index_spelling(self, key: str, crop_id: int):
+        grams = trigrams(key)
+        position = len(self._spellings)
+        self._spellings.append((key, crop_id, len(grams)))
+        for gram in grams:
+            self._trigrams.setdefault(gram, []).append(position)
+    
+    def intern(self, name: str) -> int:
+        """ID for ``name``, registering it (and any known aliases) on first sight; an alias gets its crop's ID"""
+        key = normalize_name(name)
+        crop_id = self._ids.get(key)
+        if crop_id is None:
+            crop_id = self._aliases.get(key)
+        if crop_id is not None:
+            return crop_id
+        target = self._alias_targets.get(key)
+        if target is not None and normalize_name(target) != key:
+            return self.intern(target)
+        with self._lock:
+            crop_id = self._ids.get(key)
+            if crop_id is None:
+                crop_id = len(self.names)
+                self.names.append(name)
+                self._ids[key] = crop_id
+                self._index_spelling(key, crop_id)
+                for alias in self._pending_aliases.pop(key, []):
+                    self.add_alias(alias, crop_id)
+            return crop_id
+    
+    def add_alias(self, alias: str, crop_id: int):
+        key = normalize_name(alias)
+        if key not in self._ids and key not in self._aliases:
+            self._aliases[key] = crop_id
+            self._index_spelling(key, crop_id)
+    
+    def name(self, crop_id: int) -> str:
+        return self.names[crop_id]
+    
+    def _exact(self, key: str, candidates) -> Optional[int]:
+        for spelling in [key] + name_variants(key):
+            crop_id = self._ids.get(spelling)
+            if crop_id is None:
+                crop_id = self._aliases.get(spelling)
+            if crop_id is not None and (candidates is None or crop_id in candidates):
+                return crop_id
+        return None
+    
+    def fuzzy(self, name: str, candidates=None, threshold: float = FUZZY_THRESHOLD) -> Optional[int]:
+        """Closest crop by trigram similarity, or None if nothing reaches ``threshold``"""
+        grams = trigrams(normalize_name(name))
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for position in self._trigrams.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        best, best_score = None, threshold
+        for position, count in shared.items():
+            _, crop_id, size = self._spellings[position]
+            if candidates is not None and crop_id not in candidates:
+                continue
+            score = 2 * count / (len(grams) + size)
+            if score >= best_score and (best is None or score > best_score):
+                best, best_score = crop_id, score
+        return best
+    
+    def resolve(self, name: str, candidates=None, fuzzy: bool = False) -> Optional[int]:
+        """ID for a name, alias or plural of a crop, limited to ``candidates`` (a container of IDs) if given.
+        
+        With ``fuzzy`` a name that matches nothing exactly gets the closest
+        spelling instead; only use that for user input.
+        """
+        if not name:
+            return None
+        key = normalize_name(name)
+        crop_id = self._exact(key, candidates)
+        if crop_id is not None or not fuzzy:
+            return crop_id
+        # A crop that is known, just not among the candidates, shouldn't fuzzy-match a different crop
+        if candidates is not None and self._exact(key, None) is not None:
+            return None
+        return self.fuzzy(key, candidates)
+    
+    def canonical(self, name: str, fuzzy: bool = False) -> Optional[str]:
+        """Display name for a known crop, or the closest one to what a user typed with ``fuzzy``"""
+        crop_id = self.resolve(name, fuzzy=fuzzy)
+        return None if crop_id is None else self.names[crop_id]
+
+class CropIndex(Generic[V]):
+    """A service's crop table keyed by crop ID, looked up by whatever name the caller has"""
+    
+    def __init__(self, mapping: Dict[str, V], registry: Optional["CropRegistry"] = None):
+        self.registry = registry if registry is not None else get_crop_registry()
+        self._values: Dict[int, V] = {}
+        for name, value in mapping.items():
+            # An alias listed next to its crop ("Maize" and "Corn") keeps the first entry
+            self._values.setdefault(self.registry.intern(name), value)
+        self._resolved: Dict[str, Optional[int]] = {}
+    
+    def crop_id(self, name: str) -> Optional[int]:
+        """ID of the crop in this table that ``name`` exactly, by alias or by plural refers to; memoized"""
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        crop_id = self.registry.resolve(name, self._values)
+        if len(self._resolved) >= RESOLVED_MEMO_SIZE:
+            self._resolved.clear()
+        self._resolved[name] = crop_id
+        return crop_id
+    
+    def get(self, name: str, default: Optional[V] = None) -> Optional[V]:
+        crop_id = self.crop_id(name)
+        return default if crop_id is None else self._values[crop_id]
+    
+    def get_id(self, crop_id: int, default: Optional[V] = None) -> Optional[V]:
+        return self._values.get(crop_id, default)
+    
+    def name(self, name: str) -> Optional[str]:
+        """Display name of the matching crop in this table"""
+        crop_id = self.crop_id(name)
+        return None if crop_id is None else self.registry.names[crop_id]
+    
+    def __contains__(self, name: str) -> bool:
+        return self.crop_id(name) is not None
+    
+    def __getitem__(self, name: str) -> V:
+        crop_id = self.crop_id(name)
+        if crop_id is None:
+            raise KeyError(name)
+        return self._values[crop_id]
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+    
+    def ids(self) -> Iterable[int]:
+        return self._values.keys()
+
+_default_registry: Optional[CropRegistry] = None
+_default_registry_lock = threading.Lock()
+
+def get_crop_registry() -> CropRegistry:
+    """Process-wide registry shared by every service"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = CropRegistry()
+        return _default_registry
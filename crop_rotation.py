@@ -1,10 +1,13 @@
 """Crop rotation planning for sustainable farming"""
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
+from crop_registry import CropIndex, get_crop_registry
+from financial_calculator import FinancialCalculator
+from rotation_optimizer import RotationOptimizer
 
 class CropRotationPlanner:
     """Plan crop rotations for soil health and pest management"""
     
-    def __init__(self):
+    def __init__(self, financial: Optional[FinancialCalculator] = None):
         # Crop families for rotation planning
         self.crop_families = {
             "legumes": ["Soybeans", "Peas", "Beans", "Groundnut", "Chickpea", "Lentils"],
@@ -25,6 +28,19 @@ class CropRotationPlanner:
             "fixing": ["Soybeans", "Peas", "Beans", "Groundnut", "Chickpea", "Lentils"]  # Nitrogen fixers
         }
         
+        # Inverted indexes: crop -> every family it belongs to, crop -> nitrogen category
+        families_by_crop: Dict[str, Tuple[str, ...]] = {}
+        for family, crops in self.crop_families.items():
+            for crop in crops:
+                families_by_crop[crop] = families_by_crop.get(crop, ()) + (family,)
+        category_by_crop: Dict[str, str] = {}
+        for category, crops in self.nitrogen_needs.items():
+            for crop in crops:
+                category_by_crop.setdefault(crop, category)
+        self.registry = get_crop_registry()
+        self.family_index = CropIndex(families_by_crop, self.registry)
+        self.nitrogen_index = CropIndex(category_by_crop, self.registry)
+        
         # Pest and disease vulnerabilities
         self.pest_concerns = {
             "Wheat": ["rust", "aphids", "stem_borer"],
@@ -35,12 +51,14 @@ class CropRotationPlanner:
             "Tomatoes": ["blight", "whitefly", "fruit_borer"],
             "Potatoes": ["blight", "aphids", "beetle"],
         }
+        
+        self.optimizer = RotationOptimizer(self, financial)
     
     def suggest_rotation(self, current_crop: str, years: int = 3) -> Dict:
         """Suggest crop rotation sequence"""
         
         # Find current crop family
-        current_family = self._find_crop_family(current_crop)
+        current_families = set(self.crop_families_of(current_crop))
         current_n_need = self._find_nitrogen_category(current_crop)
         
         # Rotation principles:
@@ -63,7 +81,7 @@ class CropRotationPlanner:
             candidates = self.nitrogen_needs["fixing"]
         
         # Remove crops from same family
-        candidates = [c for c in candidates if self._find_crop_family(c) != current_family]
+        candidates = [c for c in candidates if current_families.isdisjoint(self.crop_families_of(c))]
         
         if candidates:
             year2_crop = candidates[0]
@@ -73,11 +91,12 @@ class CropRotationPlanner:
             rotation_sequence.append(year2_crop)
         
         # Year 3: Different family again
-        year2_family = self._find_crop_family(year2_crop)
+        used_families = current_families.union(self.crop_families_of(year2_crop))
         candidates = []
         for family, crops in self.crop_families.items():
-            if family != current_family and family != year2_family:
-                candidates.extend(crops)
+            if family not in used_families:
+                # Skip crops that are also in one of the used families (Cabbage is a leafy green too)
+                candidates.extend(c for c in crops if used_families.isdisjoint(self.crop_families_of(c)))
         
         if len(candidates) > 0:
             year3_crop = candidates[0]
@@ -90,37 +109,53 @@ class CropRotationPlanner:
         while len(rotation_sequence) < years:
             rotation_sequence.append(rotation_sequence[0])  # Cycle back
         
-        # Generate detailed plan
+        return self._rotation_details(current_crop, rotation_sequence[:years])
+    
+    def optimize_rotation(self, current_crop: str, years: int = 3, candidates: Optional[Sequence[str]] = None,
+                          prices: Optional[Dict[str, float]] = None) -> Dict:
+        """Best-scoring rotation over all ``years``-long sequences of ``candidates`` (prices in INR/kg)"""
+        plan = self.optimizer.optimize(current_crop, years, candidates, prices)
+        details = self._rotation_details(current_crop, plan.sequence)
+        for year_plan, profit in zip(details["rotation_plan"], plan.profit_per_acre):
+            year_plan["profit_per_acre"] = profit
+        details["score"] = plan.score
+        return details
+    
+    def _rotation_details(self, current_crop: str, rotation_sequence: List[str]) -> Dict:
+        """Year-by-year plan and overall benefits for a rotation sequence"""
         rotation_plan = []
-        for i, crop in enumerate(rotation_sequence[:years]):
+        for i, crop in enumerate(rotation_sequence):
             rotation_plan.append({
                 "year": i + 1,
                 "crop": crop,
                 "family": self._find_crop_family(crop),
+                "families": list(self.crop_families_of(crop)),
                 "nitrogen_need": self._find_nitrogen_category(crop),
                 "benefits": self._get_rotation_benefits(crop, i, rotation_sequence)
             })
         
         return {
             "current_crop": current_crop,
-            "rotation_sequence": rotation_sequence[:years],
+            "rotation_sequence": rotation_sequence,
             "rotation_plan": rotation_plan,
-            "overall_benefits": self._calculate_overall_benefits(rotation_sequence[:years])
+            "overall_benefits": self._calculate_overall_benefits(rotation_sequence)
         }
     
+    def crop_families_of(self, crop: str) -> Tuple[str, ...]:
+        """Every family a crop belongs to, in table order ("other" if none)"""
+        return self.family_index.get(crop, ("other",))
+    
     def _find_crop_family(self, crop: str) -> str:
         """Find which family a crop belongs to"""
-        for family, crops in self.crop_families.items():
-            if crop in crops:
-                return family
-        return "other"
+        return self.crop_families_of(crop)[0]
     
     def _find_nitrogen_category(self, crop: str) -> str:
         """Find nitrogen requirement category"""
-        for category, crops in self.nitrogen_needs.items():
-            if crop in crops:
-                return category
-        return "medium"
+        return self.nitrogen_index.get(crop, "medium")
+    
+    def _same_family(self, crop1: str, crop2: str) -> bool:
+        """Whether two crops share any family"""
+        return not set(self.crop_families_of(crop1)).isdisjoint(self.crop_families_of(crop2))
     
     def _get_rotation_benefits(self, crop: str, year_index: int, sequence: List[str]) -> List[str]:
         """List benefits of this crop in the rotation"""
@@ -134,10 +169,7 @@ class CropRotationPlanner:
         
         if year_index > 0:
             prev_crop = sequence[year_index - 1]
-            prev_family = self._find_crop_family(prev_crop)
-            curr_family = self._find_crop_family(crop)
-            
-            if prev_family != curr_family:
+            if not self._same_family(prev_crop, crop):
                 benefits.append("Breaks pest and disease cycles")
             
             prev_n = self._find_nitrogen_category(prev_crop)
@@ -153,17 +185,17 @@ class CropRotationPlanner:
         """Calculate cumulative benefits of the rotation plan"""
         benefits = []
         
-        families = [self._find_crop_family(c) for c in sequence]
-        if len(set(families)) == len(families):
+        family_sets = [self.crop_families_of(c) for c in sequence]
+        families = set().union(*family_sets)
+        if sum(len(f) for f in family_sets) == len(families):
             benefits.append("✅ Excellent family diversity - minimizes pest buildup")
-        elif len(set(families)) > 1:
+        elif len(families) > 1:
             benefits.append("✅ Good crop diversity")
         
-        has_legume = any(self._find_nitrogen_category(c) == "fixing" for c in sequence)
-        if has_legume:
+        n_categories = {self._find_nitrogen_category(c) for c in sequence}
+        if "fixing" in n_categories:
             benefits.append("✅ Includes nitrogen-fixing crops - reduces fertilizer needs")
         
-        n_categories = [self._find_nitrogen_category(c) for c in sequence]
         if "high" in n_categories and "fixing" in n_categories:
             benefits.append("✅ Balanced nitrogen management")
         
@@ -175,9 +207,6 @@ class CropRotationPlanner:
     def check_compatibility(self, crop1: str, crop2: str) -> Dict:
         """Check if two crops are compatible for succession"""
         
-        family1 = self._find_crop_family(crop1)
-        family2 = self._find_crop_family(crop2)
-        
         n1 = self._find_nitrogen_category(crop1)
         n2 = self._find_nitrogen_category(crop2)
         
@@ -185,7 +214,7 @@ class CropRotationPlanner:
         reasons = []
         
         # Family diversity
-        if family1 != family2:
+        if not self._same_family(crop1, crop2):
             compatibility_score += 30
             reasons.append("✅ Different plant families - good for pest management")
         else:
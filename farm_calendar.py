@@ -1,12 +1,15 @@
 """Farm calendar and crop scheduling system"""
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+from crop_registry import CropIndex
 
 class FarmCalendar:
     """Manage planting schedules, growth stages, and harvest timing"""
     
     def __init__(self):
-        # Crop duration and stages (in days)
+        # Crop duration and stages (in days). base_temp/upper_temp (°C) bound the
+        # temperatures that count towards growing degree days; gdd_to_maturity is
+        # the thermal time the full schedule represents.
         self.crop_schedules = {
             "Wheat": {
                 "total_days": 120,
@@ -20,6 +23,9 @@ class FarmCalendar:
                     "maturation": 15
                 },
                 "best_sowing_months": [10, 11, 12],  # Oct-Dec
+                "base_temp": 0,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1900,
             },
             "Rice": {
                 "total_days": 130,
@@ -32,6 +38,9 @@ class FarmCalendar:
                     "maturation": 10
                 },
                 "best_sowing_months": [6, 7, 8],  # Jun-Aug
+                "base_temp": 10,
+                "upper_temp": 35,
+                "gdd_to_maturity": 1700,
             },
             "Corn": {
                 "total_days": 100,
@@ -45,6 +54,9 @@ class FarmCalendar:
                     "maturation": 8
                 },
                 "best_sowing_months": [2, 3, 7, 8],
+                "base_temp": 10,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1400,
             },
             "Cotton": {
                 "total_days": 180,
@@ -58,6 +70,9 @@ class FarmCalendar:
                     "maturation": 17
                 },
                 "best_sowing_months": [4, 5, 6],
+                "base_temp": 15.5,
+                "upper_temp": 32,
+                "gdd_to_maturity": 1300,
             },
             "Tomatoes": {
                 "total_days": 90,
@@ -70,6 +85,9 @@ class FarmCalendar:
                     "harvest": 5
                 },
                 "best_sowing_months": [1, 2, 7, 8, 9],
+                "base_temp": 10,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1100,
             },
             "Potatoes": {
                 "total_days": 90,
@@ -82,6 +100,9 @@ class FarmCalendar:
                     "maturation": 11
                 },
                 "best_sowing_months": [10, 11, 1],
+                "base_temp": 7,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1300,
             },
             "Soybeans": {
                 "total_days": 110,
@@ -95,6 +116,9 @@ class FarmCalendar:
                     "maturation": 8
                 },
                 "best_sowing_months": [6, 7],
+                "base_temp": 10,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1300,
             },
             "Sugarcane": {
                 "total_days": 360,
@@ -107,6 +131,9 @@ class FarmCalendar:
                     "maturation": 100
                 },
                 "best_sowing_months": [2, 3, 9, 10],
+                "base_temp": 12,
+                "upper_temp": 35,
+                "gdd_to_maturity": 4000,
             },
             "Onions": {
                 "total_days": 120,
@@ -118,19 +145,23 @@ class FarmCalendar:
                     "maturation": 10
                 },
                 "best_sowing_months": [10, 11, 12],
+                "base_temp": 5,
+                "upper_temp": 30,
+                "gdd_to_maturity": 1700,
             },
         }
+        self.crop_index = CropIndex(self.crop_schedules)
     
     def create_schedule(self, crop: str, planting_date: datetime = None) -> Dict:
         """Create a complete farming schedule from planting to harvest"""
         
-        if crop not in self.crop_schedules:
+        if crop not in self.crop_index:
             return {"error": f"Crop '{crop}' not found in database"}
         
         if planting_date is None:
             planting_date = datetime.now()
         
-        schedule_data = self.crop_schedules[crop]
+        schedule_data = self.crop_index[crop]
         stages = schedule_data["stages"]
         
         # Calculate dates for each stage
@@ -279,10 +310,20 @@ class FarmCalendar:
                  "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
         return [months[m-1] for m in month_numbers]
     
-    def get_current_stage(self, crop: str, planting_date: datetime) -> Dict:
-        """Determine current growth stage based on planting date"""
+    def thermal_thresholds(self, crop: str) -> Tuple[float, Optional[float]]:
+        """Base and upper temperatures (°C) for the crop's growing degree days"""
+        schedule_data = self.crop_index[crop]
+        return schedule_data["base_temp"], schedule_data.get("upper_temp")
+    
+    def get_current_stage(self, crop: str, planting_date: datetime, accumulated_gdd: Optional[float] = None) -> Dict:
+        """Determine current growth stage based on planting date.
+        
+        With ``accumulated_gdd`` (degree days since planting, e.g. from
+        GDDAccumulator) the stage follows thermal time: each stage spans the
+        same share of ``gdd_to_maturity`` as of the calendar schedule.
+        """
         
-        if crop not in self.crop_schedules:
+        if crop not in self.crop_index:
             return {"error": f"Crop '{crop}' not found"}
         
         days_since_planting = (datetime.now() - planting_date).days
@@ -290,9 +331,12 @@ class FarmCalendar:
         if days_since_planting < 0:
             return {"stage": "Not yet planted", "days_since_planting": days_since_planting}
         
-        schedule_data = self.crop_schedules[crop]
+        schedule_data = self.crop_index[crop]
         stages = schedule_data["stages"]
         
+        if accumulated_gdd is not None:
+            return self._get_thermal_stage(crop, accumulated_gdd, days_since_planting)
+        
         cumulative_days = 0
         for stage_name, duration in stages.items():
             cumulative_days += duration
@@ -318,16 +362,47 @@ class FarmCalendar:
             "message": "Crop should have been harvested"
         }
     
+    def _get_thermal_stage(self, crop: str, accumulated_gdd: float, days_since_planting: int) -> Dict:
+        """Growth stage from degree days accumulated since planting"""
+        schedule_data = self.crop_index[crop]
+        gdd_per_day = schedule_data["gdd_to_maturity"] / schedule_data["total_days"]
+        
+        cumulative_gdd = 0
+        for stage_name, duration in schedule_data["stages"].items():
+            stage_gdd = duration * gdd_per_day
+            cumulative_gdd += stage_gdd
+            if accumulated_gdd < cumulative_gdd:
+                gdd_in_stage = stage_gdd - (cumulative_gdd - accumulated_gdd)
+                
+                return {
+                    "crop": crop,
+                    "current_stage": stage_name.replace("_", " ").title(),
+                    "days_since_planting": days_since_planting,
+                    "gdd_since_planting": accumulated_gdd,
+                    "stage_progress_percent": (gdd_in_stage / stage_gdd) * 100,
+                    "gdd_to_next_stage": stage_gdd - gdd_in_stage,
+                    "gdd_to_harvest": schedule_data["gdd_to_maturity"] - accumulated_gdd,
+                    "activities": self._get_stage_activities(crop, stage_name)
+                }
+        
+        return {
+            "crop": crop,
+            "current_stage": "Ready for Harvest / Overdue",
+            "days_since_planting": days_since_planting,
+            "gdd_since_planting": accumulated_gdd,
+            "message": "Crop has accumulated enough thermal time to be harvested"
+        }
+    
     def recommend_planting_date(self, crop: str, location_month: int = None) -> Dict:
         """Recommend best planting dates for a crop"""
         
-        if crop not in self.crop_schedules:
+        if crop not in self.crop_index:
             return {"error": f"Crop '{crop}' not found"}
         
         if location_month is None:
             location_month = datetime.now().month
         
-        schedule_data = self.crop_schedules[crop]
+        schedule_data = self.crop_index[crop]
         best_months = schedule_data["best_sowing_months"]
         
         # Find nearest recommended month
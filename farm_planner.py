@@ -0,0 +1,212 @@
+"""Rotation planning for many fields at once under farm-wide acreage and rotation constraints"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import numpy as np
+from crop_rotation import CropRotationPlanner
+
+# Objective points lost per violation unit: a field missing a required family in one
+# window, a share limit exceeded in one year, and each percent of acreage over it
+PENALTY = 1000.0
+
+# Full passes over every (field, year) before local search gives up
+MAX_SWEEPS = 20
+
+class Field(NamedTuple):
+    """A field to plan; constraints apply across the fields of one group"""
+    name: str
+    current_crop: str
+    acres: float
+    group: str = "farm"
+
+class MaxFamilyShare(NamedTuple):
+    """At most ``share`` of a group's acreage in ``family`` in any planned year"""
+    family: str
+    share: float
+
+class RequireFamily(NamedTuple):
+    """Every field grows ``family`` at least once in any ``years`` consecutive years, current crop included"""
+    family: str
+    years: int
+
+class FarmRotationPlanner:
+    """Plan rotations for every field of a farm jointly.
+    
+    Each field starts from its own best plan (``RotationOptimizer``), then
+    local search repairs the shared constraints: it sweeps over every
+    (field, year), scores all candidate crops for that cell at once (the
+    field's rotation score minus ``penalty`` per violation) and keeps the
+    best, until a sweep changes nothing. Groups share no constraints, so
+    they are solved independently, on a process pool when there are several.
+    """
+    
+    def __init__(self, planner: Optional[CropRotationPlanner] = None, penalty: float = PENALTY,
+                 max_sweeps: int = MAX_SWEEPS):
+        self.planner = planner if planner is not None else CropRotationPlanner()
+        self.optimizer = self.planner.optimizer
+        self.penalty = penalty
+        self.max_sweeps = max_sweeps
+    
+    def plan(self, fields: Sequence[Field], years: int = 4, constraints: Sequence = (),
+             candidates: Optional[Sequence[str]] = None, prices: Optional[Dict[str, float]] = None,
+             processes: Optional[int] = None) -> Dict:
+        """Per-field plans for the next ``years`` seasons plus acreage per year (prices in INR/kg)"""
+        if not fields:
+            return {"status": "error", "message": "No fields to plan"}
+        unknown = [c.family for c in constraints if c.family not in self.planner.crop_families]
+        if unknown:
+            return {"status": "error", "message": f"Unknown crop families: {', '.join(unknown)}"}
+        
+        start = time.perf_counter()
+        candidates = list(dict.fromkeys(candidates or self.optimizer.default_candidates()))
+        groups: Dict[str, List[Field]] = {}
+        for field in fields:
+            groups.setdefault(field.group, []).append(field)
+        
+        jobs = [(group, years, list(constraints), candidates, prices) for group in groups.values()]
+        processes = min(processes or os.cpu_count() or 1, len(jobs))
+        if processes > 1:
+            # Workers get a copy of this planner, so weights, costs and penalties match the serial path
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_plan_group_job, jobs))
+        else:
+            results = [self.plan_group(*job) for job in jobs]
+        
+        field_plans = [field_plan for result in results for field_plan in result["fields"]]
+        acreage = {year: {} for year in range(1, years + 1)}
+        family_acreage = {year: {} for year in range(1, years + 1)}
+        for field_plan in field_plans:
+            for year, crop in enumerate(field_plan["rotation_sequence"], 1):
+                acreage[year][crop] = acreage[year].get(crop, 0) + field_plan["acres"]
+                for family in self.planner.crop_families_of(crop):
+                    family_acreage[year][family] = family_acreage[year].get(family, 0) + field_plan["acres"]
+        
+        return {
+            "status": "success",
+            "years": years,
+            "plans": {field_plan["field"]: field_plan["rotation_sequence"] for field_plan in field_plans},
+            "fields": field_plans,
+            "acreage": acreage,
+            "family_acreage": family_acreage,
+            "violations": [violation for result in results for violation in result["violations"]],
+            "score": sum(result["score"] for result in results),
+            "wall_time": time.perf_counter() - start
+        }
+    
+    def plan_group(self, fields: Sequence[Field], years: int, constraints: Sequence,
+                   candidates: Sequence[str], prices: Optional[Dict[str, float]] = None) -> Dict:
+        """Jointly plan one group of fields that share ``constraints``"""
+        candidates = tuple(candidates)
+        # Candidates first, so crop index < len(candidates) means "can be planted"
+        crops = tuple(dict.fromkeys(candidates + tuple(field.current_crop for field in fields)))
+        index = {crop: i for i, crop in enumerate(crops)}
+        choices = len(candidates)
+        next_year, two_years = self.optimizer.score_tables(crops)
+        unary = np.zeros(len(crops))
+        unary[:choices] = self.optimizer.profit_scores(candidates, prices)[1]
+        
+        # plan[f, 0] is the current crop, plan[f, 1:] the planned years
+        plan = np.empty((len(fields), years + 1), dtype=np.intp)
+        for f, field in enumerate(fields):
+            sequence = self.optimizer.optimize(field.current_crop, years + 1, candidates, prices).sequence
+            plan[f] = [index[crop] for crop in sequence]
+        
+        acres = np.array([field.acres for field in fields], dtype=np.float64)
+        total_acres = acres.sum() or 1.0
+        shares = [c for c in constraints if isinstance(c, MaxFamilyShare)]
+        required = [c for c in constraints if isinstance(c, RequireFamily)]
+        families_of = [set(self.planner.crop_families_of(crop)) for crop in crops]
+        share_members = np.array([[c.family in families for c in shares] for families in families_of],
+                                 dtype=np.float64).reshape(len(crops), len(shares))
+        limits = np.array([c.share * total_acres for c in shares])
+        # Acres per (planned year, share-limited family)
+        family_acres = np.stack([(share_members[plan[:, t]] * acres[:, None]).sum(axis=0)
+                                 for t in range(years + 1)])
+        required_members = [np.array([c.family in families for families in families_of]) for c in required]
+        
+        def cell_objective(f: int, t: int) -> np.ndarray:
+            """Objective change for each candidate crop at plan[f, t], up to a constant"""
+            s = plan[f]
+            value = next_year[s[t - 1], :choices] + unary[:choices]
+            if t >= 2:
+                value = value + two_years[s[t - 2], :choices]
+            if t + 1 <= years:
+                value = value + next_year[:choices, s[t + 1]]
+            if t + 2 <= years:
+                value = value + two_years[:choices, s[t + 2]]
+            
+            if shares:
+                others = family_acres[t] - acres[f] * share_members[s[t]]
+                excess = np.maximum(others + acres[f] * share_members[:choices] - limits, 0)
+                # Any excess at all counts as one violation, so small overshoots aren't traded for score
+                units = (100 * excess / total_acres + (excess > 1e-9)).sum(axis=1)
+                value = value - self.penalty * units
+            for constraint, members in zip(required, required_members):
+                window = min(constraint.years, years + 1)
+                missing = 0
+                for first in range(max(0, t - window + 1), min(t, years + 1 - window) + 1):
+                    others = [s[i] for i in range(first, first + window) if i != t]
+                    missing += not members[others].any()
+                if missing:
+                    value = value - self.penalty * missing * ~members[:choices]
+            return value
+        
+        for _ in range(self.max_sweeps):
+            changed = False
+            for f in range(len(fields)):
+                for t in range(1, years + 1):
+                    value = cell_objective(f, t)
+                    old, new = plan[f, t], int(value.argmax())
+                    if new != old and value[new] > value[old] + 1e-9:
+                        family_acres[t] += acres[f] * (share_members[new] - share_members[old])
+                        plan[f, t] = new
+                        changed = True
+            if not changed:
+                break
+        
+        field_plans = []
+        for f, field in enumerate(fields):
+            s = plan[f]
+            score = sum(next_year[s[t - 1], s[t]] + unary[s[t]] + (two_years[s[t - 2], s[t]] if t >= 2 else 0)
+                        for t in range(1, years + 1))
+            field_plans.append({
+                "field": field.name,
+                "group": field.group,
+                "current_crop": field.current_crop,
+                "acres": field.acres,
+                "rotation_sequence": [crops[i] for i in s[1:]],
+                "score": float(score)
+            })
+        
+        violations = []
+        for k, constraint in enumerate(shares):
+            for t in range(1, years + 1):
+                if family_acres[t, k] > limits[k] + 1e-9:
+                    violations.append(f"{fields[0].group}, year {t}: {constraint.family} on "
+                                      f"{family_acres[t, k] / total_acres:.0%} of acreage "
+                                      f"(limit {constraint.share:.0%})")
+        for constraint, members in zip(required, required_members):
+            window = min(constraint.years, years + 1)
+            for f, field in enumerate(fields):
+                for first in range(years + 2 - window):
+                    if not members[plan[f, first:first + window]].any():
+                        violations.append(f"{field.name}: no {constraint.family} in years "
+                                          f"{first}-{first + window - 1} (year 0 is the current crop)")
+        
+        return {
+            "fields": field_plans,
+            "violations": violations,
+            "score": sum(field_plan["score"] for field_plan in field_plans)
+        }
+
+_worker_planner: Optional[FarmRotationPlanner] = None
+
+def _init_worker(planner: FarmRotationPlanner):
+    """Pool initializer: keep the caller's planner for this process"""
+    global _worker_planner
+    _worker_planner = planner
+
+def _plan_group_job(job) -> Dict:
+    """Pool worker: plan one group with the caller's planner"""
+    return _worker_planner.plan_group(*job)
@@ -1,5 +1,6 @@
 """Fertilizer calculation and NPK recommendations"""
 from typing import Dict, List
+from crop_registry import CropIndex
 
 class FertilizerCalculator:
     """Calculate fertilizer requirements and NPK ratios"""
@@ -20,6 +21,7 @@ class FertilizerCalculator:
             "Groundnut": {"N": 15, "P": 40, "K": 30},
             "Chickpea": {"N": 15, "P": 30, "K": 20},
         }
+        self.crop_index = CropIndex(self.crop_npk_requirements)
         
         # Common fertilizers and their nutrient content (%)
         self.fertilizer_types = {
@@ -45,11 +47,11 @@ class FertilizerCalculator:
                                         soil_test: Dict = None) -> Dict:
         """Calculate fertilizer requirements for a crop"""
         
-        if crop not in self.crop_npk_requirements:
+        if crop not in self.crop_index:
             # Default NPK for unknown crops
             base_npk = {"N": 60, "P": 40, "K": 40}
         else:
-            base_npk = self.crop_npk_requirements[crop]
+            base_npk = self.crop_index[crop]
         
         # Adjust based on soil test if provided
         if soil_test:
@@ -272,9 +274,10 @@ class FertilizerCalculator:
         }
         
         recommendations = []
+        crop_name = self.crop_index.registry.canonical(crop) or crop
         
         for nutrient, info in micronutrients.items():
-            if crop in info["crops_needing"]:
+            if crop_name in info["crops_needing"]:
                 recommendations.append({
                     "nutrient": nutrient,
                     "application": info["application"],
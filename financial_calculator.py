@@ -1,6 +1,7 @@
 """Financial calculator for farm profit and break-even analysis"""
 from typing import Dict, List
 from datetime import datetime
+from crop_registry import CropIndex
 
 class FinancialCalculator:
     """Calculate farm profitability, expenses, and break-even points"""
@@ -15,6 +16,15 @@ class FinancialCalculator:
             "irrigation": {"Wheat": 3000, "Rice": 6000, "Corn": 4000, "Soybeans": 3500, "Cotton": 5000},
             "equipment": {"Wheat": 2000, "Rice": 2500, "Corn": 2200, "Soybeans": 2000, "Cotton": 3000},
         }
+        self.cost_index = {category: CropIndex(costs) for category, costs in self.default_costs.items()}
+        
+        # Average yields (quintals per acre)
+        self.base_yields = {
+            "Wheat": 15, "Rice": 18, "Corn": 20, "Soybeans": 12,
+            "Cotton": 8, "Sugarcane": 300, "Potatoes": 100,
+            "Tomatoes": 150, "Onions": 120, "Groundnut": 10
+        }
+        self.yield_index = CropIndex(self.base_yields)
     
     def calculate_total_cost(self, crop: str, area_acres: float, custom_costs: Dict = None) -> Dict:
         """Calculate total farming costs"""
@@ -22,12 +32,12 @@ class FinancialCalculator:
             costs = custom_costs
         else:
             costs = {
-                "seed": self.default_costs["seed"].get(crop, 3000),
-                "fertilizer": self.default_costs["fertilizer"].get(crop, 4500),
-                "pesticide": self.default_costs["pesticide"].get(crop, 2500),
-                "labor": self.default_costs["labor"].get(crop, 9000),
-                "irrigation": self.default_costs["irrigation"].get(crop, 4000),
-                "equipment": self.default_costs["equipment"].get(crop, 2500),
+                "seed": self.cost_index["seed"].get(crop, 3000),
+                "fertilizer": self.cost_index["fertilizer"].get(crop, 4500),
+                "pesticide": self.cost_index["pesticide"].get(crop, 2500),
+                "labor": self.cost_index["labor"].get(crop, 9000),
+                "irrigation": self.cost_index["irrigation"].get(crop, 4000),
+                "equipment": self.cost_index["equipment"].get(crop, 2500),
                 "other": 1500,
             }
         
@@ -83,13 +93,6 @@ class FinancialCalculator:
     def estimate_yield(self, crop: str, area_acres: float, 
                       weather_quality: str = "good") -> Dict:
         """Estimate crop yield based on area and conditions"""
-        # Average yields (quintals per acre)
-        base_yields = {
-            "Wheat": 15, "Rice": 18, "Corn": 20, "Soybeans": 12,
-            "Cotton": 8, "Sugarcane": 300, "Potatoes": 100,
-            "Tomatoes": 150, "Onions": 120, "Groundnut": 10
-        }
-        
         # Weather quality multipliers
         multipliers = {
             "excellent": 1.2,
@@ -99,7 +102,7 @@ class FinancialCalculator:
             "very_poor": 0.4
         }
         
-        base_yield = base_yields.get(crop, 10)
+        base_yield = self.yield_index.get(crop, 10)
         multiplier = multipliers.get(weather_quality, 1.0)
         
         yield_per_acre = base_yield * multiplier
@@ -0,0 +1,114 @@
+"""Column-oriented forecast container backed by NumPy arrays"""
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+class ForecastFrame(Sequence):
+    """Forecast kept as the API's parallel arrays instead of one dict per timestep.
+    
+    Columns are read-only NumPy arrays, so charts and CSV export can use them
+    without copying. Indexing and iteration still yield plain dicts, so code
+    written against the old list-of-dicts return value keeps working.
+    """
+    
+    def __init__(self, columns: Dict[str, np.ndarray], time_column: str, meta: Optional[Dict] = None):
+        self.time_column = time_column
+        # Request context carried alongside the data (e.g. the grid cell served)
+        self.meta = dict(meta) if meta else {}
+        self._columns = {}
+        length = None
+        for name, values in columns.items():
+            array = np.asarray(values).view()
+            array.flags.writeable = False
+            if length is None:
+                length = len(array)
+            elif len(array) != length:
+                raise ValueError(f"Column '{name}' has {len(array)} rows, expected {length}")
+            self._columns[name] = array
+        self._length = length or 0
+    
+    @classmethod
+    def from_open_meteo(cls, block: Dict, column_map: Dict[str, str], time_column: str) -> "ForecastFrame":
+        """Build a frame from an Open-Meteo ``daily``/``hourly`` block.
+        
+        ``column_map`` maps our column names to API variable names; the block's
+        ``time`` array becomes ``time_column``.
+        """
+        columns = {time_column: np.asarray(block["time"])}
+        for name, variable in column_map.items():
+            # None marks missing model data; float conversion turns it into NaN
+            columns[name] = np.asarray(block[variable], dtype=np.float64)
+        return cls(columns, time_column)
+    
+    @property
+    def grid_cell(self) -> Optional[Dict]:
+        """Quantized grid cell the forecast was fetched for"""
+        return self.meta.get("grid_cell")
+    
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Age of the data when it was served from cache"""
+        return self.meta.get("age_seconds")
+    
+    def with_meta(self, **meta) -> "ForecastFrame":
+        """Same columns (shared, not copied) with extra metadata"""
+        return ForecastFrame(self._columns, self.time_column, {**self.meta, **meta})
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one column"""
+        return self._columns[name]
+    
+    def times(self) -> np.ndarray:
+        """Timestamps as ``datetime64`` values"""
+        return self._columns[self.time_column].astype("datetime64[m]")
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict, "ForecastFrame"]:
+        if isinstance(index, slice):
+            # Slicing NumPy arrays gives views, so sub-frames share memory too
+            return ForecastFrame({name: values[index] for name, values in self._columns.items()},
+                                 self.time_column, self.meta)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ForecastFrame index out of range")
+        return self._row(index)
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._length):
+            yield self._row(i)
+    
+    def _row(self, index: int) -> Dict:
+        """Materialize one timestep as a legacy dict"""
+        row = {}
+        for name, values in self._columns.items():
+            value = values[index].item()
+            # Restore the API's None for missing values
+            row[name] = None if isinstance(value, float) and value != value else value
+        return row
+    
+    def to_records(self) -> List[Dict]:
+        """Full list-of-dicts copy, matching the pre-ForecastFrame return value"""
+        return list(self)
+    
+    def to_dataframe(self, parse_times: bool = False) -> pd.DataFrame:
+        """DataFrame over the underlying arrays (no copy of the numeric columns)"""
+        data = dict(self._columns)
+        if parse_times:
+            data[self.time_column] = self.times()
+        return pd.DataFrame(data, copy=False)
+    
+    def to_csv(self, path_or_buf=None, **kwargs) -> Optional[str]:
+        """Write the forecast as CSV; returns the text when no path is given"""
+        kwargs.setdefault("index", False)
+        return self.to_dataframe().to_csv(path_or_buf, **kwargs)
+    
+    def __repr__(self) -> str:
+        return f"ForecastFrame(rows={self._length}, columns={self.columns})"
@@ -0,0 +1,207 @@
+"""Season-to-date growing degree days for many plots with O(1) daily updates and lookups"""
+import threading
+from datetime import date, timedelta
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple, Union
+import numpy as np
+from forecast_frame import ForecastFrame
+from geo_grid import CoordinateQuantizer
+
+DateLike = Union[date, str]
+
+def _to_date(value: DateLike) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+def daily_gdd(temp_max, temp_min, base_temp: float, upper_temp: Optional[float] = None):
+    """Vectorized degree days; max/min are clamped to [base, upper] when an upper cutoff is given"""
+    temp_max = np.asarray(temp_max, dtype=np.float64)
+    temp_min = np.asarray(temp_min, dtype=np.float64)
+    if upper_temp is not None:
+        temp_max = np.clip(temp_max, base_temp, upper_temp)
+        temp_min = np.clip(temp_min, base_temp, upper_temp)
+    return np.maximum(0.0, (temp_max + temp_min) / 2 - base_temp)
+
+class _Series:
+    """Running cumulative GDD for one location and temperature threshold pair.
+
+    ``cumulative[i]`` is the total from ``start`` through ``start + i`` days,
+    so GDD between any two days is one subtraction. Missing days add 0 until
+    data for them arrives (see ``fill``).
+    """
+
+    def __init__(self, start: date):
+        self.start = start
+        self.length = 0
+        self.missing_days = 0
+        self._cumulative = np.zeros(64)
+        self._daily = np.full(64, np.nan)
+
+    @property
+    def end(self) -> date:
+        """Last day accumulated"""
+        return self.start + timedelta(days=self.length - 1)
+
+    @property
+    def daily(self) -> np.ndarray:
+        """Each accumulated day's GDD, NaN where missing"""
+        return self._daily[:self.length]
+
+    def total_at(self, index: int) -> float:
+        """Cumulative GDD through day ``index`` (0 before the series starts)"""
+        if index < 0:
+            return 0.0
+        return float(self._cumulative[min(index, self.length - 1)])
+
+    def extend(self, values: np.ndarray):
+        """Append consecutive days' GDD (NaN counts as a missing day)"""
+        values = np.asarray(values, dtype=np.float64)
+        self.missing_days += int(np.isnan(values).sum())
+        needed = self.length + len(values)
+        if needed > len(self._cumulative):
+            # Doubling keeps appends amortized O(1)
+            size = max(needed, 2 * len(self._cumulative))
+            cumulative, daily = np.zeros(size), np.full(size, np.nan)
+            cumulative[:self.length] = self._cumulative[:self.length]
+            daily[:self.length] = self._daily[:self.length]
+            self._cumulative, self._daily = cumulative, daily
+        self._daily[self.length:needed] = values
+        self._cumulative[self.length:needed] = self.total_at(self.length - 1) + np.cumsum(np.nan_to_num(values))
+        self.length = needed
+
+    def fill(self, index: int, values: np.ndarray):
+        """Use ``values`` (starting at day ``index``) for accumulated days that are still missing"""
+        values = np.asarray(values, dtype=np.float64)[:max(0, self.length - index)]
+        if index < 0 or not len(values):
+            return
+        days = slice(index, index + len(values))
+        filled = np.isnan(self._daily[days]) & ~np.isnan(values)
+        if not filled.any():
+            return
+        self._daily[days][filled] = values[filled]
+        self.missing_days -= int(filled.sum())
+        # Totals change from the first filled day on
+        first = index + int(np.argmax(filled))
+        self._cumulative[first:self.length] = (self.total_at(first - 1)
+                                               + np.cumsum(np.nan_to_num(self._daily[first:self.length])))
+
+def _merged(series: _Series, first: date, values: np.ndarray) -> _Series:
+    """A series from ``first`` with ``values`` followed by ``series``, whose known days win"""
+    offset = (series.start - first).days
+    daily = np.full(max(len(values), offset + series.length), np.nan)
+    daily[:len(values)] = values
+    existing = daily[offset:offset + series.length]
+    known = ~np.isnan(series.daily)
+    existing[known] = series.daily[known]
+    merged = _Series(first)
+    merged.extend(daily)
+    return merged
+
+class GDDAccumulator:
+    """Cumulative growing degree days per (location, crop thresholds), shared by every plot there.
+
+    Plots only record their series and planting date, so thousands of plots
+    cost one subtraction each to answer "GDD since planting", and a new day
+    of weather is one append per series rather than per plot. Safe to share
+    between threads (Streamlit sessions).
+    """
+
+    def __init__(self, quantizer: Optional[CoordinateQuantizer] = None):
+        self.quantizer = quantizer if quantizer is not None else CoordinateQuantizer()
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, float, Optional[float]], _Series] = {}
+        self._plots: Dict[Hashable, Tuple[Tuple[str, float, Optional[float]], date]] = {}
+        # Threshold pairs in use per grid cell, so a new day never scans the plots
+        self._thresholds: Dict[str, Set[Tuple[float, Optional[float]]]] = {}
+
+    def _location(self, latitude: float, longitude: float) -> str:
+        return self.quantizer.snap(latitude, longitude)["key"]
+
+    def register_plot(self, plot_id: Hashable, latitude: float, longitude: float, planting_date: DateLike,
+                      base_temp: float = 10, upper_temp: Optional[float] = None):
+        """Track a plot; crops with the same thresholds in one grid cell share a series"""
+        key = (self._location(latitude, longitude), float(base_temp), upper_temp)
+        with self._lock:
+            self._plots[plot_id] = (key, _to_date(planting_date))
+            self._thresholds.setdefault(key[0], set()).add(key[1:])
+
+    def _series_for(self, latitude: float, longitude: float):
+        location = self._location(latitude, longitude)
+        return location, tuple(self._thresholds.get(location, ()))
+
+    def load_history(self, latitude: float, longitude: float, history: ForecastFrame):
+        """Seed or extend this location's series from daily rows (``date``, ``temp_max``, ``temp_min``)"""
+        if not len(history):
+            return
+        dates = history.column(history.time_column).astype("datetime64[D]")
+        first = date.fromisoformat(str(dates[0]))
+        with self._lock:
+            location, thresholds = self._series_for(latitude, longitude)
+            for base_temp, upper_temp in thresholds:
+                values = daily_gdd(history.column("temp_max"), history.column("temp_min"), base_temp, upper_temp)
+                key = (location, base_temp, upper_temp)
+                series = self._series.get(key)
+                if series is None:
+                    self._series[key] = series = _Series(first)
+                elif first < series.start:
+                    # History reaching further back: rebuild from ``first``, keeping every day the
+                    # series already had (including ones from add_day) and filling its gaps
+                    self._series[key] = series = _merged(series, first, values)
+                    continue
+                # Days the series already has only fill gaps; the days after its end are appended
+                offset = (first - series.start).days
+                series.fill(offset, values)
+                skip = series.length - offset
+                if skip < 0:
+                    values = np.concatenate((np.full(-skip, np.nan), values))
+                    skip = 0
+                series.extend(values[skip:])
+
+    def add_day(self, latitude: float, longitude: float, day: DateLike, temp_max: float, temp_min: float):
+        """Accumulate one new day for every series at this location in O(1) each"""
+        day = _to_date(day)
+        with self._lock:
+            location, thresholds = self._series_for(latitude, longitude)
+            for base_temp, upper_temp in thresholds:
+                series = self._series.get((location, base_temp, upper_temp))
+                if series is None:
+                    self._series[(location, base_temp, upper_temp)] = series = _Series(day)
+                gap = (day - series.start).days - series.length
+                value = daily_gdd(temp_max, temp_min, base_temp, upper_temp)
+                if gap < 0:
+                    # Already accumulated; only counts if that day was missing
+                    series.fill(series.length + gap, [value])
+                    continue
+                series.extend(np.concatenate((np.full(gap, np.nan), [value])))
+
+    def gdd_since_planting(self, plot_id: Hashable, as_of: Optional[DateLike] = None) -> float:
+        """Degree days from planting through ``as_of`` (default: the latest accumulated day)"""
+        with self._lock:
+            key, planting_date = self._plots[plot_id]
+            series = self._series.get(key)
+            if series is None or series.length == 0:
+                return 0.0
+            end = (series.end if as_of is None else min(_to_date(as_of), series.end))
+            end_index = (end - series.start).days
+            if end_index < 0 or planting_date > end:
+                return 0.0
+            return series.total_at(end_index) - series.total_at((planting_date - series.start).days - 1)
+
+    def gdd_for_plots(self, plot_ids: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, float]:
+        """GDD since planting for many plots (all registered plots by default)"""
+        if plot_ids is None:
+            with self._lock:
+                plot_ids = list(self._plots)
+        return {plot_id: self.gdd_since_planting(plot_id) for plot_id in plot_ids}
+
+    def coverage(self, plot_id: Hashable) -> Dict:
+        """Days accumulated for a plot's series and how many of them had no data"""
+        with self._lock:
+            key, planting_date = self._plots[plot_id]
+            series = self._series.get(key)
+            if series is None or series.length == 0:
+                return {"start": None, "end": None, "missing_days": 0, "complete_since_planting": False}
+            return {
+                "start": series.start.isoformat(),
+                "end": series.end.isoformat(),
+                "missing_days": series.missing_days,
+                "complete_since_planting": series.start <= planting_date
+            }
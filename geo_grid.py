@@ -0,0 +1,98 @@
+"""Spatial quantization helpers: regular lat/lon grid cells and geohashes"""
+import math
+from typing import Dict, Tuple
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_GEOHASH_INDEX = {char: i for i, char in enumerate(_GEOHASH_ALPHABET)}
+
+def snap_to_grid(latitude: float, longitude: float, step: float) -> Tuple[float, float]:
+    """Centre of the ``step``-degree grid cell containing the coordinate"""
+    lat = (math.floor(latitude / step) + 0.5) * step
+    lon = (math.floor(longitude / step) + 0.5) * step
+    # Keep the centre on the globe and trim float noise (0.30000000000000004)
+    lat = min(max(lat, -90.0), 90.0)
+    lon = ((lon + 180.0) % 360.0) - 180.0
+    return round(lat, 6), round(lon, 6)
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 6) -> str:
+    """Encode a coordinate as a geohash string of ``precision`` characters"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash interleaves bits starting with longitude
+    while len(chars) < precision:
+        value, interval = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits <<= 1
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+def geohash_decode(geohash: str) -> Tuple[float, float, float, float]:
+    """Decode a geohash to its cell centre and half-sizes: (lat, lon, lat_err, lon_err)"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_INDEX[char]
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (value >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    lat = (lat_range[0] + lat_range[1]) / 2
+    lon = (lon_range[0] + lon_range[1]) / 2
+    return lat, lon, (lat_range[1] - lat_range[0]) / 2, (lon_range[1] - lon_range[0]) / 2
+
+class CoordinateQuantizer:
+    """Snap coordinates to a shared cell so nearby farms reuse one forecast.
+    
+    Modes:
+        ``grid``    - regular grid of ``resolution`` degrees (0.02° ≈ 2.2 km)
+        ``geohash`` - geohash prefix of ``precision`` characters (5 ≈ 4.9 km)
+        ``none``    - coordinates rounded to 4 decimals (~11 m), no sharing
+    """
+    
+    def __init__(self, mode: str = "grid", resolution: float = 0.02, precision: int = 5):
+        if mode not in ("grid", "geohash", "none"):
+            raise ValueError(f"Unknown quantization mode: {mode}")
+        if mode == "grid" and resolution <= 0:
+            raise ValueError("Grid resolution must be positive")
+        self.mode = mode
+        self.resolution = resolution
+        self.precision = precision
+    
+    def snap(self, latitude: float, longitude: float) -> Dict:
+        """Return the cell for a coordinate: its centre and a stable key"""
+        if self.mode == "grid":
+            lat, lon = snap_to_grid(latitude, longitude, self.resolution)
+            key = f"grid{self.resolution:g}:{lat:.6f},{lon:.6f}"
+        elif self.mode == "geohash":
+            geohash = geohash_encode(latitude, longitude, self.precision)
+            lat, lon, _, _ = geohash_decode(geohash)
+            lat, lon = round(lat, 6), round(lon, 6)
+            key = f"geohash:{geohash}"
+        else:
+            lat, lon = round(latitude, 4), round(longitude, 4)
+            key = f"point:{lat:.4f},{lon:.4f}"
+        
+        return {
+            "latitude": lat,
+            "longitude": lon,
+            "key": key,
+            "mode": self.mode
+        }
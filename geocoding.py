@@ -0,0 +1,311 @@
+"""Place search pipeline: prefix-aware cache, local gazetteer and a rate-limited geocoder"""
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from cache_backend import CacheBackend, make_key
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+# Nominatim's usage policy allows one request per second
+NOMINATIM_RATE = 1.0
+
+SEARCH_CACHE_TTL = 3600
+SEARCH_LIMIT = 8
+
+# Gazetteer answers for a query are trusted for 30 days, then asked again upstream
+GAZETTEER_MAX_AGE = 30 * 86400
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so trivially different queries share results"""
+    return " ".join(query.lower().split())
+
+def query_tokens(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+def location_matches(location: Dict, tokens: List[str]) -> bool:
+    """True if every query token starts a word of the place's name or display name"""
+    words = set(query_tokens(f"{location['name']} {location['display_name']}"))
+    return all(any(word.startswith(token) for word in words) for token in tokens)
+
+def parse_nominatim(item: Dict) -> Dict:
+    """Convert one Nominatim search hit to our location shape"""
+    display_name = item.get('display_name', '')
+    
+    # Build clean location name
+    address = item.get('address', {})
+    city = address.get('city', address.get('town', address.get('village', '')))
+    state = address.get('state', address.get('region', ''))
+    country = address.get('country', '')
+    
+    # Create a clean, readable location name
+    location_parts = []
+    if city:
+        location_parts.append(city)
+    if state and state != city:
+        location_parts.append(state)
+    if country and len(location_parts) < 2:
+        location_parts.append(country)
+    
+    return {
+        'name': ", ".join(location_parts[:3]) if location_parts else display_name,
+        'display_name': display_name,
+        'latitude': float(item.get('lat', 0)),
+        'longitude': float(item.get('lon', 0)),
+        'address': address
+    }
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second with bursts of up to ``capacity``"""
+    
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        # Created on first use so it binds to the loop that runs the service
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+def _place_key(location: Dict) -> str:
+    return make_key("place", location['display_name'], location['latitude'], location['longitude'])
+
+class Gazetteer:
+    """Persistent table of places resolved before, and of which places answered each query.
+    
+    Only a repeat of a query already answered upstream is served from here
+    (``lookup``); a shorter query like "Springfield" may match places the
+    gazetteer has never seen, so it still goes to the network. Word-prefix
+    ``search`` is the fallback when the network is unavailable.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS places ("
+            "place_key TEXT PRIMARY KEY, name TEXT NOT NULL, display_name TEXT NOT NULL, "
+            "latitude REAL NOT NULL, longitude REAL NOT NULL, address TEXT, search_text TEXT NOT NULL, "
+            "hits INTEGER NOT NULL DEFAULT 0, resolved_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queries ("
+            "query TEXT PRIMARY KEY, place_keys TEXT NOT NULL, resolved_at REAL NOT NULL)"
+        )
+    
+    def add(self, locations: List[Dict], query: Optional[str] = None):
+        """Remember resolved places (keyed by display name and rounded coordinates) and the query they answered"""
+        now = time.time()
+        rows = [
+            (
+                _place_key(location),
+                location['name'], location['display_name'], location['latitude'], location['longitude'],
+                json.dumps(location.get('address') or {}),
+                " ".join(query_tokens(f"{location['name']} {location['display_name']}")),
+                now
+            )
+            for location in locations
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO places (place_key, name, display_name, latitude, longitude, address, "
+                "search_text, resolved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(place_key) DO UPDATE SET resolved_at = excluded.resolved_at",
+                rows
+            )
+            if query is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO queries (query, place_keys, resolved_at) VALUES (?, ?, ?)",
+                    (normalize_query(query), json.dumps([row[0] for row in rows]), now)
+                )
+    
+    @staticmethod
+    def _location(name: str, display_name: str, latitude: float, longitude: float, address: Optional[str]) -> Dict:
+        return {
+            'name': name,
+            'display_name': display_name,
+            'latitude': latitude,
+            'longitude': longitude,
+            'address': json.loads(address) if address else {}
+        }
+    
+    def lookup(self, query: str, max_age: float = GAZETTEER_MAX_AGE) -> Optional[List[Dict]]:
+        """Places upstream returned for exactly this query, or None if it wasn't asked within ``max_age``"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT place_keys FROM queries WHERE query = ? AND resolved_at >= ?",
+                (normalize_query(query), time.time() - max_age)
+            ).fetchone()
+            if row is None:
+                return None
+            place_keys = json.loads(row[0])
+            found = {
+                place_key: self._location(*place)
+                for place_key, *place in self._conn.execute(
+                    "SELECT place_key, name, display_name, latitude, longitude, address FROM places "
+                    f"WHERE place_key IN ({', '.join('?' * len(place_keys))})",
+                    place_keys
+                )
+            }
+        return [found[place_key] for place_key in place_keys if place_key in found]
+    
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> List[Dict]:
+        """Places whose words start with every token of ``query``, most used first"""
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        # SQL narrows by the longest token; the word-prefix check runs in Python
+        anchor = max(tokens, key=len)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT place_key, name, display_name, latitude, longitude, address FROM places "
+                "WHERE instr(search_text, ?) > 0 ORDER BY hits DESC, resolved_at DESC",
+                (anchor,)
+            ).fetchall()
+        
+        locations = []
+        for _, *place in rows:
+            location = self._location(*place)
+            if location_matches(location, tokens):
+                locations.append(location)
+                if len(locations) == limit:
+                    break
+        return locations
+    
+    def record_use(self, location: Dict):
+        """Rank a place higher in later searches after the user picks it"""
+        with self._lock:
+            self._conn.execute("UPDATE places SET hits = hits + 1 WHERE place_key = ?", (_place_key(location),))
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_default_gazetteer: Optional[Gazetteer] = None
+_default_gazetteer_lock = threading.Lock()
+
+def get_default_gazetteer() -> Gazetteer:
+    """Process-wide gazetteer at ``AGRI_GAZETTEER_PATH`` (default ``~/.agri_assistant/gazetteer.sqlite``)"""
+    global _default_gazetteer
+    with _default_gazetteer_lock:
+        if _default_gazetteer is None:
+            _default_gazetteer = Gazetteer(os.environ.get(
+                "AGRI_GAZETTEER_PATH",
+                os.path.join(os.path.expanduser("~"), ".agri_assistant", "gazetteer.sqlite")
+            ))
+        return _default_gazetteer
+
+class LocationSearch:
+    """Resolve place-name queries, touching the network only when nothing local answers.
+    
+    Lookup order: exact cached query, a cached shorter prefix of the query whose
+    results still match (so "Pune, Maharashtra" reuses "Pune") as long as that
+    prefix got fewer than ``limit`` results, i.e. all of them, the gazetteer's
+    answer to the same query, and finally Nominatim behind a token-bucket rate
+    limiter. If Nominatim can't be reached, places in the gazetteer matching
+    the query are returned instead.
+    """
+    
+    def __init__(self, fetch_json: Callable[[str, Dict], Awaitable], cache: CacheBackend,
+                 gazetteer: Optional[Gazetteer] = None, rate: float = NOMINATIM_RATE, burst: float = 1,
+                 limit: int = SEARCH_LIMIT):
+        self.fetch_json = fetch_json
+        self.cache = cache
+        self._gazetteer = gazetteer
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = limit
+        self.counts = {"cache": 0, "prefix": 0, "gazetteer": 0, "network": 0, "offline": 0}
+    
+    @property
+    def gazetteer(self) -> Gazetteer:
+        if self._gazetteer is None:
+            self._gazetteer = get_default_gazetteer()
+        return self._gazetteer
+    
+    @staticmethod
+    def _cache_key(query: str) -> str:
+        return make_key("weather:search", query)
+    
+    async def search(self, query: str) -> List[Dict]:
+        """Locations matching ``query``"""
+        query = normalize_query(query)
+        if len(query) < 2:
+            return []
+        
+        cached = self.cache.get(self._cache_key(query))
+        if cached is not None:
+            self.counts["cache"] += 1
+            return cached
+        
+        tokens = query_tokens(query)
+        for end in range(len(query) - 1, 1, -1):
+            earlier = self.cache.get(self._cache_key(query[:end].rstrip(" ,")))
+            # A full page was cut off at the limit and may be missing places the longer query wants
+            if earlier and len(earlier) < self.limit:
+                matches = [location for location in earlier if location_matches(location, tokens)]
+                if matches:
+                    self.counts["prefix"] += 1
+                    self.cache.set(self._cache_key(query), matches, SEARCH_CACHE_TTL)
+                    return matches
+        
+        known = self.gazetteer.lookup(query)
+        if known is not None:
+            self.counts["gazetteer"] += 1
+            self.cache.set(self._cache_key(query), known, SEARCH_CACHE_TTL)
+            return known
+        
+        await self.bucket.acquire()
+        # An identical query may have completed while this one waited for a token
+        cached = self.cache.get(self._cache_key(query))
+        if cached is not None:
+            self.counts["cache"] += 1
+            return cached
+        
+        self.counts["network"] += 1
+        try:
+            data = await self.fetch_json(NOMINATIM_URL, {
+                "q": query,
+                "format": "json",
+                "limit": self.limit,
+                "addressdetails": 1,
+                "extratags": 1
+            })
+        except Exception:
+            # Offline: places seen before are better than nothing, but aren't cached as the answer
+            fallback = self.gazetteer.search(query, self.limit)
+            if fallback:
+                self.counts["offline"] += 1
+                return fallback
+            raise
+        locations = [parse_nominatim(item) for item in data]
+        
+        self.cache.set(self._cache_key(query), locations, SEARCH_CACHE_TTL)
+        if locations:
+            self.gazetteer.add(locations, query)
+        return locations
@@ -1,6 +1,7 @@
 """Irrigation and water management calculator"""
 from typing import Dict
 import math
+from crop_registry import CropIndex
 
 class IrrigationCalculator:
     """Calculate water requirements and irrigation schedules"""
@@ -27,6 +28,7 @@ class IrrigationCalculator:
             "Mango": 6.0,
             "Grapes": 5.0,
         }
+        self.crop_index = CropIndex(self.crop_water_needs)
         
         # Crop coefficients for different growth stages
         self.growth_stage_kc = {
@@ -35,6 +37,18 @@ class IrrigationCalculator:
             "mid_season": 1.15,
             "late_season": 0.7,
         }
+        
+        # Recommended irrigation frequencies
+        self.irrigation_schedules = {
+            "Rice": {"frequency_days": 1, "duration_hours": 2, "method": "flood"},
+            "Wheat": {"frequency_days": 7, "duration_hours": 3, "method": "sprinkler"},
+            "Cotton": {"frequency_days": 5, "duration_hours": 2, "method": "drip"},
+            "Corn": {"frequency_days": 5, "duration_hours": 2.5, "method": "sprinkler"},
+            "Tomatoes": {"frequency_days": 3, "duration_hours": 1.5, "method": "drip"},
+            "Potatoes": {"frequency_days": 5, "duration_hours": 2, "method": "sprinkler"},
+            "Sugarcane": {"frequency_days": 7, "duration_hours": 4, "method": "furrow"},
+        }
+        self.schedule_index = CropIndex(self.irrigation_schedules)
     
     def calculate_water_requirement(self, crop: str, area_acres: float,
                                    growth_stage: str = "mid_season",
@@ -44,7 +58,7 @@ class IrrigationCalculator:
         """Calculate daily water requirement"""
         
         # Base water need (mm/day)
-        base_need = self.crop_water_needs.get(crop, 5.0)
+        base_need = self.crop_index.get(crop, 5.0)
         
         # Adjust for growth stage
         kc = self.growth_stage_kc.get(growth_stage, 1.0)
@@ -97,19 +111,8 @@ class IrrigationCalculator:
         
         eff = efficiency.get(irrigation_method, 0.70)
         
-        # Recommended frequencies
-        schedules = {
-            "Rice": {"frequency_days": 1, "duration_hours": 2, "method": "flood"},
-            "Wheat": {"frequency_days": 7, "duration_hours": 3, "method": "sprinkler"},
-            "Cotton": {"frequency_days": 5, "duration_hours": 2, "method": "drip"},
-            "Corn": {"frequency_days": 5, "duration_hours": 2.5, "method": "sprinkler"},
-            "Tomatoes": {"frequency_days": 3, "duration_hours": 1.5, "method": "drip"},
-            "Potatoes": {"frequency_days": 5, "duration_hours": 2, "method": "sprinkler"},
-            "Sugarcane": {"frequency_days": 7, "duration_hours": 4, "method": "furrow"},
-        }
-        
         default = {"frequency_days": 5, "duration_hours": 2, "method": "sprinkler"}
-        schedule = schedules.get(crop, default)
+        schedule = self.schedule_index.get(crop, default)
         
         return {
             "crop": crop,
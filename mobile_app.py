@@ -17,12 +17,16 @@ from kivymd.uix.card import MDCard
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
 from kivy.metrics import dp
+from kivy.clock import Clock
 from datetime import datetime
+import os
 import requests
 
 # Import our modules
 from weather_service import WeatherService
+from weather_store import SYNC_INTERVAL, WeatherStore
 from price_service import PriceService
+from crop_registry import get_crop_registry
 from financial_calculator import FinancialCalculator
 from irrigation_calculator import IrrigationCalculator
 
@@ -33,7 +37,9 @@ class AgriAssistantApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.weather_service = WeatherService()
+        self.weather_store = None
         self.price_service = PriceService()
+        self.price_service.start_precompute()
         self.financial_calc = FinancialCalculator()
         self.irrigation_calc = IrrigationCalculator()
         
@@ -43,6 +49,7 @@ class AgriAssistantApp(MDApp):
         self.location_name = "New Delhi, India"
         self.crop_type = "Wheat"
         self.area_acres = 10.0
+        self.location_id = "home"
     
     def build(self):
         self.theme_cls.primary_palette = "Green"
@@ -156,37 +163,78 @@ class AgriAssistantApp(MDApp):
         
         return layout
     
+    def on_start(self):
+        # Weather is read from the on-device store; the network only feeds it in the background
+        self.weather_store = WeatherStore(os.path.join(self.user_data_dir, "weather.sqlite"))
+        self.weather_store.save_location(self.location_id, self.latitude, self.longitude, self.location_name)
+        self.sync_weather()
+        Clock.schedule_interval(lambda dt: self.sync_weather(), SYNC_INTERVAL)
+    
+    def on_stop(self):
+        if self.weather_store is not None:
+            self.weather_store.close()
+    
+    def sync_weather(self, min_interval: float = SYNC_INTERVAL):
+        """Pull new weather into the store on the service's background loop"""
+        future = self.weather_service.submit(
+            self.weather_store.sync(self.weather_service.async_service, min_interval)
+        )
+        future.add_done_callback(
+            lambda done: Clock.schedule_once(lambda dt: self._on_weather_synced(done))
+        )
+    
+    def _on_weather_synced(self, future):
+        try:
+            synced = future.result()
+        except Exception:
+            return
+        # Refresh the weather view in place if it is showing
+        if synced.get(self.location_id) and self.results_label.text.startswith("[b]Current Weather"):
+            self._display_weather()
+    
     def open_menu(self):
         # Placeholder for menu
         pass
     
     def show_weather(self, *args):
+        # Served from the local store so the button never waits on the network
+        self._display_weather()
+        self.sync_weather(min_interval=60)
+    
+    def _display_weather(self):
         try:
-            weather = self.weather_service.get_current_weather(self.latitude, self.longitude)
+            weather = self.weather_store.get_current(self.location_id)
             if weather:
+                minutes = weather['age_seconds'] / 60
+                updated = "just now" if minutes < 1 else f"{minutes:.0f} min ago"
                 result = f"""[b]Current Weather[/b]
-                
+
 🌡️ Temperature: {weather['temperature']}°C
 💧 Humidity: {weather['humidity']}%
 🌧️ Precipitation: {weather['precipitation']} mm
 💨 Wind: {weather['wind_speed']} km/h
 
 Location: {self.location_name}
-Time: {datetime.now().strftime('%I:%M %p')}
+Updated: {updated}
 """
                 self.results_label.text = result
             else:
-                self.results_label.text = "[color=ff0000]Could not fetch weather data[/color]"
+                self.results_label.text = "Fetching weather... (connect to the internet for the first sync)"
         except Exception as e:
             self.results_label.text = f"[color=ff0000]Error: {str(e)}[/color]"
     
+    def _crop_name(self) -> str:
+        """Crop typed by the user, as the services name it ("wheat" -> "Wheat", "tomatos" -> "Tomatoes")"""
+        text = self.crop_input.text.strip() or self.crop_type
+        return get_crop_registry().canonical(text, fuzzy=True) or text
+    
     def show_prices(self, *args):
         try:
-            crop = self.crop_input.text or self.crop_type
+            crop = self._crop_name()
             price_data = self.price_service.get_current_price(crop)
             if price_data and 'current' in price_data:
                 result = f"""[b]Price Information[/b]
-                
+
 Crop: {crop}
 💰 Current Price: ₹{price_data['current']:.2f}/kg
 📈 Change: {price_data['change']:+.1f}%
@@ -201,13 +249,13 @@ Updated: {datetime.now().strftime('%I:%M %p')}
     
     def show_finance(self, *args):
         try:
-            crop = self.crop_input.text or self.crop_type
+            crop = self._crop_name()
             area = float(self.area_input.text or self.area_acres)
             
             cost_data = self.financial_calc.calculate_total_cost(crop, area)
             
             result = f"""[b]Financial Summary[/b]
-            
+
 Crop: {crop}
 Area: {area} acres
 
@@ -226,7 +274,7 @@ Breakdown:
     
     def show_irrigation(self, *args):
         try:
-            crop = self.crop_input.text or self.crop_type
+            crop = self._crop_name()
             area = float(self.area_input.text or self.area_acres)
             
             water_req = self.irrigation_calc.calculate_water_requirement(
@@ -234,7 +282,7 @@ Breakdown:
             )
             
             result = f"""[b]Water Requirements[/b]
-            
+
 Crop: {crop}
 Area: {area} acres
 
@@ -0,0 +1,137 @@
+"""Deterministic price forecasting models with prediction intervals"""
+from statistics import NormalDist
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+import numpy as np
+
+# A model maps (history, horizon) to point forecasts and the standard error of each step
+Model = Callable[[np.ndarray, int], Tuple[np.ndarray, np.ndarray]]
+
+SEASON_DAYS = 7
+SES_ALPHAS = np.linspace(0.05, 1.0, 20)
+
+class Forecast(NamedTuple):
+    """Point forecasts and prediction interval bounds for steps 1..horizon.
+    
+    ``confidence`` scores each step in [0, 1] as one minus the interval's
+    half-width relative to the forecast, so it falls as the interval widens
+    with the horizon or with a noisier history.
+    """
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    model: str
+    level: float
+    confidence: np.ndarray
+
+def _residual_std(residuals: np.ndarray, dof: int = 1) -> float:
+    return float(np.sqrt((residuals ** 2).sum() / (len(residuals) - dof))) if len(residuals) > dof else 0.0
+
+def drift(history: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Last value plus the average change per step over the whole history"""
+    n = len(history)
+    steps = np.arange(1, horizon + 1)
+    if n < 2:
+        return np.full(horizon, history[-1]), np.zeros(horizon)
+    slope = (history[-1] - history[0]) / (n - 1)
+    sigma = _residual_std(np.diff(history) - slope)
+    return history[-1] + slope * steps, sigma * np.sqrt(steps * (1 + steps / (n - 1)))
+
+def exponential_smoothing(history: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Simple exponential smoothing; alpha is the grid value with the lowest one-step squared error"""
+    n = len(history)
+    if n < 2:
+        return np.full(horizon, history[-1]), np.zeros(horizon)
+    # Smoothed levels for every candidate alpha at once: (alphas, n)
+    levels = np.empty((len(SES_ALPHAS), n))
+    levels[:, 0] = history[0]
+    for t in range(1, n):
+        levels[:, t] = SES_ALPHAS * history[t] + (1 - SES_ALPHAS) * levels[:, t - 1]
+    errors = history[1:] - levels[:, :-1]
+    best = int(np.argmin((errors ** 2).sum(axis=1)))
+    alpha = SES_ALPHAS[best]
+    steps = np.arange(1, horizon + 1)
+    return np.full(horizon, levels[best, -1]), _residual_std(errors[best]) * np.sqrt(1 + (steps - 1) * alpha ** 2)
+
+def seasonal_naive(history: np.ndarray, horizon: int, period: int = SEASON_DAYS) -> Tuple[np.ndarray, np.ndarray]:
+    """Repeat the last full season (a week of daily prices by default)"""
+    period = min(period, len(history))
+    steps = np.arange(horizon)
+    mean = history[-period:][steps % period]
+    sigma = _residual_std(history[period:] - history[:-period], 0)
+    return mean, sigma * np.sqrt(steps // period + 1)
+
+def autoregressive(history: np.ndarray, horizon: int, order: int = 2) -> Tuple[np.ndarray, np.ndarray]:
+    """AR(p) with intercept fitted by least squares, forecast recursively"""
+    n = len(history)
+    order = min(order, (n - 2) // 3)
+    if order < 1:
+        return drift(history, horizon)
+    # Row t holds the p values before history[order + t]
+    lags = np.column_stack([history[order - i:n - i] for i in range(1, order + 1)])
+    design = np.column_stack((np.ones(n - order), lags))
+    coefficients, _, _, _ = np.linalg.lstsq(design, history[order:], rcond=None)
+    intercept, phi = coefficients[0], coefficients[1:]
+    sigma = _residual_std(history[order:] - design @ coefficients, order + 1)
+    
+    recent = list(history[-order:][::-1])
+    mean = np.empty(horizon)
+    psi = np.zeros(horizon)
+    psi[0] = 1.0
+    for h in range(horizon):
+        mean[h] = intercept + phi @ np.array(recent[:order])
+        recent.insert(0, mean[h])
+        # Moving-average weights of the forecast error, for the interval widths
+        if h:
+            psi[h] = sum(phi[i] * psi[h - 1 - i] for i in range(min(h, order)))
+    return mean, sigma * np.sqrt(np.cumsum(psi ** 2))
+
+MODELS: Dict[str, Model] = {
+    "drift": drift,
+    "ses": exponential_smoothing,
+    "seasonal_naive": seasonal_naive,
+    "ar": autoregressive
+}
+
+class ForecastEngine:
+    """Forecast a daily price series with one of the registered models.
+    
+    Every model is a pure function of the input series, so the same history
+    always gives the same forecast. ``model="auto"`` backtests each model on
+    the last ``holdout`` days and uses the one with the lowest mean absolute
+    error (ties go to the model registered first).
+    """
+    
+    def __init__(self, models: Optional[Dict[str, Model]] = None, level: float = 0.8, holdout: int = 7):
+        self.models = dict(MODELS if models is None else models)
+        self.level = level
+        self.holdout = holdout
+    
+    def register(self, name: str, model: Model):
+        self.models[name] = model
+    
+    def select(self, history: np.ndarray) -> str:
+        """Model with the lowest backtest error on the last ``holdout`` points"""
+        names = list(self.models)
+        if len(history) < 2 * self.holdout + 2:
+            return "drift" if "drift" in self.models else names[0]
+        train, test = history[:-self.holdout], history[-self.holdout:]
+        errors = [np.abs(self.models[name](train, self.holdout)[0] - test).mean() for name in names]
+        return names[int(np.argmin(errors))]
+    
+    def forecast(self, history, horizon: int, model: str = "auto", level: Optional[float] = None) -> Forecast:
+        """Forecast ``horizon`` steps past the end of ``history`` (NaNs are dropped)"""
+        history = np.asarray(history, dtype=np.float64)
+        history = history[~np.isnan(history)]
+        if not len(history):
+            raise ValueError("Cannot forecast an empty series")
+        level = self.level if level is None else level
+        name = self.select(history) if model == "auto" else model
+        mean, stderr = self.models[name](history, horizon)
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+        half_width = z * stderr
+        relative = np.divide(half_width, np.abs(mean), out=np.full(len(mean), np.inf), where=mean != 0)
+        confidence = np.clip(1 - relative, 0, 1)
+        confidence[half_width == 0] = 1.0
+        # Prices cannot go negative
+        return Forecast(np.maximum(mean, 0), np.maximum(mean - half_width, 0), mean + half_width, name, level,
+                        confidence)
@@ -1,14 +1,69 @@
+import argparse
+import logging
+import os
 import requests
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
 import streamlit as st
 import numpy as np
+from cache_backend import CacheBackend, MemoryCache, get_default_cache, make_key
+from crop_registry import CropIndex
+from price_forecast import ForecastEngine
+from price_store import PriceStore, StoreSnapshot, get_default_price_store
+from price_tensor import PriceTensor, tensor_root
+from selling_table import ADVICE_DTYPE, SellingTable, SellingTableReader, selling_advice
+
+logger = logging.getLogger(__name__)
+
+# Seconds a current price stays cached
+PRICE_CACHE_TTL = 1800
+
+# Stored history shorter than this falls back to the mock series
+MIN_HISTORY_DAYS = 7
+
+# Days forecast per crop and how long a day's forecast stays cached
+FORECAST_HORIZON = 30
+FORECAST_CACHE_TTL = 86400
+
+def commodity_rng(commodity: str, stream: int = 0) -> np.random.Generator:
+    """Generator seeded from the commodity name, so each crop's mock series is stable across runs"""
+    return np.random.default_rng([zlib.crc32(commodity.encode("utf-8")), stream])
+
+def synthetic_price_paths(base_prices: np.ndarray, noise: np.ndarray) -> np.ndarray:
+    """Mock daily prices for many commodities at once.
+    
+    ``base_prices`` has one entry per row of ``noise``, a (commodities, days)
+    array of standard normal draws. Each row is a 2% random walk from 95% of
+    the base price plus a slight upward trend and a weekly wave, floored at
+    70% of the base price.
+    """
+    base = np.asarray(base_prices, dtype=np.float64)[:, None]
+    days = noise.shape[1]
+    steps = np.arange(days)
+    walk = base * 0.95 + np.cumsum(noise * (base * 0.02), axis=1)
+    trend = (steps / days) * base * 0.05
+    seasonal = np.sin(steps / 7) * base * 0.01
+    return np.maximum(walk + trend + seasonal, base * 0.7)
 
 class PriceService:
     """Service for fetching agricultural commodity prices and predictions"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[CacheBackend] = None, store: Optional[PriceStore] = None):
+        self.cache = cache if cache is not None else get_default_cache()
+        self._store = store
+        self._tensor: Optional[PriceTensor] = None
+        self.forecaster = ForecastEngine()
+        self._selling_table: Optional[SellingTableReader] = None
+        # Mock histories are deterministic per day, so each is built once per (crop, days, date)
+        self._history_memo: Dict[Tuple, pd.DataFrame] = {}
+        self._history_day: Optional[date] = None
+        self._history_lock = threading.Lock()
+        
         # Using free APIs for commodity prices
         self.commodities_api_base = "https://api.api-ninjas.com/v1/commodityprice"
         self.api_key = None  # Will use free endpoints initially
@@ -79,6 +134,8 @@ class PriceService:
             "Cinnamon Tree": "cinnamon_tree", "Clove Tree": "clove_tree", "Nutmeg Tree": "nutmeg_tree",
             "Indigo": "indigo", "Henna": "henna", "Aloe Vera": "aloe_vera", "Stevia": "stevia", "Moringa": "moringa"
         }
+        # Commodity by crop ID, so "wheat", "Wheat" and "maize" all resolve without scanning names
+        self.crop_index = CropIndex(self.crop_commodity_map)
         
         # Mock historical data for demonstration (in real implementation, this would come from APIs)
         # Prices in Indian Rupees (INR) per kilogram - based on realistic Indian market rates
@@ -294,186 +351,408 @@ class PriceService:
             "moringa": {"current": 185.4, "unit": "INR/kg", "change": 4.2}
         }
     
-    @st.cache_data(ttl=1800)  # Cache for 30 minutes
-    def get_current_price(_self, crop_type: str) -> Optional[Dict]:
+    @property
+    def store(self) -> PriceStore:
+        if self._store is None:
+            self._store = get_default_price_store()
+        return self._store
+    
+    @property
+    def tensor(self) -> PriceTensor:
+        """Memory-mapped (crop, market, day) prices built from the store with ``PriceTensor.build``"""
+        if self._tensor is None:
+            self._tensor = PriceTensor(tensor_root(self.store))
+        return self._tensor
+    
+    def _store_crop(self, crop_type: str, snapshot: StoreSnapshot) -> Optional[str]:
+        """Name to look this crop up by in the price store (the crop itself or its commodity), if stored"""
+        for name in (crop_type, self.crop_index.get(crop_type)):
+            if name and self.store.has_crop(name, snapshot):
+                return name
+        return None
+    
+    def stored_history(self, crop_type: str, days: int = 30, market: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Real daily prices for the last ``days`` days on record, or None without enough stored history.
+        
+        A missing, empty or unreadable store counts as no history, so callers
+        fall back to the mock series.
+        """
+        try:
+            # One snapshot per call, so every lookup below reads the same version
+            snapshot = self.store.snapshot()
+            if snapshot is None:
+                return None
+            name = self._store_crop(crop_type, snapshot)
+            if name is None:
+                return None
+            end = self.store.latest_date(name, snapshot)
+            start = end - timedelta(days=days - 1)
+            # The tensor serves the same prices when it was built from this version
+            if self.tensor.source_version == snapshot.version:
+                history = self.tensor.daily_prices(name, start, end, market)
+            else:
+                history = self.store.daily_prices(name, start, end, market, snapshot)
+        except (OSError, ValueError) as e:
+            logger.warning("Price store unavailable at %s: %s", self.store.root, e)
+            return None
+        if len(history) < MIN_HISTORY_DAYS:
+            return None
+        history['Crop'] = crop_type
+        return history
+    
+    def historical_prices(self, crop_type: str, days: int = 30, market: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Stored price history when available, otherwise the mock series"""
+        history = self.stored_history(crop_type, days, market)
+        return history if history is not None else self.generate_historical_data(crop_type, days)
+    
+    def get_current_price(self, crop_type: str) -> Optional[Dict]:
         """Get current market price for a crop"""
+        key = make_key("price:current", crop_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            commodity = _self.crop_commodity_map.get(crop_type)
+            history = self.stored_history(crop_type, MIN_HISTORY_DAYS)
+            if history is not None:
+                # Latest stored day, with the change since the previous day on record
+                latest, previous = history['Price'].iloc[-1], history['Price'].iloc[-2]
+                price_data = {
+                    "current": round(float(latest), 2),
+                    "unit": "INR/kg",
+                    "change": round(float((latest - previous) / previous * 100), 1),
+                    "commodity": self.crop_index.get(crop_type, crop_type),
+                    "timestamp": history['Date'].iloc[-1].isoformat(),
+                    "crop_type": crop_type,
+                    "source": "store"
+                }
+                self.cache.set(key, price_data, PRICE_CACHE_TTL)
+                return price_data
+            
+            commodity = self.crop_index.get(crop_type)
             if not commodity:
                 return None
             
             # For now, using mock data - in production, this would call real APIs
-            if commodity in _self.mock_prices:
-                price_data = _self.mock_prices[commodity].copy()
+            if commodity in self.mock_prices:
+                price_data = self.mock_prices[commodity].copy()
                 price_data['commodity'] = commodity
                 price_data['timestamp'] = datetime.now().isoformat()
                 price_data['crop_type'] = crop_type
+                self.cache.set(key, price_data, PRICE_CACHE_TTL)  # Cache for 30 minutes
                 return price_data
             
             return None
-            
+        
         except Exception as e:
             st.error(f"Error fetching price data: {str(e)}")
             return None
     
+    def _history_dates(self, days: int, today: date) -> pd.DatetimeIndex:
+        return pd.date_range(end=pd.Timestamp(today) - pd.Timedelta(days=1), periods=days)
+    
+    def _history_noise(self, commodities: Sequence[str], days: int) -> np.ndarray:
+        # One generator per commodity keeps each row identical however many are drawn together
+        rows = [commodity_rng(commodity).standard_normal(days) for commodity in commodities]
+        return np.stack(rows) if rows else np.empty((0, days))
+    
+    def _memoized_history(self, key: Tuple, build):
+        """Per-day memo: entries from earlier days are dropped once the date changes"""
+        today = date.today()
+        with self._history_lock:
+            if self._history_day != today:
+                self._history_day = today
+                self._history_memo = {}
+            if key not in self._history_memo:
+                self._history_memo[key] = build(today)
+            return self._history_memo[key]
+    
     def generate_historical_data(self, crop_type: str, days: int = 30) -> Optional[pd.DataFrame]:
         """Generate mock historical price data for demonstration"""
         try:
-            commodity = self.crop_commodity_map.get(crop_type)
+            commodity = self.crop_index.get(crop_type)
             if not commodity or commodity not in self.mock_prices:
                 return None
             
-            base_price = self.mock_prices[commodity]["current"]
-            dates = [datetime.now() - timedelta(days=i) for i in range(days, 0, -1)]
-            
-            # Generate realistic price variations
-            np.random.seed(42)  # For consistent results
-            price_variations = np.random.normal(0, base_price * 0.02, days)  # 2% volatility
-            prices = []
-            
-            current_price = base_price * 0.95  # Start slightly lower
-            for i, variation in enumerate(price_variations):
-                current_price += variation
-                # Add some trend and seasonality
-                trend = (i / days) * base_price * 0.05  # Slight upward trend
-                seasonal = np.sin(i / 7) * base_price * 0.01  # Weekly pattern
-                final_price = max(current_price + trend + seasonal, base_price * 0.7)
-                prices.append(final_price)
-            
-            df = pd.DataFrame({
-                'Date': dates,
-                'Price': prices,
-                'Crop': crop_type
-            })
-            
-            return df
+            def build(today: date) -> pd.DataFrame:
+                base_price = self.mock_prices[commodity]["current"]
+                prices = synthetic_price_paths([base_price], self._history_noise([commodity], days))[0]
+                return pd.DataFrame({
+                    'Date': self._history_dates(days, today),
+                    'Price': prices,
+                    'Crop': crop_type
+                })
             
+            # Shallow copy so callers adding columns don't touch the memoized frame
+            return self._memoized_history(("crop", crop_type, days), build).copy(deep=False)
+        
         except Exception as e:
             st.error(f"Error generating historical data: {str(e)}")
             return None
     
-    def predict_future_prices(self, crop_type: str, days: int = 7) -> Optional[pd.DataFrame]:
-        """Simple price prediction based on trends"""
+    def generate_historical_matrix(self, crop_types: Optional[Sequence[str]] = None, days: int = 30) -> pd.DataFrame:
+        """Mock price history for many crops as one (days, crops) frame indexed by date.
+        
+        Columns match ``generate_historical_data`` for each crop; crops without a
+        mock price are left out.
+        """
+        if crop_types is None:
+            crop_types = list(self.crop_commodity_map)
+        crop_types = [crop for crop in crop_types if self.crop_index.get(crop) in self.mock_prices]
+        
+        def build(today: date) -> pd.DataFrame:
+            commodities = sorted({self.crop_index[crop] for crop in crop_types})
+            base_prices = [self.mock_prices[commodity]["current"] for commodity in commodities]
+            paths = synthetic_price_paths(base_prices, self._history_noise(commodities, days))
+            # Crops sharing a commodity share its row
+            rows = {commodity: i for i, commodity in enumerate(commodities)}
+            matrix = paths[[rows[self.crop_index[crop]] for crop in crop_types]].T
+            return pd.DataFrame(matrix, index=pd.Index(self._history_dates(days, today), name='Date'),
+                                columns=crop_types)
+        
+        return self._memoized_history(("matrix", tuple(crop_types), days), build).copy(deep=False)
+    
+    def _forecast_key(self, crop_type: str, horizon: int, model: str) -> str:
+        # Histories only change with the date or a new store version, and so do their forecasts
+        return make_key("price:forecast", crop_type, horizon, model, date.today().isoformat(),
+                        self.store.version or "mock")
+    
+    def predict_future_prices(self, crop_type: str, days: int = 7, model: str = "auto") -> Optional[pd.DataFrame]:
+        """Deterministic forecast with prediction intervals, cached per crop for the day.
+        
+        Forecast days follow the last day of history, which for stored prices
+        may be before today. At least ``FORECAST_HORIZON`` days are computed and
+        shorter requests are served from them, since no model's early steps
+        depend on the horizon.
+        """
         try:
-            historical_data = self.generate_historical_data(crop_type, 30)
-            if historical_data is None:
-                return None
-            
-            # Simple moving average prediction
-            recent_prices = historical_data['Price'].tail(7).values
-            avg_daily_change = np.mean(np.diff(recent_prices))
-            
-            future_dates = [datetime.now() + timedelta(days=i+1) for i in range(days)]
-            current_price = recent_prices[-1]
-            
-            predicted_prices = []
-            for i in range(days):
-                # Add some randomness to predictions
-                trend_component = avg_daily_change * (i + 1)
-                random_component = np.random.normal(0, current_price * 0.01)
-                predicted_price = current_price + trend_component + random_component
-                predicted_prices.append(max(predicted_price, current_price * 0.8))
-            
-            prediction_df = pd.DataFrame({
-                'Date': future_dates,
-                'Predicted_Price': predicted_prices,
-                'Crop': crop_type,
-                'Confidence': np.random.uniform(0.7, 0.9, days)  # Mock confidence scores
-            })
-            
-            return prediction_df
+            horizon = max(days, FORECAST_HORIZON)
+            key = self._forecast_key(crop_type, horizon, model)
+            forecast_df = self.cache.get(key)
+            if forecast_df is None:
+                historical_data = self.historical_prices(crop_type, 30)
+                if historical_data is None:
+                    return None
+                
+                forecast = self.forecaster.forecast(historical_data['Price'].to_numpy(), horizon, model)
+                forecast_df = pd.DataFrame({
+                    'Date': pd.date_range(historical_data['Date'].iloc[-1] + pd.Timedelta(days=1), periods=horizon),
+                    'Predicted_Price': forecast.mean,
+                    'Lower': forecast.lower,
+                    'Upper': forecast.upper,
+                    'Crop': crop_type,
+                    'Model': forecast.model,
+                    'Confidence': forecast.confidence  # Narrower interval relative to the price -> closer to 1
+                })
+                self.cache.set(key, forecast_df, FORECAST_CACHE_TTL)
             
+            return forecast_df.head(days).copy()
+        
         except Exception as e:
             st.error(f"Error predicting prices: {str(e)}")
             return None
     
-    def get_market_analysis(self, crop_type: str) -> Dict:
-        """Provide market analysis and recommendations"""
-        current_price = self.get_current_price(crop_type)
-        historical_data = self.generate_historical_data(crop_type, 30)
+    def precompute_forecasts(self, crop_types: Optional[Sequence[str]] = None, model: str = "auto") -> int:
+        """Fill today's forecast cache ahead of page renders; returns how many crops were forecast"""
+        if crop_types is None:
+            crop_types = list(self.crop_commodity_map)
+        return sum(self.predict_future_prices(crop_type, FORECAST_HORIZON, model) is not None
+                   for crop_type in crop_types)
+    
+    def start_precompute(self, crop_types: Optional[Sequence[str]] = None, model: str = "auto") -> threading.Thread:
+        """Run ``precompute_forecasts`` on a daemon thread, so app startup doesn't wait for it"""
+        thread = threading.Thread(target=self.precompute_forecasts, args=(crop_types, model),
+                                  name="price-precompute", daemon=True)
+        thread.start()
+        return thread
+    
+    def _history_matrix(self, crop_types: Sequence[str], days: int = 30) -> Tuple[List[str], np.ndarray]:
+        """(crops, days) prices, one column per calendar day ending at each crop's latest day.
         
-        if not current_price or historical_data is None:
-            return {"status": "error", "message": "Unable to analyze market data"}
+        Days missing from stored histories are NaN; crops without any history
+        are left out.
+        """
+        stored = {crop: self.stored_history(crop, days) for crop in crop_types}
+        mock = self.generate_historical_matrix([crop for crop in crop_types if stored[crop] is None], days)
+        crops, rows = [], []
+        for crop in crop_types:
+            if stored[crop] is not None:
+                prices = stored[crop].set_index('Date')['Price']
+                calendar = pd.date_range(end=prices.index[-1], periods=days)
+                rows.append(prices.reindex(calendar).to_numpy(dtype=np.float64))
+            elif crop in mock.columns:
+                rows.append(mock[crop].to_numpy())
+            else:
+                continue
+            crops.append(crop)
+        return crops, np.array(rows).reshape(len(rows), days)
+    
+    def get_market_analysis_many(self, crop_types: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Market indicators and recommendations for many crops at once, one row per crop.
+        
+        Averages, volatility and the 7-day least-squares trend slope are computed
+        over the whole (crops, days) price matrix instead of crop by crop.
+        """
+        if crop_types is None:
+            crop_types = list(self.crop_commodity_map)
+        current = {crop: self.get_current_price(crop) for crop in crop_types}
+        crops, prices = self._history_matrix([crop for crop in crop_types if current[crop]], 30)
         
         # Calculate market indicators
-        avg_30_day = historical_data['Price'].mean()
-        current_vs_avg = ((current_price['current'] - avg_30_day) / avg_30_day) * 100
+        avg_30_day = np.nanmean(prices, axis=1)
+        current_prices = np.array([current[crop]['current'] for crop in crops], dtype=np.float64)
+        current_vs_avg = (current_prices - avg_30_day) / avg_30_day * 100
         
-        # Price volatility
-        price_std = historical_data['Price'].std()
-        volatility = (price_std / avg_30_day) * 100
+        # Price volatility (sample std, as pandas computes it)
+        volatility = np.nanstd(prices, axis=1, ddof=1) / avg_30_day * 100
         
-        # Trend analysis
-        recent_trend = np.polyfit(range(7), historical_data['Price'].tail(7).values, 1)[0]
+        # Trend analysis: least-squares slope over the days present in the last week,
+        # sum(dx*dy) / sum(dx*dx) with x and y centered on each crop's own mean
+        recent = prices[:, -7:]
+        present = ~np.isnan(recent)
+        count = np.maximum(present.sum(axis=1, keepdims=True), 1)
+        x = np.arange(recent.shape[1], dtype=np.float64)
+        dx = np.where(present, x - (present * x).sum(axis=1, keepdims=True) / count, 0.0)
+        dy = np.where(present, recent - np.nansum(recent, axis=1, keepdims=True) / count, 0.0)
+        spread = (dx * dx).sum(axis=1)
+        # Fewer than two days in the week gives no trend
+        recent_trend = np.divide((dx * dy).sum(axis=1), spread, out=np.zeros(len(crops)), where=spread > 0)
         
         # Generate recommendations
-        recommendations = []
-        
-        if current_vs_avg > 5:
-            recommendations.append("🟢 Prices are above 30-day average - good time to sell")
-        elif current_vs_avg < -5:
-            recommendations.append("🔴 Prices are below 30-day average - consider holding")
-        else:
-            recommendations.append("🟡 Prices are near average - monitor market conditions")
-        
-        if recent_trend > 0:
-            recommendations.append("📈 Recent trend is upward - prices may continue rising")
-        elif recent_trend < 0:
-            recommendations.append("📉 Recent trend is downward - prices may continue falling")
-        else:
-            recommendations.append("➡️ Recent trend is stable - consistent pricing expected")
+        average_advice = np.select(
+            [current_vs_avg > 5, current_vs_avg < -5],
+            ["🟢 Prices are above 30-day average - good time to sell",
+             "🔴 Prices are below 30-day average - consider holding"],
+            "🟡 Prices are near average - monitor market conditions"
+        )
+        trend_advice = np.select(
+            [recent_trend > 0, recent_trend < 0],
+            ["📈 Recent trend is upward - prices may continue rising",
+             "📉 Recent trend is downward - prices may continue falling"],
+            "➡️ Recent trend is stable - consistent pricing expected"
+        )
+        volatility_advice = np.where(volatility > 10, "⚡ High volatility detected - expect price swings",
+                                     "🔄 Low volatility - stable price environment")
         
-        if volatility > 10:
-            recommendations.append("⚡ High volatility detected - expect price swings")
-        else:
-            recommendations.append("🔄 Low volatility - stable price environment")
-        
-        return {
-            "status": "success",
-            "current_price": current_price['current'],
+        return pd.DataFrame({
+            "current_price": current_prices,
             "currency": "INR/kg",
-            "change_percent": current_price['change'],
+            "change_percent": [current[crop]['change'] for crop in crops],
             "vs_30day_avg": current_vs_avg,
             "volatility": volatility,
-            "trend": "upward" if recent_trend > 0 else "downward" if recent_trend < 0 else "stable",
-            "recommendations": recommendations
+            "trend_slope": recent_trend,
+            "trend": np.select([recent_trend > 0, recent_trend < 0], ["upward", "downward"], "stable"),
+            "recommendations": [list(advice) for advice in zip(average_advice.tolist(), trend_advice.tolist(),
+                                                                 volatility_advice.tolist())]
+        }, index=pd.Index(crops, name="crop"))
+    
+    def get_market_analysis(self, crop_type: str) -> Dict:
+        """Provide market analysis and recommendations"""
+        analysis = self.get_market_analysis_many([crop_type])
+        if crop_type not in analysis.index:
+            return {"status": "error", "message": "Unable to analyze market data"}
+        
+        row = analysis.loc[crop_type]
+        return {
+            "status": "success",
+            "current_price": row['current_price'],
+            "currency": row['currency'],
+            "change_percent": row['change_percent'],
+            "vs_30day_avg": row['vs_30day_avg'],
+            "volatility": row['volatility'],
+            "trend": row['trend'],
+            "recommendations": row['recommendations']
         }
     
-    def get_best_selling_time(self, crop_type: str) -> Dict:
-        """Recommend optimal selling time based on predictions"""
+    def selling_table_path(self) -> str:
+        return os.path.join(self.store.root, "selling_table.npz")
+    
+    def build_selling_table(self, crop_types: Optional[Sequence[str]] = None,
+                            processes: Optional[int] = None) -> SellingTable:
+        """Forecast every crop on a process pool and save today's selling table.
+        
+        The table records how long the build took in ``wall_time`` (seconds).
+        """
+        started = time.perf_counter()
+        crop_types = list(self.crop_commodity_map if crop_types is None else crop_types)
+        processes = processes or os.cpu_count() or 1
+        # A few chunks per worker keeps the pool busy when some crops take longer
+        chunk = max(1, -(-len(crop_types) // (processes * 4)))
+        chunks = [crop_types[i:i + chunk] for i in range(0, len(crop_types), chunk)]
+        if processes == 1:
+            results = [_selling_rows(part, self.store.root) for part in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_selling_rows, chunks, [self.store.root] * len(chunks)))
+        
+        crops = [crop for part in results for crop, _ in part]
+        rows = np.array([row for part in results for _, row in part], dtype=ADVICE_DTYPE)
+        table = SellingTable(date.today(), crops, rows, self.store.version, time.perf_counter() - started)
+        table.save(self.selling_table_path())
+        return table
+    
+    def _selling_row(self, crop_type: str) -> Optional[Tuple[int, float, float]]:
+        """(days from today to the best forecast price, that price, current price) for one crop"""
         predictions = self.predict_future_prices(crop_type, 30)
         current_price = self.get_current_price(crop_type)
-        
         if predictions is None or not current_price:
-            return {"status": "error", "message": "Unable to determine optimal selling time"}
+            return None
         
-        # Find the best price in predictions
+        # Forecast days already past (history ending well before today) can't be sold on
+        today = pd.Timestamp(date.today())
+        predictions = predictions[predictions['Date'] >= today]
+        if predictions.empty:
+            return None
         best_price_idx = predictions['Predicted_Price'].idxmax()
-        best_price = predictions.loc[best_price_idx, 'Predicted_Price']
         best_date = predictions.loc[best_price_idx, 'Date']
+        days_to_best = (best_date - today).days
+        return days_to_best, float(predictions.loc[best_price_idx, 'Predicted_Price']), float(current_price['current'])
+    
+    def get_best_selling_time(self, crop_type: str) -> Dict:
+        """Recommend optimal selling time, from today's precomputed table when there is one"""
+        if self._selling_table is None:
+            self._selling_table = SellingTableReader(self.selling_table_path())
+        table = self._selling_table.get()
+        if table is not None and table.is_current(self.store.version):
+            advice = table.lookup(self.crop_index.name(crop_type) or crop_type)
+            if advice is not None:
+                return advice
         
-        days_to_best = (best_date - datetime.now()).days
-        price_increase = ((best_price - current_price['current']) / current_price['current']) * 100
-        
-        if days_to_best <= 3 and price_increase > 2:
-            recommendation = f"🚀 Sell in {days_to_best} days for {price_increase:.1f}% higher price"
-            action = "wait"
-        elif days_to_best > 7 and price_increase > 5:
-            recommendation = f"💰 Consider waiting {days_to_best} days for {price_increase:.1f}% price increase"
-            action = "hold"
-        elif price_increase < 1:
-            recommendation = "💸 Current prices are near optimal - consider selling soon"
-            action = "sell_now"
-        else:
-            recommendation = f"📊 Monitor market - potential {price_increase:.1f}% gain in {days_to_best} days"
-            action = "monitor"
-        
-        return {
-            "status": "success",
-            "recommendation": recommendation,
-            "action": action,
-            "optimal_date": best_date.strftime("%Y-%m-%d"),
-            "days_to_wait": days_to_best,
-            "expected_price": best_price,
-            "potential_gain_percent": price_increase
-        }
\ No newline at end of file
+        row = self._selling_row(crop_type)
+        if row is None:
+            return {"status": "error", "message": "Unable to determine optimal selling time"}
+        days_to_best, best_price, current_price = row
+        return selling_advice(days_to_best, best_price, current_price,
+                              date.today() + timedelta(days=days_to_best))
+
+def _selling_rows(crop_types: List[str], store_root: str) -> List[Tuple[str, Tuple[int, float, float]]]:
+    """Process pool worker: selling table rows for a chunk of crops"""
+    service = PriceService(cache=MemoryCache(), store=PriceStore(store_root))
+    rows = []
+    for crop_type in crop_types:
+        row = service._selling_row(crop_type)
+        if row is not None:
+            rows.append((crop_type, row))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Build today's best-selling-time table for every crop")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--daemon", action="store_true", help="rebuild every day instead of once")
+    args = parser.parse_args()
+    
+    # The default cache, so with a shared backend (AGRI_CACHE_BACKEND=sqlite/shm) the apps
+    # find today's forecasts already computed
+    service = PriceService()
+    while True:
+        table = service.build_selling_table(processes=args.processes)
+        print(f"Selling table: {len(table)} crops in {table.wall_time:.2f}s -> {service.selling_table_path()}")
+        print(f"Forecasts cached: {service.precompute_forecasts()} crops")
+        if not args.daemon:
+            break
+        # Sleep until just after midnight, then rebuild for the new day
+        tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+        time.sleep(max(60.0, (tomorrow - datetime.now()).total_seconds() + 60))
+
+if __name__ == "__main__":
+    main()
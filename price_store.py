@@ -0,0 +1,345 @@
+"""Historical commodity prices on disk: sorted, dictionary-encoded NumPy columns with a per-series index"""
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import date
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from crop_registry import CropIndex
+
+# Canonical column -> header names seen in mandi/commodity dumps (Agmarknet, data.gov.in exports)
+COLUMN_ALIASES = {
+    "crop": ("crop", "commodity", "crop_type"),
+    "market": ("market", "mandi", "market_name"),
+    "date": ("date", "arrival_date", "price_date"),
+    "price": ("price", "modal_price", "modal_x0020_price"),
+    "min_price": ("min_price", "min_x0020_price"),
+    "max_price": ("max_price", "max_x0020_price")
+}
+PRICE_COLUMNS = ("price", "min_price", "max_price")
+
+# Stored prices are INR/kg like the rest of PriceService; dumps often quote per quintal
+UNIT_DIVISORS = {"INR/kg": 1, "INR/quintal": 100, "INR/tonne": 1000}
+
+DateLike = Union[date, str]
+
+def _to_day(value: DateLike) -> int:
+    """Days since 1970-01-01"""
+    return int(np.datetime64(value, "D").astype(np.int64))
+
+def current_version(root: str) -> Optional[str]:
+    """Version directory that ``root/CURRENT`` points at"""
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def new_version(root: str) -> Tuple[str, str]:
+    """Fresh version name and its (created) directory under ``root``"""
+    version = f"v{int(time.time() * 1000)}-{uuid.uuid4().hex[:6]}"
+    directory = os.path.join(root, version)
+    os.makedirs(directory)
+    return version, directory
+
+def publish_version(root: str, version: str):
+    """Point ``root/CURRENT`` at ``version`` atomically and drop all but the previous version"""
+    previous = current_version(root)
+    pointer = os.path.join(root, "CURRENT.tmp")
+    with open(pointer, "w") as f:
+        f.write(version)
+    os.replace(pointer, os.path.join(root, "CURRENT"))
+    # Readers may still map the previous version; anything older can go
+    for entry in os.listdir(root):
+        if entry.startswith("v") and entry not in (version, previous):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+def _header_key(name: str) -> str:
+    return "_".join(str(name).strip().lower().split())
+
+def _name_key(name: str) -> str:
+    return " ".join(str(name).lower().replace("_", " ").split())
+
+class StoreSnapshot(NamedTuple):
+    """One immutable version of the store, memory-mapped"""
+    version: str
+    columns: Dict[str, np.ndarray]
+    crops: List[str]
+    markets: List[str]
+    crop_ids: Dict[str, int]  # Name key -> store id, for dictionary-encoding new rows
+    market_ids: Dict[str, int]
+    series: Dict[Tuple[int, int], Tuple[int, int]]
+    crop_series: Dict[int, List[Tuple[int, int, int]]]
+    crop_index: CropIndex[int]  # Store crop id by any name, alias or plural of the crop
+
+class PriceStore:
+    """Daily prices per (crop, market), stored as columns sorted by crop, market and day.
+    
+    Crop and market names are dictionary-encoded to integer ids, and an index of
+    row ranges per (crop, market) series means a range query is a dictionary
+    lookup plus a binary search on that series' days rather than a scan.
+    Each ingest writes a new version directory and switches ``CURRENT`` to it
+    atomically, so readers never see a half-written store.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._snapshot_cache: Optional[StoreSnapshot] = None
+    
+    @property
+    def version(self) -> Optional[str]:
+        """Name of the version readers currently see (None while empty or not created yet)"""
+        return current_version(self.root)
+    
+    def snapshot(self) -> Optional[StoreSnapshot]:
+        """Latest version, reloaded only when another ingest has switched ``CURRENT``.
+        
+        ``CURRENT`` is read once; pass the snapshot on to the query methods so a
+        whole lookup sees one version.
+        """
+        version = current_version(self.root)
+        snapshot = self._snapshot_cache
+        if version is None or (snapshot is not None and snapshot.version == version):
+            return snapshot if version is not None else None
+        
+        directory = os.path.join(self.root, version)
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                   for name in ("crop", "market", "day") + PRICE_COLUMNS}
+        series = {}
+        crop_series: Dict[int, List[Tuple[int, int, int]]] = {}
+        for crop_id, market_id, start, stop in np.load(os.path.join(directory, "series.npy")).tolist():
+            series[(crop_id, market_id)] = (start, stop)
+            crop_series.setdefault(crop_id, []).append((market_id, start, stop))
+        snapshot = StoreSnapshot(
+            version, columns, meta["crops"], meta["markets"],
+            {_name_key(name): i for i, name in enumerate(meta["crops"])},
+            {_name_key(name): i for i, name in enumerate(meta["markets"])},
+            series, crop_series,
+            CropIndex({name: i for i, name in enumerate(meta["crops"])})
+        )
+        self._snapshot_cache = snapshot
+        return snapshot
+    
+    @staticmethod
+    def _read_chunks(path: str, chunksize: int) -> Iterator[pd.DataFrame]:
+        if path.lower().endswith((".parquet", ".pq")):
+            # Parquet needs pyarrow or fastparquet installed
+            yield pd.read_parquet(path)
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize, low_memory=False)
+    
+    @staticmethod
+    def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+        headers = {_header_key(column): column for column in df.columns}
+        renamed = {}
+        for canonical, aliases in COLUMN_ALIASES.items():
+            for alias in aliases:
+                if alias in headers:
+                    renamed[headers[alias]] = canonical
+                    break
+        missing = {"crop", "market", "date", "price"} - set(renamed.values())
+        if missing:
+            raise ValueError(f"Price data is missing columns: {', '.join(sorted(missing))}")
+        return df[list(renamed)].rename(columns=renamed)
+    
+    def ingest(self, path: str, unit: str = "INR/kg", dayfirst: bool = True,
+               date_format: Optional[str] = None, chunksize: int = 1_000_000) -> int:
+        """Load a CSV or Parquet dump; rows for an existing (crop, market, day) replace the old price.
+        
+        Returns the number of rows read.
+        """
+        return self.ingest_frames(self._read_chunks(path, chunksize), unit, dayfirst, date_format)
+    
+    def ingest_frames(self, frames, unit: str = "INR/kg", dayfirst: bool = True,
+                      date_format: Optional[str] = None) -> int:
+        """Load DataFrames with crop, market, date and price columns (any of the known header names)"""
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        divisor = UNIT_DIVISORS[unit]
+        with self._lock:
+            snapshot = self.snapshot()
+            crops = list(snapshot.crops) if snapshot else []
+            markets = list(snapshot.markets) if snapshot else []
+            crop_ids = dict(snapshot.crop_ids) if snapshot else {}
+            market_ids = dict(snapshot.market_ids) if snapshot else {}
+            
+            def encode(values: pd.Series, names: List[str], ids: Dict[str, int]) -> np.ndarray:
+                # Factorize the chunk first so the dictionary is consulted once per distinct name
+                codes, uniques = pd.factorize(values.astype(str).str.strip())
+                mapping = np.empty(len(uniques), dtype=np.int32)
+                for i, name in enumerate(uniques):
+                    key = _name_key(name)
+                    if key not in ids:
+                        ids[key] = len(names)
+                        names.append(name)
+                    mapping[i] = ids[key]
+                return mapping[codes]
+            
+            parts = {name: [] for name in ("crop", "market", "day") + PRICE_COLUMNS}
+            rows = 0
+            for df in frames:
+                df = self._canonical(df)
+                # Dumps repeat each date thousands of times; parse the distinct values only
+                codes, uniques = pd.factorize(df["date"])
+                parsed = pd.to_datetime(pd.Series(uniques), dayfirst=dayfirst, format=date_format, errors="coerce")
+                days = pd.Series(parsed.to_numpy()[codes], index=df.index).where(codes >= 0)
+                prices = pd.to_numeric(df["price"], errors="coerce")
+                keep = (days.notna() & prices.notna() & df["crop"].notna() & df["market"].notna()).to_numpy()
+                df = df[keep]
+                rows += len(df)
+                parts["crop"].append(encode(df["crop"], crops, crop_ids))
+                parts["market"].append(encode(df["market"], markets, market_ids))
+                parts["day"].append(days[keep].to_numpy().astype("datetime64[D]").astype(np.int32))
+                for name in PRICE_COLUMNS:
+                    values = (pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+                              if name in df else np.full(len(df), np.nan))
+                    parts[name].append((values / divisor).astype(np.float32))
+            if not rows:
+                return 0
+            
+            # Existing rows go first so a stable sort keeps the newly ingested price last
+            columns = {}
+            for name, chunks in parts.items():
+                if snapshot is not None:
+                    chunks = [np.asarray(snapshot.columns[name])] + chunks
+                columns[name] = np.concatenate(chunks)
+            self._write(columns, crops, markets)
+            return rows
+    
+    def _write(self, columns: Dict[str, np.ndarray], crops: List[str], markets: List[str]):
+        order = np.lexsort((columns["day"], columns["market"], columns["crop"]))
+        columns = {name: values[order] for name, values in columns.items()}
+        keys = np.stack((columns["crop"], columns["market"], columns["day"]))
+        # Keep the last row of each duplicate (crop, market, day)
+        last = np.ones(keys.shape[1], dtype=bool)
+        last[:-1] = (keys[:, 1:] != keys[:, :-1]).any(axis=0)
+        columns = {name: values[last] for name, values in columns.items()}
+        
+        pairs = columns["crop"].astype(np.int64) * len(markets) + columns["market"]
+        starts = np.concatenate(([0], np.nonzero(np.diff(pairs))[0] + 1))
+        stops = np.append(starts[1:], len(pairs))
+        series = np.column_stack((columns["crop"][starts], columns["market"][starts], starts, stops)).astype(np.int64)
+        
+        # Only writes create the store; reads of a missing root see an empty store
+        os.makedirs(self.root, exist_ok=True)
+        version, directory = new_version(self.root)
+        for name, values in columns.items():
+            np.save(os.path.join(directory, f"{name}.npy"), values)
+        np.save(os.path.join(directory, "series.npy"), series)
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"crops": crops, "markets": markets, "rows": int(len(pairs))}, f)
+        
+        publish_version(self.root, version)
+    
+    def crops(self) -> List[str]:
+        snapshot = self.snapshot()
+        return [snapshot.crops[crop_id] for crop_id in sorted(snapshot.crop_series)] if snapshot else []
+    
+    def markets(self, crop: Optional[str] = None) -> List[str]:
+        """Markets with prices, for one crop or overall"""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return []
+        if crop is None:
+            return sorted({snapshot.markets[market_id] for market_id, _ in snapshot.series})
+        crop_id = snapshot.crop_index.get(crop)
+        return [snapshot.markets[market_id] for market_id, _, _ in snapshot.crop_series.get(crop_id, [])]
+    
+    def has_crop(self, crop: str, snapshot: Optional[StoreSnapshot] = None) -> bool:
+        """Whether the store has prices for the crop under any name, alias or plural ("Corn" finds "Maize")"""
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        return snapshot is not None and snapshot.crop_index.get(crop) in snapshot.crop_series
+    
+    def _ranges(self, snapshot: StoreSnapshot, crop: str, market: Optional[str],
+                start: Optional[DateLike], end: Optional[DateLike]) -> List[Tuple[int, int]]:
+        """Row ranges of the matching series, narrowed to the dates by binary search"""
+        crop_id = snapshot.crop_index.get(crop)
+        if market is None:
+            series = [(first, last) for _, first, last in snapshot.crop_series.get(crop_id, [])]
+        else:
+            found = snapshot.series.get((crop_id, snapshot.market_ids.get(_name_key(market))))
+            series = [found] if found else []
+        
+        days = snapshot.columns["day"]
+        ranges = []
+        for first, last in series:
+            if start is not None:
+                first += int(np.searchsorted(days[first:last], _to_day(start), side="left"))
+            if end is not None:
+                last = first + int(np.searchsorted(days[first:last], _to_day(end), side="right"))
+            if last > first:
+                ranges.append((first, last))
+        return ranges
+    
+    def query(self, crop: str, market: Optional[str] = None, start: Optional[DateLike] = None,
+              end: Optional[DateLike] = None) -> pd.DataFrame:
+        """Rows for a crop (all markets unless ``market`` is given) between ``start`` and ``end`` inclusive"""
+        snapshot = self.snapshot()
+        ranges = self._ranges(snapshot, crop, market, start, end) if snapshot else []
+        if not ranges:
+            return pd.DataFrame(columns=["Date", "Market", "Price", "Min_Price", "Max_Price", "Crop"])
+        rows = np.concatenate([np.arange(first, last) for first, last in ranges])
+        columns = snapshot.columns
+        return pd.DataFrame({
+            "Date": columns["day"][rows].astype("datetime64[D]").astype("datetime64[ns]"),
+            "Market": np.asarray(snapshot.markets, dtype=object)[columns["market"][rows]],
+            "Price": columns["price"][rows],
+            "Min_Price": columns["min_price"][rows],
+            "Max_Price": columns["max_price"][rows],
+            "Crop": snapshot.crops[snapshot.crop_index[crop]]
+        })
+    
+    def daily_prices(self, crop: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+                     market: Optional[str] = None, snapshot: Optional[StoreSnapshot] = None) -> pd.DataFrame:
+        """Mean price per day across markets (or for one market), shaped like the mock history"""
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        ranges = self._ranges(snapshot, crop, market, start, end) if snapshot else []
+        if not ranges:
+            return pd.DataFrame(columns=["Date", "Price", "Crop"])
+        days = np.concatenate([snapshot.columns["day"][first:last] for first, last in ranges])
+        prices = np.concatenate([snapshot.columns["price"][first:last] for first, last in ranges])
+        first_day = int(days.min())
+        offsets = days - first_day
+        counts = np.bincount(offsets)
+        totals = np.bincount(offsets, weights=prices)
+        present = np.nonzero(counts)[0]
+        return pd.DataFrame({
+            "Date": (present + first_day).astype("datetime64[D]").astype("datetime64[ns]"),
+            "Price": totals[present] / counts[present],
+            "Crop": crop
+        })
+    
+    def latest_date(self, crop: str, snapshot: Optional[StoreSnapshot] = None) -> Optional[date]:
+        """Most recent day with a price for the crop in any market"""
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        if snapshot is None:
+            return None
+        series = snapshot.crop_series.get(snapshot.crop_index.get(crop))
+        if not series:
+            return None
+        day = max(int(snapshot.columns["day"][last - 1]) for _, _, last in series)
+        return date.fromisoformat(str(np.datetime64(day, "D")))
+    
+    def __len__(self) -> int:
+        snapshot = self.snapshot()
+        return len(snapshot.columns["day"]) if snapshot else 0
+
+_default_price_store: Optional[PriceStore] = None
+_default_price_store_lock = threading.Lock()
+
+def get_default_price_store() -> PriceStore:
+    """Process-wide store at ``AGRI_PRICE_STORE_PATH`` (default ``~/.agri_assistant/prices``)"""
+    global _default_price_store
+    with _default_price_store_lock:
+        if _default_price_store is None:
+            _default_price_store = PriceStore(os.environ.get(
+                "AGRI_PRICE_STORE_PATH", os.path.join(os.path.expanduser("~"), ".agri_assistant", "prices")
+            ))
+        return _default_price_store
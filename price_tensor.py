@@ -0,0 +1,177 @@
+"""All stored prices as one memory-mapped (crop, market, day) float32 array shared through the page cache"""
+import json
+import os
+import threading
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Union
+import numpy as np
+import pandas as pd
+from crop_registry import CropIndex
+from price_store import PriceStore, current_version, new_version, publish_version
+
+DateLike = Union[date, str]
+
+def _name_key(name: str) -> str:
+    return " ".join(str(name).lower().replace("_", " ").split())
+
+class _Tensor(NamedTuple):
+    version: str
+    values: np.ndarray
+    crops: List[str]
+    markets: List[str]
+    crop_ids: CropIndex[int]
+    market_ids: Dict[str, int]
+    start: date
+    source_version: Optional[str]
+
+class PriceTensor:
+    """Read-only view of ``root/<version>/prices.npy`` plus its crop/market index.
+    
+    ``values[crop_id, market_id, day]`` is the price in INR/kg on ``start + day``
+    (NaN where there was none). The array is opened with ``mmap_mode="r"``, so
+    slices are views onto the file and every worker process maps the same
+    pages from the OS cache instead of holding its own copy.
+    """
+    
+    def __init__(self, root: str):
+        self.root = root
+        self._tensor: Optional[_Tensor] = None
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Optional[_Tensor]:
+        version = current_version(self.root)
+        tensor = self._tensor
+        if version is None:
+            return None
+        if tensor is not None and tensor.version == version:
+            return tensor
+        with self._lock:
+            directory = os.path.join(self.root, version)
+            with open(os.path.join(directory, "index.json")) as f:
+                index = json.load(f)
+            tensor = _Tensor(
+                version, np.load(os.path.join(directory, "prices.npy"), mmap_mode="r"),
+                index["crops"], index["markets"],
+                CropIndex({name: i for i, name in enumerate(index["crops"])}),
+                {_name_key(name): i for i, name in enumerate(index["markets"])},
+                date.fromisoformat(index["start"]), index.get("source_version")
+            )
+            self._tensor = tensor
+            return tensor
+    
+    @classmethod
+    def build(cls, store: PriceStore, root: str) -> "PriceTensor":
+        """Write the store's current contents as a new tensor version under ``root``"""
+        snapshot = store.snapshot()
+        if snapshot is None:
+            raise ValueError("Price store is empty")
+        os.makedirs(root, exist_ok=True)
+        version, directory = new_version(root)
+        columns = snapshot.columns
+        first_day = int(columns["day"].min())
+        days = int(columns["day"].max()) - first_day + 1
+        
+        values = np.lib.format.open_memmap(os.path.join(directory, "prices.npy"), mode="w+", dtype=np.float32,
+                                           shape=(len(snapshot.crops), len(snapshot.markets), days))
+        # One crop at a time keeps the scatter's temporaries small
+        for crop_id in range(len(snapshot.crops)):
+            values[crop_id] = np.nan
+            series = snapshot.crop_series.get(crop_id)
+            if not series:
+                continue
+            first, last = min(start for _, start, _ in series), max(stop for _, _, stop in series)
+            values[crop_id, columns["market"][first:last], columns["day"][first:last] - first_day] = \
+                columns["price"][first:last]
+        values.flush()
+        del values
+        
+        with open(os.path.join(directory, "index.json"), "w") as f:
+            json.dump({
+                "crops": snapshot.crops,
+                "markets": snapshot.markets,
+                "start": str(np.datetime64(first_day, "D")),
+                "days": days,
+                "source_version": snapshot.version
+            }, f)
+        publish_version(root, version)
+        return cls(root)
+    
+    @property
+    def source_version(self) -> Optional[str]:
+        """Store version the tensor was built from"""
+        tensor = self._load()
+        return tensor.source_version if tensor else None
+    
+    @property
+    def values(self) -> Optional[np.ndarray]:
+        """The whole (crops, markets, days) array, memory-mapped"""
+        tensor = self._load()
+        return tensor.values if tensor else None
+    
+    @property
+    def start(self) -> Optional[date]:
+        tensor = self._load()
+        return tensor.start if tensor else None
+    
+    def crops(self) -> List[str]:
+        tensor = self._load()
+        return list(tensor.crops) if tensor else []
+    
+    def markets(self) -> List[str]:
+        tensor = self._load()
+        return list(tensor.markets) if tensor else []
+    
+    def crop_id(self, crop: str) -> Optional[int]:
+        tensor = self._load()
+        return tensor.crop_ids.get(crop) if tensor else None
+    
+    def market_id(self, market: str) -> Optional[int]:
+        tensor = self._load()
+        return tensor.market_ids.get(_name_key(market)) if tensor else None
+    
+    def _day_range(self, tensor: _Tensor, start: Optional[DateLike], end: Optional[DateLike]):
+        days = tensor.values.shape[2]
+        first = 0 if start is None else max(0, (np.datetime64(start, "D") - np.datetime64(tensor.start)).astype(int))
+        last = days if end is None else min(days, (np.datetime64(end, "D") - np.datetime64(tensor.start)).astype(int) + 1)
+        return int(first), int(last)
+    
+    def window(self, crop: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+               market: Optional[str] = None) -> Optional[np.ndarray]:
+        """Zero-copy (markets, days) slice for a crop, or (days,) for one market; None if unknown"""
+        tensor = self._load()
+        return self._window(tensor, crop, start, end, market) if tensor else None
+    
+    def _window(self, tensor: _Tensor, crop: str, start: Optional[DateLike], end: Optional[DateLike],
+                market: Optional[str]) -> Optional[np.ndarray]:
+        crop_id = tensor.crop_ids.get(crop)
+        if crop_id is None:
+            return None
+        first, last = self._day_range(tensor, start, end)
+        if market is None:
+            return tensor.values[crop_id, :, first:last]
+        market_id = tensor.market_ids.get(_name_key(market))
+        return None if market_id is None else tensor.values[crop_id, market_id, first:last]
+    
+    def daily_prices(self, crop: str, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+                     market: Optional[str] = None) -> pd.DataFrame:
+        """Mean price per day across markets (or for one market); same shape as ``PriceStore.daily_prices``"""
+        # One load, so the window and its dates come from the same version
+        tensor = self._load()
+        window = self._window(tensor, crop, start, end, market) if tensor else None
+        if window is None or not window.size:
+            return pd.DataFrame(columns=["Date", "Price", "Crop"])
+        window = np.atleast_2d(window)
+        present = ~np.isnan(window)
+        counts = present.sum(axis=0)
+        totals = np.where(present, window, 0).sum(axis=0, dtype=np.float64)
+        days = np.nonzero(counts)[0]
+        first = self._day_range(tensor, start, end)[0]
+        return pd.DataFrame({
+            "Date": pd.Timestamp(tensor.start).as_unit("ns") + pd.to_timedelta(days + first, unit="D"),
+            "Price": totals[days] / counts[days],
+            "Crop": crop
+        })
+
+def tensor_root(store: PriceStore) -> str:
+    """Where the tensor for a store lives"""
+    return os.path.join(store.root, "tensor")
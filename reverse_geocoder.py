@@ -0,0 +1,110 @@
+"""Offline reverse geocoding against a bundled table of populated places"""
+import csv
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+PLACES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "places.csv")
+
+EARTH_RADIUS_KM = 6371.0
+
+def to_unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere, so straight-line distance orders like great-circle distance"""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+def chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+class KDTree:
+    """Static 3-d tree over unit vectors, stored implicitly in one median-ordered list"""
+    
+    def __init__(self, points: List[Tuple[float, float, float]]):
+        self._items = list(enumerate(points))
+        self._build(0, len(self._items), 0)
+    
+    def _build(self, lo: int, hi: int, depth: int):
+        if hi - lo <= 1:
+            return
+        axis = depth % 3
+        # Median of each range sits at its midpoint; halves are its subtrees
+        self._items[lo:hi] = sorted(self._items[lo:hi], key=lambda item: item[1][axis])
+        mid = (lo + hi) // 2
+        self._build(lo, mid, depth + 1)
+        self._build(mid + 1, hi, depth + 1)
+    
+    def nearest(self, point: Tuple[float, float, float]) -> Tuple[int, float]:
+        """Index of the nearest point and its straight-line distance"""
+        best = [-1, float("inf")]  # [index, squared distance]
+        self._search(point, 0, len(self._items), 0, best)
+        return best[0], math.sqrt(best[1])
+    
+    def _search(self, point, lo: int, hi: int, depth: int, best: List):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        index, candidate = self._items[mid]
+        distance = ((point[0] - candidate[0]) ** 2 + (point[1] - candidate[1]) ** 2 +
+                    (point[2] - candidate[2]) ** 2)
+        if distance < best[1]:
+            best[0], best[1] = index, distance
+        
+        axis = depth % 3
+        offset = point[axis] - candidate[axis]
+        near, far = ((mid + 1, hi), (lo, mid)) if offset > 0 else ((lo, mid), (mid + 1, hi))
+        self._search(point, near[0], near[1], depth + 1, best)
+        # The other half can only help if the splitting plane is closer than the best so far
+        if offset * offset < best[1]:
+            self._search(point, far[0], far[1], depth + 1, best)
+
+class ReverseGeocoder:
+    """Resolve coordinates to "City, State" from the bundled places table"""
+    
+    def __init__(self, path: str = PLACES_PATH):
+        with open(path, newline="", encoding="utf-8") as f:
+            self.places: List[Dict] = [
+                {
+                    "name": row["name"],
+                    "admin1": row["admin1"],
+                    "country": row["country"],
+                    "latitude": float(row["latitude"]),
+                    "longitude": float(row["longitude"])
+                }
+                for row in csv.DictReader(f)
+            ]
+        self._tree = KDTree([to_unit_vector(place["latitude"], place["longitude"]) for place in self.places])
+    
+    def nearest(self, latitude: float, longitude: float) -> Tuple[Dict, float]:
+        """Closest bundled place and its great-circle distance in km"""
+        index, chord = self._tree.nearest(to_unit_vector(latitude, longitude))
+        return self.places[index], chord_to_km(chord)
+    
+    def lookup(self, latitude: float, longitude: float, max_distance_km: float = 40.0) -> Optional[str]:
+        """Name of the nearest place within ``max_distance_km``, else None"""
+        place, distance = self.nearest(latitude, longitude)
+        if distance > max_distance_km:
+            return None
+        return self.format_place(place)
+    
+    @staticmethod
+    def format_place(place: Dict) -> str:
+        # Same shape as the online lookup: city plus state, or country when there is no state
+        parts = [place["name"]]
+        if place["admin1"] and place["admin1"] != place["name"]:
+            parts.append(place["admin1"])
+        else:
+            parts.append(place["country"])
+        return ", ".join(parts)
+
+_default_geocoder: Optional[ReverseGeocoder] = None
+_default_geocoder_lock = threading.Lock()
+
+def get_reverse_geocoder() -> ReverseGeocoder:
+    """Process-wide geocoder, loaded from the bundled table on first use"""
+    global _default_geocoder
+    with _default_geocoder_lock:
+        if _default_geocoder is None:
+            _default_geocoder = ReverseGeocoder()
+        return _default_geocoder
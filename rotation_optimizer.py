@@ -0,0 +1,181 @@
+"""Multi-year crop rotation search: exact dynamic programming over (previous crop, crop) states"""
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from crop_registry import CropIndex
+from financial_calculator import FinancialCalculator
+
+# Points per year of the plan, on the same scale as CropRotationPlanner.check_compatibility
+WEIGHTS = {
+    "new_family": 30.0,          # No family shared with last year's crop
+    "fixing_then_high": 40.0,    # Heavy feeder uses nitrogen fixed by a legume
+    "high_then_fixing": 30.0,
+    "high_then_high": -20.0,
+    "nitrogen_other": 10.0,
+    "shared_pest": -10.0,        # Per pest shared with last year's crop
+    "short_break": -10.0,        # Same family (or crop) as two years ago
+    "short_break_pest": -5.0,    # Per pest shared with the crop two years ago
+    "profit": 40.0               # For the most profitable candidate, scaled linearly for the rest
+}
+
+# Plans remembered before the memo is reset
+PLAN_MEMO_SIZE = 1024
+
+class RotationPlan(NamedTuple):
+    """Best sequence found, starting with the current crop"""
+    sequence: List[str]
+    score: float
+    profit_per_acre: List[Optional[float]]
+
+class RotationOptimizer:
+    """Find the highest-scoring N-year rotation for a planner's crop tables.
+    
+    A year's score depends on the crop and the two before it (families,
+    nitrogen categories and pests), so the search runs over states of
+    (last year's crop, this year's crop). Scores for every pair and
+    two-years-apart pair of candidates are precomputed as matrices, which
+    makes each year one vectorized max over N^3 entries and the result exact
+    rather than a beam approximation. Matrices and finished plans are
+    memoized per candidate set.
+    """
+    
+    def __init__(self, planner, financial: Optional[FinancialCalculator] = None,
+                 weights: Optional[Dict[str, float]] = None):
+        self.planner = planner
+        self.financial = financial if financial is not None else FinancialCalculator()
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.pest_index = CropIndex(planner.pest_concerns, planner.registry)
+        self._tables: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = {}
+        self._plans: Dict[Tuple, RotationPlan] = {}
+        self._lock = threading.Lock()
+    
+    def __getstate__(self) -> Dict:
+        # Sent to pool workers with its configuration; memos are rebuilt there
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_tables"], state["_plans"] = {}, {}
+        return state
+    
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def default_candidates(self) -> List[str]:
+        """Every crop the planner or the financial calculator knows, once each"""
+        names = [crop for crops in self.planner.crop_families.values() for crop in crops]
+        names += [crop for crops in self.planner.nitrogen_needs.values() for crop in crops]
+        names += list(self.planner.pest_concerns) + list(self.financial.base_yields)
+        return list(dict.fromkeys(names))
+    
+    def _pair_scores(self, crop1: str, crop2: str) -> Tuple[float, float]:
+        """(score for crop2 right after crop1, score for crop2 two years after crop1)"""
+        weights = self.weights
+        same_crop = self.planner.registry.resolve(crop1) == self.planner.registry.resolve(crop2)
+        families1, families2 = self.planner.crop_families_of(crop1), self.planner.crop_families_of(crop2)
+        known = "other" not in families1 and "other" not in families2
+        shared_family = same_crop or (known and not set(families1).isdisjoint(families2))
+        shared_pests = len(set(self.pest_index.get(crop1, ())) & set(self.pest_index.get(crop2, ())))
+        
+        n1 = self.planner._find_nitrogen_category(crop1)
+        n2 = self.planner._find_nitrogen_category(crop2)
+        if n1 == "fixing" and n2 == "high":
+            nitrogen = weights["fixing_then_high"]
+        elif n1 == "high" and n2 == "fixing":
+            nitrogen = weights["high_then_fixing"]
+        elif n1 == "high" and n2 == "high":
+            nitrogen = weights["high_then_high"]
+        else:
+            nitrogen = weights["nitrogen_other"]
+        
+        next_year = nitrogen + shared_pests * weights["shared_pest"]
+        if known and not shared_family:
+            next_year += weights["new_family"]
+        two_years = shared_family * weights["short_break"] + shared_pests * weights["short_break_pest"]
+        return next_year, two_years
+    
+    def _score_tables(self, crops: Tuple[str, ...]) -> Tuple[np.ndarray, np.ndarray]:
+        """(next-year, two-years-later) score matrices over ``crops``, memoized"""
+        tables = self._tables.get(crops)
+        if tables is None:
+            size = len(crops)
+            next_year, two_years = np.empty((size, size)), np.empty((size, size))
+            for i, crop1 in enumerate(crops):
+                for j, crop2 in enumerate(crops):
+                    next_year[i, j], two_years[i, j] = self._pair_scores(crop1, crop2)
+            tables = (next_year, two_years)
+            with self._lock:
+                self._tables[crops] = tables
+        return tables
+    
+    def profit_per_acre(self, crop: str, price: Optional[float]) -> Optional[float]:
+        """Expected profit in INR/acre at ``price`` INR/kg, or None without a price"""
+        if price is None:
+            return None
+        quintals = self.financial.estimate_yield(crop, 1)["yield_per_acre_quintals"]
+        return quintals * price * 100 - self.financial.calculate_total_cost(crop, 1)["total_per_acre"]
+    
+    def profit_scores(self, crops: Sequence[str],
+                      prices: Optional[Dict[str, float]]) -> Tuple[List[Optional[float]], np.ndarray]:
+        """Profit per acre for each crop and its score, the most profitable getting the full ``profit`` weight"""
+        prices = prices or {}
+        profits = [self.profit_per_acre(crop, prices.get(crop)) for crop in crops]
+        scale = max([abs(p) for p in profits if p is not None] or [1.0]) or 1.0
+        return profits, np.array([0.0 if p is None else p / scale * self.weights["profit"] for p in profits])
+    
+    def score_tables(self, crops: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(next-year, two-years-later) score matrices over ``crops``, memoized"""
+        return self._score_tables(tuple(crops))
+    
+    def optimize(self, current_crop: str, years: int = 3, candidates: Optional[Sequence[str]] = None,
+                 prices: Optional[Dict[str, float]] = None) -> RotationPlan:
+        """Best ``years``-long sequence starting with ``current_crop``.
+        
+        ``prices`` (INR/kg by crop) add expected profit to the score; crops
+        without a price are judged on agronomy alone.
+        """
+        candidates = tuple(dict.fromkeys(candidates or self.default_candidates()))
+        prices = prices or {}
+        crop_prices = tuple(prices.get(crop) for crop in candidates)
+        key = (current_crop, years, candidates, crop_prices)
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+        
+        # Index 0 is the current crop, the rest are the candidates
+        crops = (current_crop,) + candidates
+        next_year, two_years = self._score_tables(crops)
+        profits, unary = self.profit_scores(candidates, prices)
+        size = len(crops)
+        
+        # best[a, b]: best score of a plan whose last two crops are a then b
+        best = np.full((size, size), -np.inf)
+        if years >= 2:
+            best[0, 1:] = next_year[0, 1:] + unary
+        backpointers = []
+        for _ in range(years - 2):
+            # totals[a, b, c] = best[a, b] + two_years[a, c], maximized over a
+            totals = best[:, :, None] + two_years[:, None, :]
+            previous = totals.argmax(axis=0)
+            step = np.take_along_axis(totals, previous[None], axis=0)[0]
+            best = np.full((size, size), -np.inf)
+            best[:, 1:] = step[:, 1:] + next_year[:, 1:] + unary
+            backpointers.append(previous)
+        
+        if years < 2:
+            sequence, score = [current_crop], 0.0
+        else:
+            a, b = np.unravel_index(int(best.argmax()), best.shape)
+            score = float(best[a, b])
+            indexes = [b, a]
+            for previous in reversed(backpointers):
+                a, b = previous[a, b], a
+                indexes.append(a)
+            sequence = [crops[i] for i in reversed(indexes)]
+        
+        by_crop = dict(zip(candidates, profits))
+        plan = RotationPlan(sequence, score, [None] + [by_crop.get(crop) for crop in sequence[1:]])
+        with self._lock:
+            if len(self._plans) >= PLAN_MEMO_SIZE:
+                self._plans.clear()
+            self._plans[key] = plan
+        return plan
@@ -367,7 +367,7 @@ with tab3:
 
     with chart_col1:
         st.markdown("### 📊 30-Day Price History")
-        historical_data = price_service.generate_historical_data(crop_type, 30)
+        historical_data = price_service.historical_prices(crop_type, 30)
         if historical_data is not None:
             st.line_chart(historical_data.set_index('Date')['Price'], height=400)
         else:
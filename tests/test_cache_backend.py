@@ -0,0 +1,132 @@
+import os
+import stat
+import uuid
+
+import pandas as pd
+import pytest
+
+import cache_backend
+from cache_backend import CacheBackend, MemoryCache, SharedMemoryCache, SQLiteCache, create_cache
+
+
+@pytest.fixture(params=["memory", "sqlite", "shm"])
+def make_cache(request, tmp_path):
+    caches = []
+
+    def make(max_entries=100):
+        if request.param == "memory":
+            cache = MemoryCache(max_entries)
+        elif request.param == "sqlite":
+            cache = SQLiteCache(str(tmp_path / f"cache-{len(caches)}.sqlite"), max_entries)
+        else:
+            cache = SharedMemoryCache(f"test-{uuid.uuid4().hex}.sqlite", max_entries)
+        caches.append(cache)
+        return cache
+
+    yield make
+    for cache in caches:
+        if isinstance(cache, SharedMemoryCache):
+            cache.close()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(cache.path + suffix):
+                    os.remove(cache.path + suffix)
+
+
+def test_round_trip(make_cache):
+    cache = make_cache()
+    frame = pd.DataFrame({"Price": [1.0, 2.0]})
+
+    cache.set("a", {"temperature": 24.5}, ttl=60)
+    cache.set("b", frame, ttl=60)
+    cache.set("none", None, ttl=60)
+
+    assert cache.get("a") == {"temperature": 24.5}
+    pd.testing.assert_frame_equal(cache.get("b"), frame)
+    assert cache.get("none", "missing") == "missing"
+    assert len(cache) == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_expired_entries_are_stale_then_evicted(make_cache):
+    cache = make_cache()
+
+    cache.set("stale", 1, ttl=0, stale_ttl=60)
+    cache.set("gone", 2, ttl=-1)
+
+    assert cache.get("stale") is None
+    entry = cache.get_entry("stale")
+    assert entry.value == 1 and not entry.is_fresh
+    assert cache.get_entry("gone") is None
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted(make_cache):
+    cache = make_cache(max_entries=2)
+
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+
+
+def test_clear_by_prefix(make_cache):
+    cache = make_cache()
+    cache.set("weather:1", 1, ttl=60)
+    cache.set("weather:2", 2, ttl=60)
+    cache.set("price:1", 3, ttl=60)
+
+    cache.clear("weather:")
+
+    assert len(cache) == 1 and cache.get("price:1") == 3
+
+
+def test_sqlite_file_is_private(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    cache.set("a", 1, ttl=60)
+
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+
+
+def test_shared_cache_lives_in_a_private_per_user_directory():
+    cache = SharedMemoryCache(f"test-{uuid.uuid4().hex}.sqlite")
+    try:
+        directory = os.path.dirname(cache.path)
+        assert os.path.basename(directory) == f"agri_assistant-{os.getuid()}"
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    finally:
+        cache.close()
+        os.remove(cache.path)
+
+
+def test_directory_others_can_write_is_refused(tmp_path):
+    directory = tmp_path / "shared"
+    directory.mkdir()
+    directory.chmod(0o777)
+
+    with pytest.raises(PermissionError):
+        cache_backend._private_directory(str(directory))
+
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+@pytest.mark.parametrize("kind, backend", [("memory", MemoryCache), ("sqlite", SQLiteCache)])
+def test_default_cache_follows_environment(monkeypatch, tmp_path, kind, backend):
+    monkeypatch.setenv("AGRI_CACHE_BACKEND", kind)
+    monkeypatch.setenv("AGRI_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(cache_backend, "_default_cache", None)
+
+    cache = cache_backend.get_default_cache()
+
+    assert type(cache) is backend
+    assert cache_backend.get_default_cache() is cache
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_cache("redis")
@@ -0,0 +1,87 @@
+import pickle
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import crop_registry
+
+from cache_backend import MemoryCache
+from crop_registry import CropIndex, CropRegistry
+from price_service import PriceService
+from price_store import PriceStore
+
+
+def test_index_matches_names_aliases_and_plurals_only():
+    registry = CropRegistry()
+    index = CropIndex({"Tomatoes": "tomatoes", "Cherry": "cherry", "Cotton": "cotton", "Corn": "corn"}, registry)
+    assert index.get("tomato") == "tomatoes"
+    assert index.get("MAIZE") == "corn"
+    assert index.get("Cherry Tomato") is None
+    assert index.get("Cotton seed") is None
+    assert index.get("Tomatos") is None
+
+
+def test_fuzzy_only_when_asked():
+    registry = CropRegistry()
+    registry.intern("Tomatoes")
+    registry.intern("Cabbage")
+    assert registry.canonical("Tomatos") is None
+    assert registry.canonical("Tomatos", fuzzy=True) == "Tomatoes"
+    assert registry.canonical("Cabage", fuzzy=True) == "Cabbage"
+
+
+def test_alias_interned_first_shares_the_crop_id():
+    registry = CropRegistry()
+    maize = registry.intern("Maize")
+    assert registry.intern("Corn") == maize
+    assert registry.name(maize) == "Corn"
+
+
+def test_stored_prices_match_service_crop_names(tmp_path):
+    store = PriceStore(str(tmp_path / "prices"))
+    end = date.today() - timedelta(days=1)
+    days = pd.date_range(end=end, periods=10).strftime("%Y-%m-%d")
+    frames = [pd.DataFrame({"commodity": name, "market": "Azadpur", "arrival_date": days, "modal_price": price})
+              for name, price in (("Onion", 2500.0), ("Maize", 1800.0), ("Tomato", 1200.0))]
+    store.ingest_frames(pd.concat(frames), unit="INR/quintal", date_format="%Y-%m-%d")
+
+    service = PriceService(cache=MemoryCache(), store=store)
+    for crop, price in (("Onions", 25.0), ("Corn", 18.0), ("Tomatoes", 12.0)):
+        current = service.get_current_price(crop)
+        assert current["source"] == "store"
+        assert current["current"] == price
+
+
+def test_fuzzy_stays_within_candidates_and_threshold():
+    registry = CropRegistry()
+    tomatoes, potatoes = registry.intern("Tomatoes"), registry.intern("Potatoes")
+
+    assert registry.resolve("Tomatos", candidates={tomatoes}, fuzzy=True) == tomatoes
+    assert registry.resolve("Tomatos", candidates={potatoes}, fuzzy=True) is None
+    # A crop that exists but isn't a candidate doesn't fuzzy-match another one
+    assert registry.resolve("Tomatoes", candidates={potatoes}, fuzzy=True) is None
+    assert registry.resolve("Xylophone", fuzzy=True) is None
+    assert registry.resolve("", fuzzy=True) is None
+    assert registry.resolve("tomatoes") == tomatoes
+
+
+def test_registry_survives_pickling():
+    registry = CropRegistry()
+    wheat = registry.intern("Wheat")
+
+    copy = pickle.loads(pickle.dumps(registry))
+
+    assert copy.resolve("wheat") == wheat
+    assert copy.intern("Barley") == len(registry)
+
+
+def test_index_lookups_and_memo_bound(monkeypatch):
+    monkeypatch.setattr(crop_registry, "RESOLVED_MEMO_SIZE", 2)
+    index = CropIndex({"Wheat": 1, "Rice": 2}, CropRegistry())
+
+    assert index["WHEAT"] == 1 and "rice" in index and "Barley" not in index
+    assert index.get("Barley", 0) == 0 and index.name("wheat") == "Wheat"
+    with pytest.raises(KeyError):
+        index["Barley"]
+    assert len(index._resolved) <= 2
@@ -0,0 +1,52 @@
+import pytest
+
+from crop_rotation import CropRotationPlanner
+
+
+@pytest.fixture(scope="module")
+def planner():
+    return CropRotationPlanner()
+
+
+def test_indexes_match_a_scan_of_the_tables(planner):
+    for crop in {crop for members in planner.crop_families.values() for crop in members}:
+        families = tuple(family for family, members in planner.crop_families.items() if crop in members)
+        assert planner.crop_families_of(crop) == families
+    for crop in {crop for members in planner.nitrogen_needs.values() for crop in members}:
+        category = next(category for category, members in planner.nitrogen_needs.items() if crop in members)
+        assert planner._find_nitrogen_category(crop) == category
+
+
+def test_crops_in_several_families(planner):
+    assert planner.crop_families_of("Cabbage") == ("brassicas", "leafy_greens")
+    assert planner._same_family("Cabbage", "Kale")
+    assert planner._same_family("Cabbage", "Broccoli")
+    assert not planner._same_family("Kale", "Broccoli")
+
+
+def test_lookups_accept_case_plurals_and_aliases(planner):
+    assert planner.crop_families_of("tomato") == ("solanaceae",)
+    assert planner._find_nitrogen_category("MAIZE") == "high"
+    assert planner.crop_families_of("Dragon Fruit") == ("other",)
+    assert planner._find_nitrogen_category("Dragon Fruit") == "medium"
+    # Radish has no nitrogen entry of its own; its plural does
+    assert planner._find_nitrogen_category("Radish") == "low"
+
+
+def test_suggested_rotation_changes_family_each_year(planner):
+    plan = planner.suggest_rotation("Corn", years=3)
+
+    sequence = plan["rotation_sequence"]
+    assert sequence[0] == "Corn" and len(sequence) == 3
+    assert planner._find_nitrogen_category(sequence[1]) in ("fixing", "low")
+    for previous, crop in zip(sequence, sequence[1:]):
+        assert not planner._same_family(previous, crop)
+
+
+def test_compatibility_rewards_legume_then_heavy_feeder(planner):
+    good = planner.check_compatibility("Soybeans", "Corn")
+    poor = planner.check_compatibility("Corn", "Rice")
+
+    assert good["recommendation"] == "Highly Recommended"
+    assert poor["recommendation"] == "Not Recommended"
+    assert 0 <= poor["compatibility_score"] < good["compatibility_score"] <= 100
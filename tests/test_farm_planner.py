@@ -0,0 +1,38 @@
+from crop_rotation import CropRotationPlanner
+from farm_planner import FarmRotationPlanner, Field, MaxFamilyShare, RequireFamily
+from financial_calculator import FinancialCalculator
+
+PRICES = {"Wheat": 20.84, "Corn": 15.0, "Rice": 35.0, "Soybeans": 43.3, "Cotton": 60.0}
+
+
+def farm():
+    crops = ["Wheat", "Rice", "Corn", "Soybeans", "Cotton", "Potatoes"]
+    return [Field(f"field-{i}", crops[i % len(crops)], 5.0 + i, f"block-{i % 3}") for i in range(24)]
+
+
+def custom_planner():
+    financial = FinancialCalculator()
+    financial.base_yields["Cotton"] = 40
+    planner = CropRotationPlanner(financial)
+    planner.optimizer.weights.update(new_family=5.0, profit=200.0)
+    return FarmRotationPlanner(planner, penalty=50.0, max_sweeps=5)
+
+
+def test_pooled_plan_matches_serial():
+    planner = custom_planner()
+    constraints = [MaxFamilyShare("cereals", 0.3), RequireFamily("legumes", 4)]
+    serial = planner.plan(farm(), 4, constraints, prices=PRICES, processes=1)
+    pooled = planner.plan(farm(), 4, constraints, prices=PRICES, processes=2)
+    assert pooled["plans"] == serial["plans"]
+    assert pooled["score"] == serial["score"]
+    assert pooled["violations"] == serial["violations"]
+
+
+def test_share_and_legume_constraints_hold():
+    result = FarmRotationPlanner().plan(farm(), 4, [MaxFamilyShare("cereals", 0.3), RequireFamily("legumes", 4)],
+                                        processes=1)
+    assert result["status"] == "success"
+    assert result["violations"] == []
+    total = sum(field.acres for field in farm())
+    for families in result["family_acreage"].values():
+        assert families.get("cereals", 0) <= 0.3 * total + 1e-9
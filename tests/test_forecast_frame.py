@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from forecast_frame import ForecastFrame
+from weather_service import DAILY_COLUMNS
+
+BLOCK = {
+    "time": ["2025-01-01", "2025-01-02", "2025-01-03"],
+    "temperature_2m_max": [30.0, None, 28.5],
+    "temperature_2m_min": [15.0, 16.0, 14.0],
+    "precipitation_sum": [0.0, 12.5, 3.0],
+    "wind_speed_10m_max": [10.0, 22.0, 8.0],
+    "relative_humidity_2m_mean": [40.0, 85.0, 60.0]
+}
+
+
+@pytest.fixture
+def frame():
+    return ForecastFrame.from_open_meteo(BLOCK, DAILY_COLUMNS, "date")
+
+
+def test_rows_match_the_legacy_list_of_dicts(frame):
+    assert len(frame) == 3
+    assert frame[0] == {"date": "2025-01-01", "temp_max": 30.0, "temp_min": 15.0, "precipitation": 0.0,
+                        "wind_speed": 10.0, "humidity": 40.0}
+    assert frame[-1]["date"] == "2025-01-03"
+    assert [row["precipitation"] for row in frame] == [0.0, 12.5, 3.0]
+    assert frame.to_records() == list(frame)
+
+
+def test_missing_values_are_nan_in_columns_and_none_in_rows(frame):
+    assert np.isnan(frame.column("temp_max")[1])
+    assert frame[1]["temp_max"] is None
+
+
+def test_columns_are_read_only(frame):
+    with pytest.raises(ValueError):
+        frame.column("precipitation")[0] = 99.0
+
+
+def test_slices_share_memory_and_keep_meta(frame):
+    frame.meta["grid_cell"] = {"key": "cell"}
+
+    tail = frame[1:]
+
+    assert len(tail) == 2 and tail[0]["date"] == "2025-01-02"
+    assert np.shares_memory(tail.column("humidity"), frame.column("humidity"))
+    assert tail.grid_cell == {"key": "cell"}
+
+
+def test_with_meta_shares_columns_and_leaves_original_alone(frame):
+    served = frame.with_meta(age_seconds=12.0)
+
+    assert served.age_seconds == 12.0 and frame.age_seconds is None
+    assert np.shares_memory(served.column("temp_min"), frame.column("temp_min"))
+
+
+def test_out_of_range_index_raises(frame):
+    with pytest.raises(IndexError):
+        frame[3]
+    with pytest.raises(IndexError):
+        frame[-4]
+
+
+def test_ragged_columns_are_rejected():
+    with pytest.raises(ValueError):
+        ForecastFrame({"date": np.array(["2025-01-01", "2025-01-02"]), "temp_max": np.array([1.0])}, "date")
+
+
+def test_dataframe_and_csv_export(frame):
+    data = frame.to_dataframe(parse_times=True)
+
+    assert list(data.columns) == ["date", *DAILY_COLUMNS]
+    assert str(data["date"].dtype).startswith("datetime64")
+    assert frame.to_csv().splitlines()[0] == "date," + ",".join(DAILY_COLUMNS)
+    assert frame.times()[0] == np.datetime64("2025-01-01T00:00")
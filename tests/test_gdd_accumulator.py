@@ -0,0 +1,93 @@
+import threading
+from datetime import date
+
+import numpy as np
+
+from forecast_frame import ForecastFrame
+from gdd_accumulator import GDDAccumulator
+
+LAT, LON = 28.6, 77.2
+
+
+def history(temperatures, start="2025-01-01"):
+    days = np.datetime64(start) + np.arange(len(temperatures))
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    return ForecastFrame({"date": days.astype(str), "temp_max": temperatures, "temp_min": temperatures}, "date")
+
+
+def tracker():
+    accumulator = GDDAccumulator()
+    accumulator.register_plot("plot", LAT, LON, date(2025, 1, 1), base_temp=5)
+    return accumulator
+
+
+def test_reload_fills_days_that_were_missing():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20, 20, 20, np.nan, np.nan]))
+    assert accumulator.gdd_since_planting("plot") == 45
+    assert accumulator.coverage("plot")["missing_days"] == 2
+
+    accumulator.load_history(LAT, LON, history([20, 20, 20, 20, 20]))
+    assert accumulator.gdd_since_planting("plot") == 75
+    assert accumulator.coverage("plot")["missing_days"] == 0
+
+
+def test_reload_does_not_change_known_days():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20, 20, 20]))
+    accumulator.load_history(LAT, LON, history([30, 30, 30, 30]))
+    assert accumulator.gdd_since_planting("plot") == 70
+
+
+def test_add_day_fills_missing_day():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20, np.nan, 20]))
+    accumulator.add_day(LAT, LON, "2025-01-02", 25, 25)
+    assert accumulator.gdd_since_planting("plot") == 50
+    assert accumulator.gdd_since_planting("plot", as_of="2025-01-02") == 35
+
+
+
+def test_earlier_history_keeps_later_days():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20, 20, 20], start="2025-01-03"))
+    accumulator.add_day(LAT, LON, "2025-01-07", 30, 30)
+
+    # Reaches back to planting but stops before the days already held
+    accumulator.load_history(LAT, LON, history([10, 10, 10]))
+
+    assert accumulator.coverage("plot") == {"start": "2025-01-01", "end": "2025-01-07", "missing_days": 1,
+                                            "complete_since_planting": True}
+    # 5 + 5 from the new history, then 15 + 15 + 15 kept over its day-3 value, a gap, and 25 from add_day
+    assert accumulator.gdd_since_planting("plot") == 80
+    assert accumulator.gdd_since_planting("plot", as_of="2025-01-03") == 25
+
+
+def test_earlier_history_fills_gaps_in_the_days_held():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20, np.nan, 20], start="2025-01-02"))
+
+    accumulator.load_history(LAT, LON, history([10, 10, 10, 10, 10]))
+
+    assert accumulator.gdd_since_planting("plot") == 5 + 15 + 5 + 15 + 5
+    assert accumulator.coverage("plot")["missing_days"] == 0
+
+
+def test_concurrent_updates_from_many_threads():
+    accumulator = tracker()
+    accumulator.load_history(LAT, LON, history([20]))
+    days = np.datetime64("2025-01-02") + np.arange(200)
+
+    def add(chunk):
+        for day in chunk:
+            accumulator.add_day(LAT, LON, str(day), 20, 20)
+            accumulator.gdd_for_plots()
+
+    threads = [threading.Thread(target=add, args=(days[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert accumulator.gdd_since_planting("plot") == 15 * 201
+    assert accumulator.coverage("plot")["missing_days"] == 0
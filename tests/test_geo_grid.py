@@ -0,0 +1,53 @@
+import pytest
+
+from geo_grid import CoordinateQuantizer, geohash_decode, geohash_encode, snap_to_grid
+
+
+def test_grid_snaps_to_the_cell_centre():
+    assert snap_to_grid(28.6139, 77.2090, 0.02) == (28.61, 77.21)
+    assert snap_to_grid(-0.001, -0.001, 0.02) == (-0.01, -0.01)
+
+
+def test_grid_stays_on_the_globe():
+    assert snap_to_grid(89.999, 179.999, 0.02) == (89.99, 179.99)
+    assert snap_to_grid(90.0, 180.0, 0.02)[1] == -179.99
+
+
+def test_nearby_farms_share_a_cell_and_distant_ones_do_not():
+    quantizer = CoordinateQuantizer()
+
+    first = quantizer.snap(28.6139, 77.2090)
+    near = quantizer.snap(28.6150, 77.2080)
+    far = quantizer.snap(28.6400, 77.2090)
+
+    assert first["key"] == near["key"]
+    assert first["key"] != far["key"]
+    assert abs(first["latitude"] - 28.6139) <= 0.01 and abs(first["longitude"] - 77.2090) <= 0.01
+
+
+def test_geohash_round_trip():
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    lat, lon, lat_err, lon_err = geohash_decode("u4pruydqqvj")
+
+    assert abs(lat - 57.64911) <= lat_err and abs(lon - 10.40744) <= lon_err
+
+
+def test_geohash_mode_keys_on_the_prefix():
+    cell = CoordinateQuantizer("geohash", precision=5).snap(57.64911, 10.40744)
+
+    assert cell["key"] == "geohash:u4pru"
+    assert cell["mode"] == "geohash"
+
+
+def test_none_mode_only_rounds():
+    cell = CoordinateQuantizer("none").snap(28.613912, 77.209021)
+
+    assert (cell["latitude"], cell["longitude"]) == (28.6139, 77.209)
+    assert cell["key"] == "point:28.6139,77.2090"
+
+
+@pytest.mark.parametrize("options", [{"mode": "hex"}, {"mode": "grid", "resolution": 0}])
+def test_invalid_settings_are_rejected(options):
+    with pytest.raises(ValueError):
+        CoordinateQuantizer(**options)
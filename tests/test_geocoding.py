@@ -0,0 +1,147 @@
+import asyncio
+import time
+
+import pytest
+
+from cache_backend import MemoryCache
+from geocoding import Gazetteer, LocationSearch, TokenBucket, parse_nominatim
+
+
+def place(city, state, lat, lon):
+    return {"display_name": f"{city}, {state}, United States", "lat": str(lat), "lon": str(lon),
+            "address": {"city": city, "state": state, "country": "United States"}}
+
+
+SPRINGFIELDS = [place("Springfield", "Illinois", 39.8, -89.6), place("Springfield", "Missouri", 37.2, -93.3),
+                place("Springfield", "Massachusetts", 42.1, -72.6)]
+
+
+class FakeNominatim:
+    def __init__(self, places=SPRINGFIELDS):
+        self.places = places
+        self.queries = []
+        self.offline = False
+
+    async def __call__(self, url, params):
+        if self.offline:
+            raise ConnectionError("network down")
+        self.queries.append(params["q"])
+        tokens = params["q"].replace(",", " ").split()
+        matches = [item for item in self.places if all(token in item["display_name"].lower() for token in tokens)]
+        return matches[:params["limit"]]
+
+
+def searcher(nominatim, gazetteer, limit=8):
+    return LocationSearch(nominatim, MemoryCache(), gazetteer, rate=1000, burst=1000, limit=limit)
+
+
+def test_shorter_query_still_asks_upstream():
+    nominatim, gazetteer = FakeNominatim(), Gazetteer(":memory:")
+    search = searcher(nominatim, gazetteer)
+    assert len(asyncio.run(search.search("Springfield, Illinois"))) == 1
+    results = asyncio.run(search.search("Springfield"))
+    assert nominatim.queries == ["springfield, illinois", "springfield"]
+    assert {location["name"] for location in results} == {
+        "Springfield, Illinois", "Springfield, Missouri", "Springfield, Massachusetts"}
+
+
+def test_repeat_query_answered_by_gazetteer_until_it_expires():
+    nominatim, gazetteer = FakeNominatim(), Gazetteer(":memory:")
+    first = asyncio.run(searcher(nominatim, gazetteer).search("Springfield"))
+    # A new process: empty cache, same gazetteer
+    again = asyncio.run(searcher(nominatim, gazetteer).search("springfield"))
+    assert again == first
+    assert nominatim.queries == ["springfield"]
+
+    gazetteer._conn.execute("UPDATE queries SET resolved_at = ?", (time.time() - 31 * 86400,))
+    asyncio.run(searcher(nominatim, gazetteer).search("Springfield"))
+    assert nominatim.queries == ["springfield", "springfield"]
+
+
+def test_offline_falls_back_to_known_places():
+    nominatim, gazetteer = FakeNominatim(), Gazetteer(":memory:")
+    asyncio.run(searcher(nominatim, gazetteer).search("Springfield"))
+    nominatim.offline = True
+    search = searcher(nominatim, gazetteer)
+    results = asyncio.run(search.search("Springfield, Miss"))
+    assert [location["name"] for location in results] == ["Springfield, Missouri"]
+    assert search.counts["offline"] == 1
+
+
+def test_complete_prefix_results_are_reused():
+    nominatim = FakeNominatim()
+    search = searcher(nominatim, Gazetteer(":memory:"))
+    asyncio.run(search.search("Springfield"))
+
+    results = asyncio.run(search.search("Springfield, Miss"))
+
+    assert [location["name"] for location in results] == ["Springfield, Missouri"]
+    assert nominatim.queries == ["springfield"]
+    assert search.counts["prefix"] == 1
+
+
+def test_prefix_cut_off_at_the_limit_is_not_reused():
+    nominatim = FakeNominatim([place("Springdale", "Arkansas", 36.2, -94.1)] + SPRINGFIELDS)
+    search = searcher(nominatim, Gazetteer(":memory:"), limit=2)
+    # Springdale and Springfield, Illinois fill the page; the other Springfields were cut off
+    assert len(asyncio.run(search.search("Spring"))) == 2
+
+    results = asyncio.run(search.search("Springfield"))
+
+    assert [location["name"] for location in results] == ["Springfield, Illinois", "Springfield, Missouri"]
+    assert nominatim.queries == ["spring", "springfield"]
+    assert search.counts["prefix"] == 0
+
+
+def test_offline_without_known_places_raises():
+    nominatim = FakeNominatim()
+    nominatim.offline = True
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(searcher(nominatim, Gazetteer(":memory:")).search("Springfield"))
+
+
+def test_token_bucket_allows_a_burst_then_paces_requests():
+    async def acquire(bucket, times):
+        start = time.monotonic()
+        for _ in range(times):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(acquire(TokenBucket(rate=10, capacity=3), 3)) < 0.05
+    # One token up front, then one every 100 ms
+    assert asyncio.run(acquire(TokenBucket(rate=10, capacity=1), 3)) >= 0.19
+
+
+def springfields():
+    return [parse_nominatim(item) for item in SPRINGFIELDS]
+
+
+def test_gazetteer_search_matches_word_prefixes_and_ranks_by_use():
+    gazetteer = Gazetteer(":memory:")
+    gazetteer.add(springfields())
+
+    assert len(gazetteer.search("spring")) == 3
+    assert [location["display_name"] for location in gazetteer.search("spring miss")] == [
+        "Springfield, Missouri, United States"]
+    # Word prefixes only: "field" is inside "Springfield" but starts no word
+    assert gazetteer.search("field") == []
+
+    gazetteer.record_use(springfields()[2])
+    assert gazetteer.search("springfield")[0]["address"]["state"] == "Massachusetts"
+
+
+def test_gazetteer_persists_and_keeps_upstream_order(tmp_path):
+    path = str(tmp_path / "places" / "gazetteer.sqlite")
+    gazetteer = Gazetteer(path)
+    gazetteer.add(list(reversed(springfields())), query="Springfield")
+    gazetteer.add(springfields()[:1])
+    gazetteer.close()
+
+    reopened = Gazetteer(path)
+
+    assert len(reopened) == 3
+    assert [location["address"]["state"] for location in reopened.lookup("  SPRINGFIELD ")] == [
+        "Massachusetts", "Missouri", "Illinois"]
+    assert reopened.lookup("Springfield", max_age=-1) is None
+    assert reopened.lookup("Springfield, Illinois") is None
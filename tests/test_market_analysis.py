@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache_backend import MemoryCache
+from price_service import PriceService
+from price_store import PriceStore
+
+
+def test_history_with_gaps_keeps_calendar_days(tmp_path):
+    end = date.today() - timedelta(days=1)
+    calendar = pd.date_range(end=end, periods=30)
+    # 10 INR/quintal more every calendar day, with some days missing from the record
+    prices = 2000.0 + 10 * np.arange(30)
+    keep = np.ones(30, dtype=bool)
+    keep[[2, 9, 24, 26, 27]] = False
+    store = PriceStore(str(tmp_path / "prices"))
+    store.ingest_frames(pd.DataFrame({"commodity": "Onion", "market": "Azadpur",
+                                      "arrival_date": calendar[keep].strftime("%Y-%m-%d"),
+                                      "modal_price": prices[keep]}),
+                        unit="INR/quintal", date_format="%Y-%m-%d")
+    service = PriceService(cache=MemoryCache(), store=store)
+
+    crops, matrix = service._history_matrix(["Onions"], 30)
+    analysis = service.get_market_analysis_many(["Onions"]).loc["Onions"]
+
+    assert crops == ["Onions"]
+    np.testing.assert_array_equal(np.isnan(matrix[0]), ~keep)
+    np.testing.assert_allclose(matrix[0][keep], prices[keep] / 100)
+    assert analysis["trend_slope"] == pytest.approx(0.1)
+    average = prices[keep].mean() / 100
+    assert analysis["vs_30day_avg"] == pytest.approx((analysis["current_price"] - average) / average * 100)
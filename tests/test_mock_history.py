@@ -0,0 +1,68 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import price_service
+from cache_backend import MemoryCache
+from price_service import PriceService, synthetic_price_paths
+
+
+@pytest.fixture
+def service():
+    return PriceService(cache=MemoryCache())
+
+
+def test_history_is_stable_across_services(service):
+    first = service.generate_historical_data("Wheat", 30)
+    second = PriceService(cache=MemoryCache()).generate_historical_data("Wheat", 30)
+
+    pd.testing.assert_frame_equal(first, second)
+    assert len(first) == 30
+    assert first["Date"].iloc[-1] == pd.Timestamp(date.today()) - pd.Timedelta(days=1)
+
+
+def test_matrix_columns_match_single_crop_histories(service):
+    matrix = service.generate_historical_matrix(["Wheat", "Rice", "Onions", "Unknown"], 30)
+
+    assert list(matrix.columns) == ["Wheat", "Rice", "Onions"]
+    for crop in matrix.columns:
+        np.testing.assert_allclose(matrix[crop].to_numpy(), service.generate_historical_data(crop, 30)["Price"])
+
+
+def test_history_is_built_once_per_day(service, monkeypatch):
+    draws = []
+    noise = service._history_noise
+    monkeypatch.setattr(service, "_history_noise", lambda *args: draws.append(args) or noise(*args))
+
+    service.generate_historical_data("Wheat", 30)
+    served = service.generate_historical_data("Wheat", 30)
+    served["Extra"] = 1.0
+
+    assert len(draws) == 1
+    assert "Extra" not in service.generate_historical_data("Wheat", 30)
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=1)
+
+    monkeypatch.setattr(price_service, "date", Tomorrow)
+    rolled = service.generate_historical_data("Wheat", 30)
+
+    assert len(draws) == 2
+    assert rolled["Date"].iloc[-1] == pd.Timestamp(date.today())
+
+
+def test_unknown_crop_has_no_history(service):
+    assert service.generate_historical_data("Unobtainium") is None
+
+
+def test_paths_stay_above_the_floor():
+    noise = np.full((2, 50), -5.0)
+
+    paths = synthetic_price_paths([100.0, 2000.0], noise)
+
+    assert paths.shape == (2, 50)
+    assert np.allclose(paths[:, -1], [70.0, 1400.0])
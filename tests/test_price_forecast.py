@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from cache_backend import MemoryCache
+from price_forecast import ForecastEngine
+from price_service import FORECAST_HORIZON, PriceService
+from price_store import PriceStore
+
+
+def stored_service(tmp_path, end):
+    store = PriceStore(str(tmp_path / "prices"))
+    days = pd.date_range(end=end, periods=20)
+    prices = 2000.0 + 10 * pd.RangeIndex(20).to_numpy()
+    store.ingest_frames(pd.DataFrame({"commodity": "Onion", "market": "Azadpur",
+                                      "arrival_date": days.strftime("%Y-%m-%d"), "modal_price": prices}),
+                        unit="INR/quintal", date_format="%Y-%m-%d")
+    return PriceService(cache=MemoryCache(), store=store)
+
+
+def test_forecast_starts_the_day_after_stored_history(tmp_path):
+    end = date.today() - timedelta(days=5)
+    service = stored_service(tmp_path, end)
+
+    forecast = service.predict_future_prices("Onions", 7)
+
+    expected = pd.date_range(pd.Timestamp(end) + pd.Timedelta(days=1), periods=7)
+    assert list(forecast["Date"]) == list(expected)
+
+
+def test_mock_forecast_follows_mock_history(tmp_path):
+    service = PriceService(cache=MemoryCache(), store=PriceStore(str(tmp_path / "prices")))
+    history = service.historical_prices("Wheat", 30)
+
+    forecast = service.predict_future_prices("Wheat", 7)
+
+    assert forecast["Date"].iloc[0] == history["Date"].iloc[-1] + pd.Timedelta(days=1)
+
+
+def test_optimal_date_is_the_forecast_date_of_the_best_price(tmp_path):
+    service = stored_service(tmp_path, date.today() - timedelta(days=5))
+    forecast = service.predict_future_prices("Onions", 30)
+    upcoming = forecast[forecast["Date"] >= pd.Timestamp(date.today())]
+    best = upcoming.loc[upcoming["Predicted_Price"].idxmax()]
+
+    advice = service.get_best_selling_time("Onions")
+
+    assert advice["optimal_date"] == best["Date"].strftime("%Y-%m-%d")
+    assert advice["days_to_wait"] == (best["Date"].date() - date.today()).days
+
+
+def test_confidence_falls_as_the_interval_widens():
+    engine = ForecastEngine()
+    noisy = 100 + np.random.default_rng(0).normal(0, 5, 60)
+
+    forecast = engine.forecast(noisy, 10, "drift")
+
+    assert ((forecast.confidence >= 0) & (forecast.confidence <= 1)).all()
+    assert (np.diff(forecast.confidence) < 0).all()
+    assert engine.forecast(np.full(30, 50.0), 5, "drift").confidence.tolist() == [1.0] * 5
+
+
+def test_precompute_fills_the_forecast_cache(tmp_path):
+    cache = MemoryCache()
+    service = PriceService(cache=cache, store=PriceStore(str(tmp_path / "prices")))
+
+    service.start_precompute(["Wheat", "Rice"]).join()
+
+    for crop in ("Wheat", "Rice"):
+        assert cache.get(service._forecast_key(crop, FORECAST_HORIZON, "auto")) is not None
+    forecast = service.predict_future_prices("Wheat", 7)
+    assert forecast["Confidence"].nunique() > 1
@@ -0,0 +1,85 @@
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from cache_backend import MemoryCache
+from price_service import PriceService
+from price_store import PriceStore, current_version
+
+
+def prices(price, end=None, periods=10):
+    end = end or date.today() - timedelta(days=1)
+    days = pd.date_range(end=end, periods=periods).strftime("%Y-%m-%d")
+    return pd.DataFrame({"commodity": "Onion", "market": "Azadpur", "arrival_date": days, "modal_price": price})
+
+
+def ingest(store, frame):
+    return store.ingest_frames(frame, unit="INR/quintal", date_format="%Y-%m-%d")
+
+
+def test_reads_do_not_create_the_store(tmp_path):
+    root = tmp_path / "prices"
+    service = PriceService(cache=MemoryCache(), store=PriceStore(str(root)))
+
+    current = service.get_current_price("Onions")
+
+    assert current is not None and current.get("source") != "store"
+    assert service.stored_history("Onions") is None
+    assert service.store.version is None and service.store.snapshot() is None
+    assert not root.exists()
+
+
+def test_empty_or_broken_store_falls_back_to_mock(tmp_path):
+    root = tmp_path / "prices"
+    root.mkdir()
+    service = PriceService(cache=MemoryCache(), store=PriceStore(str(root)))
+    assert service.stored_history("Onions") is None
+
+    # CURRENT pointing at a version that is gone
+    (root / "CURRENT").write_text("v0-missing")
+    assert service.stored_history("Onions") is None
+    assert service.historical_prices("Onions", 30) is not None
+
+
+def test_ingest_publishes_a_new_version(tmp_path):
+    store = PriceStore(str(tmp_path / "prices"))
+
+    assert ingest(store, prices(2000.0)) == 10
+    first = store.version
+    before = store.snapshot()
+    ingest(store, prices(2500.0, periods=3))
+    second = store.version
+
+    assert first != second
+    assert current_version(store.root) == second
+    assert (tmp_path / "prices" / "CURRENT").read_text() == second
+    # The previous version stays for readers that still map it
+    assert before.version == first and os.path.isdir(os.path.join(store.root, first))
+    assert store.snapshot().version == second
+    latest = store.daily_prices("Onion")
+    assert list(latest["Price"].iloc[-3:]) == [25.0] * 3
+    assert list(latest["Price"].iloc[:-3]) == [20.0] * 7
+
+
+def test_only_current_and_previous_versions_are_kept(tmp_path):
+    store = PriceStore(str(tmp_path / "prices"))
+    versions = []
+    for price in (1000.0, 1500.0, 2000.0):
+        ingest(store, prices(price))
+        versions.append(store.version)
+
+    kept = sorted(entry for entry in os.listdir(store.root) if entry.startswith("v"))
+
+    assert kept == sorted(versions[1:])
+
+
+def test_service_follows_the_current_pointer(tmp_path):
+    store = PriceStore(str(tmp_path / "prices"))
+    service = PriceService(cache=MemoryCache(), store=store)
+    ingest(store, prices(2000.0))
+    assert service.stored_history("Onions")["Price"].iloc[-1] == 20.0
+
+    ingest(store, prices(3000.0, periods=1))
+
+    assert service.stored_history("Onions")["Price"].iloc[-1] == 30.0
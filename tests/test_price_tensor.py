@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_store import PriceStore
+from price_tensor import PriceTensor
+
+ARRIVALS = pd.DataFrame({
+    "commodity": "Onion",
+    "market": ["Azadpur", "Azadpur", "Azadpur", "Lasalgaon", "Lasalgaon"],
+    "arrival_date": ["2025-01-01", "2025-01-02", "2025-01-04", "2025-01-02", "2025-01-03"],
+    "modal_price": [2000.0, 2200.0, 2400.0, 1800.0, 1900.0]
+})
+
+
+def ingest(store, frame):
+    return store.ingest_frames(frame, unit="INR/quintal", date_format="%Y-%m-%d")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PriceStore(str(tmp_path / "prices"))
+    ingest(store, ARRIVALS)
+    return store
+
+
+@pytest.fixture
+def tensor(store, tmp_path):
+    return PriceTensor.build(store, str(tmp_path / "tensor"))
+
+
+def test_layout_and_index(tensor, store):
+    assert tensor.values.shape == (1, 2, 4)
+    assert tensor.crops() == ["Onion"] and tensor.markets() == ["Azadpur", "Lasalgaon"]
+    assert str(tensor.start) == "2025-01-01"
+    assert tensor.source_version == store.version
+
+
+def test_windows_are_views_onto_the_mapped_file(tensor):
+    window = tensor.window("Onion")
+
+    assert isinstance(tensor.values, np.memmap)
+    assert np.shares_memory(window, tensor.values)
+    assert not window.flags.writeable
+
+
+def test_names_resolve_like_the_store(tensor):
+    np.testing.assert_array_equal(tensor.window("onions", market=" azadpur "), [20.0, 22.0, np.nan, 24.0])
+    assert tensor.window("Garlic") is None
+    assert tensor.window("Onion", market="Nowhere") is None
+
+
+def test_daily_prices_match_the_store(tensor, store):
+    pd.testing.assert_frame_equal(tensor.daily_prices("Onion"), store.daily_prices("Onion"))
+    pd.testing.assert_frame_equal(tensor.daily_prices("Onion", market="Lasalgaon"),
+                                  store.daily_prices("Onion", market="Lasalgaon"))
+
+
+def test_date_range_selects_days(tensor):
+    prices = tensor.daily_prices("Onion", start="2025-01-02", end="2025-01-03")
+
+    assert list(prices["Date"].dt.strftime("%Y-%m-%d")) == ["2025-01-02", "2025-01-03"]
+    assert list(prices["Price"]) == [20.0, 19.0]
+    assert tensor.daily_prices("Onion", start="2026-01-01").empty
+
+
+def test_rebuild_is_picked_up_by_open_readers(tensor, store, tmp_path):
+    before = tensor.values
+
+    ingest(store, ARRIVALS.assign(modal_price=3000.0))
+    PriceTensor.build(store, str(tmp_path / "tensor"))
+
+    assert np.nanmax(tensor.values) == 30.0 and np.nanmax(before) == 24.0
+    assert tensor.source_version == store.version
+
+
+def test_missing_or_empty_sources(tmp_path):
+    assert PriceTensor(str(tmp_path / "none")).values is None
+    assert PriceTensor(str(tmp_path / "none")).daily_prices("Onion").empty
+
+    with pytest.raises(ValueError):
+        PriceTensor.build(PriceStore(str(tmp_path / "empty")), str(tmp_path / "tensor"))
@@ -0,0 +1,74 @@
+import asyncio
+import math
+import random
+
+import pytest
+
+from cache_backend import MemoryCache
+from reverse_geocoder import KDTree, ReverseGeocoder, to_unit_vector
+from weather_service import AsyncWeatherService
+
+
+@pytest.fixture(scope="module")
+def geocoder():
+    return ReverseGeocoder()
+
+
+def test_tree_agrees_with_brute_force():
+    rng = random.Random(7)
+    points = [to_unit_vector(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(300)]
+    tree = KDTree(points)
+
+    for _ in range(100):
+        query = to_unit_vector(rng.uniform(-90, 90), rng.uniform(-180, 180))
+        expected = min(range(len(points)), key=lambda i: math.dist(query, points[i]))
+        index, distance = tree.nearest(query)
+        assert index == expected
+        assert distance == pytest.approx(math.dist(query, points[expected]))
+
+
+def test_nearest_bundled_place(geocoder):
+    place, distance = geocoder.nearest(18.53, 73.85)
+
+    assert place["name"] == "Pune"
+    assert distance == pytest.approx(1.1, abs=0.3)
+    assert geocoder.lookup(18.53, 73.85) == "Pune, Maharashtra"
+
+
+def test_places_beyond_the_radius_are_not_named(geocoder):
+    # Middle of the Indian Ocean
+    assert geocoder.lookup(-20.0, 75.0) is None
+
+
+def test_place_named_after_its_state_falls_back_to_country():
+    place = {"name": "Delhi", "admin1": "Delhi", "country": "India"}
+
+    assert ReverseGeocoder.format_place(place) == "Delhi, India"
+
+
+class Offline:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, url, params):
+        self.calls += 1
+        raise ConnectionError("offline")
+
+
+def test_service_names_nearby_coordinates_without_the_network(geocoder):
+    service = AsyncWeatherService(cache=MemoryCache(), reverse_geocoder=geocoder)
+    service._get_json = offline = Offline()
+
+    assert asyncio.run(service.get_location_name(18.53, 73.85)) == "Pune, Maharashtra"
+    assert offline.calls == 0
+
+
+def test_service_falls_back_to_the_nearest_place_when_offline(geocoder):
+    service = AsyncWeatherService(cache=MemoryCache(), reverse_geocoder=geocoder, offline_radius_km=10)
+    service._get_json = offline = Offline()
+    place, distance = geocoder.nearest(18.75, 73.85)
+    assert 10 < distance <= 40
+
+    assert asyncio.run(service.get_location_name(18.75, 73.85)) == f"Near {geocoder.format_place(place)}"
+    assert asyncio.run(service.get_location_name(-20.0, 75.0)) == "Farm Location (-20.00, 75.00)"
+    assert offline.calls == 2
@@ -0,0 +1,83 @@
+import itertools
+import pickle
+
+import pytest
+
+from crop_rotation import CropRotationPlanner
+
+CANDIDATES = ["Wheat", "Rice", "Corn", "Soybeans", "Peas", "Potatoes", "Onions", "Cotton"]
+PRICES = {"Wheat": 20.84, "Corn": 15.0, "Rice": 35.0, "Soybeans": 43.3, "Cotton": 60.0}
+
+
+@pytest.fixture
+def optimizer():
+    return CropRotationPlanner().optimizer
+
+
+def brute_force(optimizer, current, years, prices):
+    crops = (current,) + tuple(CANDIDATES)
+    next_year, two_years = optimizer.score_tables(crops)
+    _, unary = optimizer.profit_scores(CANDIDATES, prices)
+
+    def score(sequence):
+        total = 0.0
+        for t in range(1, len(sequence)):
+            total += next_year[sequence[t - 1], sequence[t]] + unary[sequence[t] - 1]
+            if t >= 2:
+                total += two_years[sequence[t - 2], sequence[t]]
+        return total
+
+    return max(score((0,) + rest) for rest in itertools.product(range(1, len(crops)), repeat=years - 1))
+
+
+@pytest.mark.parametrize("years", [2, 3, 4])
+@pytest.mark.parametrize("prices", [None, PRICES])
+def test_search_is_exact(optimizer, years, prices):
+    plan = optimizer.optimize("Corn", years, CANDIDATES, prices)
+
+    assert plan.sequence[0] == "Corn" and len(plan.sequence) == years
+    assert plan.score == pytest.approx(brute_force(optimizer, "Corn", years, prices))
+
+
+def test_reported_score_matches_the_sequence(optimizer):
+    plan = optimizer.optimize("Rice", 4, CANDIDATES, PRICES)
+    crops = ("Rice",) + tuple(CANDIDATES)
+    next_year, two_years = optimizer.score_tables(crops)
+    profits, unary = optimizer.profit_scores(CANDIDATES, PRICES)
+    index = [0] + [1 + CANDIDATES.index(crop) for crop in plan.sequence[1:]]
+
+    score = sum(next_year[a, b] + unary[b - 1] for a, b in zip(index, index[1:]))
+    score += sum(two_years[a, c] for a, c in zip(index, index[2:]))
+
+    assert plan.score == pytest.approx(score)
+    assert plan.profit_per_acre[0] is None
+    assert plan.profit_per_acre[1:] == [profits[i - 1] for i in index[1:]]
+
+
+def test_one_year_plan_is_the_current_crop(optimizer):
+    plan = optimizer.optimize("Wheat", 1, CANDIDATES)
+
+    assert plan.sequence == ["Wheat"] and plan.score == 0.0
+
+
+def test_plans_are_memoized_per_prices(optimizer):
+    first = optimizer.optimize("Corn", 3, CANDIDATES, PRICES)
+
+    assert optimizer.optimize("Corn", 3, CANDIDATES, PRICES) is first
+    assert optimizer.optimize("Corn", 3, CANDIDATES, dict(PRICES, Cotton=1.0)) is not first
+
+
+def test_profit_needs_a_price(optimizer):
+    assert optimizer.profit_per_acre("Wheat", None) is None
+    assert optimizer.profit_per_acre("Wheat", 100.0) > optimizer.profit_per_acre("Wheat", 10.0)
+
+
+def test_pickled_optimizer_keeps_weights_but_not_memos(optimizer):
+    optimizer.weights["profit"] = 99.0
+    optimizer.optimize("Corn", 3, CANDIDATES)
+
+    copy = pickle.loads(pickle.dumps(optimizer))
+
+    assert copy.weights["profit"] == 99.0
+    assert copy._plans == {} and copy._tables == {}
+    assert copy.optimize("Corn", 3, CANDIDATES) == optimizer.optimize("Corn", 3, CANDIDATES)
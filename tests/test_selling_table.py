@@ -0,0 +1,99 @@
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from cache_backend import MemoryCache
+from price_service import PriceService
+from price_store import PriceStore
+from selling_table import ADVICE_DTYPE, SellingTable, SellingTableReader, selling_advice
+
+CROPS = ["Wheat", "Onions", "Tomatoes"]
+
+
+def table(day=None, source_version="v1"):
+    rows = np.array([(2, 110.0, 100.0), (10, 120.0, 100.0)], dtype=ADVICE_DTYPE)
+    return SellingTable(day or date.today(), ["Wheat", "Rice"], rows, source_version, wall_time=1.5)
+
+
+@pytest.mark.parametrize("days, best, action", [(2, 105.0, "wait"), (10, 110.0, "hold"), (5, 100.5, "sell_now"),
+                                                (5, 103.0, "monitor")])
+def test_advice_actions(days, best, action):
+    advice = selling_advice(days, best, 100.0, date(2025, 1, 1) + timedelta(days=days))
+
+    assert advice["action"] == action
+    assert advice["potential_gain_percent"] == pytest.approx(best - 100.0)
+
+
+def test_lookup_counts_days_from_the_build_day():
+    built = table(day=date(2025, 1, 1))
+
+    advice = built.lookup("Rice")
+
+    assert advice["optimal_date"] == "2025-01-11" and advice["days_to_wait"] == 10
+    assert built.lookup("Barley") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "nested" / "table.npz")
+    table().save(path)
+
+    loaded = SellingTable.load(path)
+
+    assert loaded.crops == ["Wheat", "Rice"] and loaded.source_version == "v1" and loaded.wall_time == 1.5
+    np.testing.assert_array_equal(loaded.rows, table().rows)
+    assert SellingTable.load(str(tmp_path / "missing.npz")) is None
+
+
+def test_table_is_current_only_for_today_and_the_same_data():
+    assert table().is_current("v1")
+    assert not table().is_current("v2")
+    assert not table(day=date.today() - timedelta(days=1)).is_current("v1")
+
+
+def test_reader_reloads_only_when_the_file_changes(tmp_path):
+    path = str(tmp_path / "table.npz")
+    reader = SellingTableReader(path)
+    assert reader.get() is None
+
+    table().save(path)
+    first = reader.get()
+    assert reader.get() is first
+
+    table(source_version="v2").save(path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    assert reader.get().source_version == "v2"
+
+
+@pytest.fixture
+def service(tmp_path):
+    return PriceService(cache=MemoryCache(), store=PriceStore(str(tmp_path / "prices")))
+
+
+def test_service_serves_advice_from_todays_table(service, monkeypatch):
+    fresh = {crop: service.get_best_selling_time(crop) for crop in CROPS}
+    built = service.build_selling_table(CROPS, processes=1)
+
+    def no_forecast(crop_type):
+        raise AssertionError("advice should come from the table")
+
+    monkeypatch.setattr(service, "_selling_row", no_forecast)
+
+    assert built.crops == CROPS
+    assert {crop: service.get_best_selling_time(crop) for crop in CROPS} == fresh
+
+
+def test_process_pool_matches_serial_build(service):
+    serial = service.build_selling_table(CROPS, processes=1)
+    pooled = service.build_selling_table(CROPS, processes=2)
+
+    assert pooled.crops == serial.crops
+    np.testing.assert_array_equal(pooled.rows, serial.rows)
+
+
+def test_stale_table_is_ignored(service):
+    expected = service.get_best_selling_time("Wheat")
+    table(day=date.today() - timedelta(days=1), source_version=None).save(service.selling_table_path())
+
+    assert service.get_best_selling_time("Wheat") == expected
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from cache_backend import MemoryCache
+from forecast_frame import ForecastFrame
+from weather_alerts import DEFAULT_RULES, SPRAY_WINDOW, AlertEngine
+from weather_service import AsyncWeatherService
+
+CURRENT = {"temperature": 24.0, "humidity": 20, "precipitation": 0.0, "wind_speed": 8.0}
+
+
+def one_day(precipitation, humidity):
+    return ForecastFrame({
+        "date": np.array(["2025-01-01"]),
+        "temp_max": np.array([28.0]),
+        "temp_min": np.array([14.0]),
+        "precipitation": np.array([precipitation]),
+        "wind_speed": np.array([12.0]),
+        "humidity": np.array([humidity])
+    }, "date")
+
+
+@pytest.mark.parametrize("precipitation", [0.0, 10.0, 40.0])
+def test_frame_and_single_day_paths_raise_the_same_alerts(precipitation):
+    service = AsyncWeatherService(cache=MemoryCache())
+
+    single = service.check_weather_alerts(CURRENT, {"precipitation": precipitation})
+    framed = service.check_weather_alerts(CURRENT, one_day(precipitation, CURRENT["humidity"]))
+
+    assert {alert["type"] for alert in framed} == {alert["type"] for alert in single}
+
+
+def test_dry_conditions_from_frames():
+    service = AsyncWeatherService(cache=MemoryCache())
+
+    alerts = service.check_weather_alerts(CURRENT, one_day(0.0, 20))
+
+    assert [alert["type"] for alert in alerts] == ["Dry Conditions"]
+    assert alerts[0]["severity"] == "info"
+
+
+def hours(**columns):
+    steps = len(next(iter(columns.values())))
+    frame = {"time": np.array([f"2025-01-01T{h:02d}:00" for h in range(steps)])}
+    defaults = {"temperature": 20.0, "humidity": 60.0, "precipitation": 0.0, "wind_speed": 20.0}
+    for name, value in defaults.items():
+        frame[name] = np.array(columns.get(name, [value] * steps), dtype=np.float64)
+    return ForecastFrame(frame, "time")
+
+
+def test_hourly_alerts_span_the_hours_the_rule_holds():
+    temperature = [5.0, 0.0, -1.0, -2.0, 3.0, 36.0, 37.0, 20.0, 36.0, 37.0, 38.0, 39.0]
+
+    alerts = AlertEngine().evaluate(hourly=hours(temperature=temperature))
+
+    frost = [alert for alert in alerts if alert["type"] == "Frost Risk"]
+    heat = [alert for alert in alerts if alert["type"] == "Heat Stress"]
+    assert [(alert["start"], alert["end"], alert["steps"]) for alert in frost] == [
+        ("2025-01-01T01:00", "2025-01-01T03:00", 3)]
+    # Two hot hours are below Heat Stress's three-hour minimum; the run reaching the end of the horizon counts
+    assert [(alert["start"], alert["end"], alert["steps"]) for alert in heat] == [
+        ("2025-01-01T08:00", "2025-01-01T11:00", 4)]
+
+
+def test_disease_risk_needs_six_humid_hours():
+    humid = [95.0] * 5 + [60.0] + [95.0] * 6
+
+    alerts = AlertEngine().evaluate(hourly=hours(humidity=humid))
+
+    assert [(alert["type"], alert["start"], alert["steps"]) for alert in alerts] == [
+        ("Disease Risk", "2025-01-01T06:00", 6)]
+
+
+def test_farms_with_shorter_horizons_do_not_alert_on_padding():
+    windy = hours(wind_speed=[10.0, 60.0, 60.0, 10.0])
+    short = hours(wind_speed=[60.0])
+
+    alerts = AlertEngine().evaluate_many({"a": {"hourly": windy}, "b": {"hourly": short}})
+
+    assert [(alert["type"], alert["start"], alert["end"]) for alert in alerts["a"]] == [
+        ("High Wind", "2025-01-01T01:00", "2025-01-01T02:00")]
+    assert [(alert["type"], alert["steps"]) for alert in alerts["b"]] == [("High Wind", 1)]
+
+
+def test_spray_window_is_opt_in():
+    calm = hours(wind_speed=[5.0] * 4)
+
+    assert AlertEngine().evaluate(hourly=calm) == []
+    assert [alert["type"] for alert in AlertEngine(DEFAULT_RULES + (SPRAY_WINDOW,)).evaluate(hourly=calm)] == [
+        "Spray Window"]
+
+
+def test_current_conditions_do_not_repeat_hourly_alerts():
+    service = AsyncWeatherService(cache=MemoryCache())
+    current = {"temperature": -2.0, "humidity": 60, "precipitation": 0.0, "wind_speed": 60.0}
+    hourly = hours(temperature=[-2.0, -1.0], wind_speed=[60.0, 55.0])
+
+    alerts = service.check_weather_alerts(current, one_day(0.0, 60), hourly)
+    without_forecast = service.check_weather_alerts(current, {"precipitation": 0.0})
+
+    assert sorted(alert["type"] for alert in alerts) == ["Frost Risk", "High Wind"]
+    assert sorted(alert["type"] for alert in without_forecast) == ["Frost Warning", "High Wind Warning"]
@@ -0,0 +1,34 @@
+import asyncio
+from datetime import date
+
+import numpy as np
+
+from forecast_frame import ForecastFrame
+from weather_archive import WeatherArchive
+
+
+def test_reads_leave_the_disk_untouched(tmp_path):
+    archive = WeatherArchive(str(tmp_path / "archive"))
+
+    frame = archive.query(28.61, 77.21, "2025-03-01", "2025-03-10")
+    ranges = archive.missing_ranges(28.61, 77.21, "2025-03-01", "2025-03-10")
+
+    assert len(frame) == 10
+    assert np.isnan(frame.column("temp_max")).all()
+    assert ranges == [(date(2025, 3, 1), date(2025, 3, 10))]
+    assert not (tmp_path / "archive").exists()
+
+
+def test_backfill_creates_the_location_on_write(tmp_path):
+    archive = WeatherArchive(str(tmp_path / "archive"))
+
+    async def fetch(latitude, longitude, start, end):
+        days = np.arange(np.datetime64(start), np.datetime64(end) + 1).astype(str)
+        return ForecastFrame({"date": days, "temp_max": np.full(len(days), 30.0)}, "date")
+
+    requested = asyncio.run(archive.backfill(fetch, 28.61, 77.21, "2025-03-01", "2025-03-10"))
+
+    assert requested == 1
+    assert len(list((tmp_path / "archive").glob("*/meta.json"))) == 1
+    assert archive.missing_ranges(28.61, 77.21, "2025-03-01", "2025-03-10") == []
+    assert (archive.query(28.61, 77.21, "2025-03-01", "2025-03-10").column("temp_max") == 30.0).all()
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+from cache_backend import MemoryCache
+from weather_service import DAILY_VARIABLES, AsyncWeatherService
+
+PLOTS = {"north": (20.0, 77.0), "south": (10.0, 77.0), "east": (15.0, 80.0)}
+
+
+def current(temperature):
+    return {
+        "current": {
+            "time": "2025-01-01T12:00",
+            "temperature_2m": temperature,
+            "relative_humidity_2m": 55,
+            "precipitation": 0.0,
+            "wind_speed_10m": 8.2,
+            "wind_direction_10m": 270
+        }
+    }
+
+
+class MultiLocationUpstream:
+    """Answers like Open-Meteo: one entry per coordinate, a bare object for one"""
+
+    def __init__(self, single_object=False):
+        self.single_object = single_object
+        self.requests = []
+
+    async def __call__(self, url, params):
+        self.requests.append(params)
+        latitudes = [float(value) for value in str(params["latitude"]).split(",")]
+        if len(latitudes) == 1 or self.single_object:
+            return current(latitudes[0])
+        return [current(latitude) for latitude in latitudes]
+
+
+def service_with(upstream):
+    service = AsyncWeatherService(cache=MemoryCache())
+    service._request_json = upstream
+    return service
+
+
+def test_each_plot_gets_its_own_location():
+    upstream = MultiLocationUpstream()
+    service = service_with(upstream)
+
+    results = asyncio.run(service.get_current_weather_many(PLOTS, chunk_size=2))
+
+    assert len(upstream.requests) == 2
+    for plot_id, (latitude, longitude) in PLOTS.items():
+        cell = service.quantizer.snap(latitude, longitude)
+        assert results[plot_id]["temperature"] == cell["latitude"]
+
+
+def test_cached_cells_are_not_requested_again():
+    upstream = MultiLocationUpstream()
+    service = service_with(upstream)
+    asyncio.run(service.get_current_weather(*PLOTS["north"]))
+
+    results = asyncio.run(service.get_current_weather_many(PLOTS))
+
+    assert len(upstream.requests) == 2
+    assert upstream.requests[1]["latitude"].count(",") == 1
+    assert all(result is not None for result in results.values())
+
+
+def test_single_object_for_several_locations_is_an_error(caplog):
+    service = service_with(MultiLocationUpstream(single_object=True))
+
+    with caplog.at_level(logging.ERROR, logger="weather_service"):
+        results = asyncio.run(service.get_current_weather_many(PLOTS))
+
+    # No plot is handed another plot's weather
+    assert results == {plot_id: None for plot_id in PLOTS}
+    assert "expected 3 locations in response, got 1" in caplog.text
+
+
+def test_plots_in_one_grid_cell_share_a_slot():
+    upstream = MultiLocationUpstream()
+    service = service_with(upstream)
+    plots = {"a": (20.001, 77.001), "b": (20.002, 77.002), "c": (10.0, 77.0)}
+
+    results = asyncio.run(service.get_current_weather_many(plots))
+
+    assert upstream.requests[0]["latitude"].count(",") == 1
+    assert results["a"]["grid_cell"] == results["b"]["grid_cell"]
+    assert results["a"]["temperature"] == results["b"]["temperature"] != results["c"]["temperature"]
+
+
+def test_daily_forecasts_for_many_plots():
+    async def upstream(url, params):
+        latitudes = str(params["latitude"]).split(",")
+        days = params["forecast_days"]
+        block = {"time": [f"2025-01-0{day + 1}" for day in range(days)]}
+        block.update({variable: [1.0] * days for variable in DAILY_VARIABLES})
+        return [{"daily": block} for _ in latitudes]
+
+    service = service_with(upstream)
+
+    results = asyncio.run(service.get_daily_forecast_many(PLOTS, days=3))
+
+    assert all(len(frame) == 3 for frame in results.values())
+    assert results["north"].grid_cell != results["south"].grid_cell
@@ -0,0 +1,103 @@
+import asyncio
+
+from cache_backend import MemoryCache
+from forecast_frame import ForecastFrame
+from weather_service import AsyncWeatherService, DAILY_VARIABLES, HOURLY_VARIABLES
+
+DAYS = 3
+HOURS = 4
+
+
+def block(times, variables):
+    data = {"time": times}
+    data.update({variable: [float(i) for i in range(len(times))] for variable in variables})
+    return data
+
+
+FORECAST = {
+    "current": {
+        "time": "2025-01-01T12:00",
+        "temperature_2m": 24.5,
+        "relative_humidity_2m": 55,
+        "precipitation": 0.0,
+        "wind_speed_10m": 8.2,
+        "wind_direction_10m": 270
+    },
+    "daily": block([f"2025-01-0{day + 1}" for day in range(DAYS)], DAILY_VARIABLES),
+    "hourly": block([f"2025-01-01T{hour:02d}:00" for hour in range(HOURS)], HOURLY_VARIABLES)
+}
+
+
+class Upstream:
+    def __init__(self):
+        self.requests = []
+
+    async def __call__(self, url, params):
+        self.requests.append(params)
+        return FORECAST
+
+
+def service_with(upstream):
+    service = AsyncWeatherService(cache=MemoryCache())
+    service._request_json = upstream
+    return service
+
+
+def test_bundle_fetches_all_blocks_in_one_request():
+    upstream = Upstream()
+    service = service_with(upstream)
+
+    bundle = asyncio.run(service.get_weather_bundle(28.6, 77.2, days=DAYS, hours=HOURS))
+
+    assert len(upstream.requests) == 1
+    params = upstream.requests[0]
+    assert {"current", "daily", "hourly"} <= set(params)
+    assert (params["forecast_days"], params["forecast_hours"]) == (DAYS, HOURS)
+    assert bundle["current"]["temperature"] == 24.5
+    assert isinstance(bundle["daily"], ForecastFrame) and len(bundle["daily"]) == DAYS
+    assert list(bundle["hourly"].column("temperature")) == [0.0, 1.0, 2.0, 3.0]
+    assert bundle["grid_cell"] == bundle["daily"].grid_cell
+
+
+def test_bundle_primes_single_block_lookups():
+    upstream = Upstream()
+    service = service_with(upstream)
+
+    async def run():
+        await service.get_weather_bundle(28.6, 77.2, days=DAYS, hours=HOURS)
+        return (await service.get_current_weather(28.6, 77.2),
+                await service.get_daily_forecast(28.6, 77.2, days=DAYS),
+                await service.get_hourly_forecast(28.6, 77.2, hours=HOURS))
+
+    current, daily, hourly = asyncio.run(run())
+
+    assert len(upstream.requests) == 1
+    assert current["temperature"] == 24.5 and len(daily) == DAYS and len(hourly) == HOURS
+
+
+def test_backfill_asks_for_past_days_and_leaves_forecast_cache_alone():
+    upstream = Upstream()
+    service = service_with(upstream)
+
+    async def run():
+        await service.get_weather_bundle(28.6, 77.2, days=DAYS, hours=HOURS, past_days=2)
+        await service.get_current_weather(28.6, 77.2)
+
+    asyncio.run(run())
+
+    assert upstream.requests[0]["past_days"] == 2 and upstream.requests[0]["past_hours"] == 48
+    assert len(upstream.requests) == 2
+
+
+def test_served_bundle_carries_its_age_on_every_part():
+    service = service_with(Upstream())
+
+    async def run():
+        await service.get_weather_bundle(28.6, 77.2, days=DAYS, hours=HOURS)
+        return await service.get_weather_bundle(28.6, 77.2, days=DAYS, hours=HOURS)
+
+    bundle = asyncio.run(run())
+
+    assert bundle["age_seconds"] >= 0
+    assert bundle["daily"].age_seconds == bundle["age_seconds"]
+    assert bundle["current"]["age_seconds"] == bundle["age_seconds"]
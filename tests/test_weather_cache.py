@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+import weather_service
+from cache_backend import MemoryCache
+from weather_service import AsyncWeatherService
+
+CURRENT = {
+    "current": {
+        "time": "2025-01-01T12:00",
+        "temperature_2m": 24.5,
+        "relative_humidity_2m": 55,
+        "precipitation": 0.0,
+        "wind_speed_10m": 8.2,
+        "wind_direction_10m": 270
+    }
+}
+
+
+class SlowUpstream:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, url, params):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return CURRENT
+
+
+def service_with(upstream, **options):
+    service = AsyncWeatherService(cache=MemoryCache(), **options)
+    service._request_json = upstream
+    return service
+
+
+def test_concurrent_identical_requests_share_one_upstream_call():
+    upstream = SlowUpstream()
+    service = service_with(upstream)
+
+    async def run():
+        return await asyncio.gather(*(service.get_current_weather(28.6139, 77.2090) for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert upstream.calls == 1
+    assert all(result["temperature"] == 24.5 for result in results)
+    assert service.flight_stats()["issued"] == 1
+    assert service.flight_stats()["coalesced"] == 9
+    assert service.flight_stats()["in_flight"] == 0
+
+
+def test_stale_hit_returns_at_once_and_starts_one_refresh():
+    service = service_with(SlowUpstream(), max_staleness=60)
+    fetches = []
+
+    async def fetch():
+        fetches.append(time.monotonic())
+        await asyncio.sleep(0.2)
+        return len(fetches)
+
+    async def run():
+        assert await service._cached("weather:test", fetch, ttl=0.01) == (1, 0.0)
+        await asyncio.sleep(0.05)
+
+        start = time.monotonic()
+        served = [await service._cached("weather:test", fetch, ttl=0.01) for _ in range(3)]
+        elapsed = time.monotonic() - start
+
+        refreshes = list(service._refreshing.values())
+        await asyncio.gather(*refreshes)
+        return served, elapsed, len(refreshes)
+
+    served, elapsed, refreshes = asyncio.run(run())
+
+    assert [value for value, _ in served] == [1, 1, 1]
+    assert all(age > 0.01 for _, age in served)
+    assert elapsed < 0.1
+    assert refreshes == 1 and len(fetches) == 2
+    assert service.cache.get_entry("weather:test").value == 2
+
+
+def test_expired_past_staleness_waits_for_fresh_data():
+    service = service_with(SlowUpstream(), max_staleness=0)
+    values = iter([1, 2])
+
+    async def fetch():
+        return next(values)
+
+    async def run():
+        await service._cached("weather:test", fetch, ttl=0.01)
+        await asyncio.sleep(0.05)
+        return await service._cached("weather:test", fetch, ttl=0.01)
+
+    assert asyncio.run(run()) == (2, 0.0)
+
+
+def test_hit_counts_are_bounded(monkeypatch):
+    monkeypatch.setattr(weather_service, "HIT_COUNT_ENTRIES", 3)
+    service = service_with(SlowUpstream())
+
+    async def fetch():
+        return "value"
+
+    async def run():
+        for key in ("a", "b", "c", "d", "b"):
+            await service._cached(f"weather:{key}", fetch)
+            await service._cached(f"weather:{key}", fetch)
+
+    asyncio.run(run())
+
+    assert list(service._hit_counts) == ["weather:c", "weather:d", "weather:b"]
+
+
+def test_failed_flight_reaches_every_waiter_and_is_not_reused():
+    calls = []
+
+    async def failing(url, params):
+        calls.append(params)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("offline")
+
+    service = service_with(failing)
+
+    async def run():
+        results = await asyncio.gather(*(service._get_json("u", {"q": 1}) for _ in range(3)),
+                                       return_exceptions=True)
+        return results, service.flight_stats()["in_flight"]
+
+    results, in_flight = asyncio.run(run())
+
+    assert len(calls) == 1 and in_flight == 0
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_one_waiter_giving_up_does_not_cancel_the_others():
+    upstream = SlowUpstream(delay=0.05)
+    service = service_with(upstream)
+
+    async def run():
+        impatient = asyncio.ensure_future(service._get_json("u", {"q": 1}))
+        patient = asyncio.ensure_future(service._get_json("u", {"q": 1}))
+        await asyncio.sleep(0.01)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run()) == CURRENT
+    assert upstream.calls == 1
+
+
+def test_different_parameters_are_not_coalesced():
+    upstream = SlowUpstream(delay=0.01)
+    service = service_with(upstream)
+
+    async def run():
+        await asyncio.gather(service._get_json("u", {"days": [1, 2]}), service._get_json("u", {"days": [1, 3]}),
+                             service._get_json("u", {"days": [1, 2]}))
+
+    asyncio.run(run())
+
+    assert upstream.calls == 2 and service.flight_stats()["coalesced"] == 1
@@ -0,0 +1,111 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+import weather_service
+from cache_backend import MemoryCache
+from weather_service import AsyncWeatherService, WeatherService
+
+CURRENT = {
+    "current": {
+        "time": "2025-01-01T12:00",
+        "temperature_2m": 24.5,
+        "relative_humidity_2m": 55,
+        "precipitation": 0.0,
+        "wind_speed_10m": 8.2,
+        "wind_direction_10m": 270
+    }
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = json.dumps(CURRENT if status == 200 else {"error": True}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.connections = set()
+    server.statuses = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def sync_service(server, **options):
+    service = WeatherService(cache=MemoryCache(), backoff_factor=0, **options)
+    service.base_url = f"http://127.0.0.1:{server.server_port}"
+    return service
+
+
+def test_sequential_calls_reuse_one_connection(server):
+    service = sync_service(server)
+    try:
+        for i in range(5):
+            assert service.get_current_weather(20.0 + i, 77.0)["temperature"] == 24.5
+    finally:
+        service.close()
+
+    assert len(server.connections) == 1
+
+
+def test_server_errors_are_retried(server):
+    server.statuses = [503, 502]
+    service = sync_service(server)
+    try:
+        assert service.get_current_weather(20.0, 77.0)["temperature"] == 24.5
+    finally:
+        service.close()
+
+    assert server.statuses == []
+
+
+def test_sync_wrapper_reports_errors_through_streamlit(server, monkeypatch):
+    messages = []
+    monkeypatch.setattr(weather_service.st, "error", messages.append)
+    server.statuses = [500, 500]
+    service = sync_service(server, max_retries=1)
+    try:
+        assert service.get_current_weather(20.0, 77.0) is None
+    finally:
+        service.close()
+
+    assert len(messages) == 1 and messages[0].startswith("Error fetching current weather")
+
+
+def test_client_errors_are_not_retried(server, monkeypatch):
+    monkeypatch.setattr(weather_service.st, "error", lambda message: None)
+    server.statuses = [404, 200]
+    service = sync_service(server)
+    try:
+        assert service.get_current_weather(20.0, 77.0) is None
+    finally:
+        service.close()
+
+    assert server.statuses == [200]
+
+
+def test_retry_delay_honours_retry_after():
+    service = AsyncWeatherService(cache=MemoryCache(), backoff_factor=0.5)
+
+    assert service._retry_delay(httpx.Response(429, headers={"Retry-After": "2"}), 0) == 2.0
+    assert service._retry_delay(httpx.Response(503), 2) == 2.0
+    assert service._retry_delay(None, 1) == 1.0
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from cache_backend import MemoryCache
+from weather_service import AsyncWeatherService
+
+LATENCY = 0.2
+LOCATIONS = 10
+
+CURRENT = {
+    "current": {
+        "time": "2025-01-01T12:00",
+        "temperature_2m": 24.5,
+        "relative_humidity_2m": 55,
+        "precipitation": 0.0,
+        "wind_speed_10m": 8.2,
+        "wind_direction_10m": 270
+    }
+}
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = json.dumps(CURRENT).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SlowServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops simultaneous connects, which then wait out a SYN retry
+    request_queue_size = 64
+
+
+@pytest.fixture
+def base_url():
+    server = SlowServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+async def fetch(base_url, coordinates, concurrent):
+    async with AsyncWeatherService(pool_size=LOCATIONS, max_concurrency=LOCATIONS, per_host_limit=LOCATIONS,
+                                   cache=MemoryCache()) as service:
+        service.base_url = base_url
+        start = time.perf_counter()
+        if concurrent:
+            results = await asyncio.gather(*(service.get_current_weather(lat, lon) for lat, lon in coordinates))
+        else:
+            results = [await service.get_current_weather(lat, lon) for lat, lon in coordinates]
+        return time.perf_counter() - start, results, service.requests_issued
+
+
+def test_distinct_locations_are_fetched_concurrently(base_url):
+    coordinates = [(20.0 + i, 77.0) for i in range(LOCATIONS)]
+
+    single, _, _ = asyncio.run(fetch(base_url, coordinates[:1], concurrent=True))
+    elapsed, results, requests = asyncio.run(fetch(base_url, coordinates, concurrent=True))
+
+    assert requests == LOCATIONS
+    assert all(result is not None and result["temperature"] == 24.5 for result in results)
+    assert single >= LATENCY
+    # All requests overlap, so N locations take about as long as one
+    assert elapsed < 2 * single
+
+
+def test_sequential_fetches_pay_latency_per_location(base_url):
+    coordinates = [(20.0 + i, 77.0) for i in range(3)]
+
+    elapsed, _, requests = asyncio.run(fetch(base_url, coordinates, concurrent=False))
+
+    assert requests == 3
+    assert elapsed >= 3 * LATENCY
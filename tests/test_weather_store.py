@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from forecast_frame import ForecastFrame
+from weather_service import DAILY_COLUMNS, HOURLY_COLUMNS
+from weather_store import WeatherStore
+
+
+def bundle(temperature, start=None, days=3, hours=4):
+    start = start or datetime.now().replace(minute=0, second=0, microsecond=0)
+    daily_times = [(start + timedelta(days=day)).strftime("%Y-%m-%d") for day in range(days)]
+    hourly_times = [(start + timedelta(hours=hour)).strftime("%Y-%m-%dT%H:%M") for hour in range(hours)]
+    daily = {"date": np.array(daily_times)}
+    daily.update({name: np.full(days, temperature) for name in DAILY_COLUMNS})
+    hourly = {"time": np.array(hourly_times)}
+    hourly.update({name: np.full(hours, temperature) for name in HOURLY_COLUMNS})
+    return {
+        "current": {"timestamp": hourly_times[0], "temperature": temperature, "humidity": 50.0,
+                    "precipitation": 0.0, "wind_speed": 5.0, "wind_direction": 90.0},
+        "daily": ForecastFrame(daily, "date"),
+        "hourly": ForecastFrame(hourly, "time")
+    }
+
+
+class FakeService:
+    def __init__(self, temperature=20.0, fail=False):
+        self.temperature = temperature
+        self.fail = fail
+        self.calls = []
+
+    async def get_weather_bundle(self, latitude, longitude, days=7, hours=24, past_days=0):
+        self.calls.append(past_days)
+        await asyncio.sleep(0)
+        return None if self.fail else bundle(self.temperature)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = WeatherStore(str(tmp_path / "weather.sqlite"))
+    store.save_location("farm", 28.6, 77.2, "Delhi")
+    yield store
+    store.close()
+
+
+def test_stored_bundle_is_read_back(store):
+    store.store_bundle("farm", bundle(21.5))
+
+    assert store.get_current("farm")["temperature"] == 21.5
+    assert len(store.get_daily("farm")) == 3
+    assert list(store.get_hourly("farm").column("temperature")) == [21.5] * 4
+    assert store.last_synced("farm") is not None
+
+
+def test_upserts_replace_rows_and_prune_past_retention(store):
+    old = datetime.now() - timedelta(days=10)
+    store.store_bundle("farm", bundle(10.0, start=old))
+    store.store_bundle("farm", bundle(20.0))
+    store.store_bundle("farm", bundle(25.0))
+
+    assert set(store.get_daily("farm").column("temp_max")) == {25.0}
+    assert len(store.get_hourly("farm")) == 4
+    assert store.get_current("farm")["temperature"] == 25.0
+
+
+def test_moving_a_location_drops_its_weather(store):
+    store.store_bundle("farm", bundle(20.0))
+
+    store.save_location("farm", 28.6, 77.2, "Renamed")
+    assert store.get_current("farm") is not None
+
+    store.save_location("farm", 19.0, 72.8, "Mumbai")
+    assert store.get_current("farm") is None
+    assert store.locations()[0]["name"] == "Mumbai"
+
+
+def test_sync_writes_off_the_event_loop_thread(store, monkeypatch):
+    writers = []
+    store_bundle = store.store_bundle
+
+    def recording_store_bundle(location_id, data):
+        writers.append(threading.current_thread())
+        store_bundle(location_id, data)
+
+    monkeypatch.setattr(store, "store_bundle", recording_store_bundle)
+
+    async def run():
+        return await store.sync(FakeService()), threading.current_thread()
+
+    synced, loop_thread = asyncio.run(run())
+
+    assert synced == {"farm": True}
+    assert writers and all(writer is not loop_thread for writer in writers)
+    assert store.get_current("farm")["temperature"] == 20.0
+
+
+def test_sync_skips_recent_locations_and_backfills_long_gaps(store):
+    service = FakeService()
+    asyncio.run(store.sync(service))
+    assert asyncio.run(store.sync(service)) == {}
+
+    # Offline for two and a half days
+    store._conn.execute("UPDATE locations SET synced_at = ?", (time.time() - 60 * 3600,))
+    asyncio.run(store.sync(service))
+
+    assert service.calls == [0, 3]
+
+
+def test_failed_sync_keeps_stored_data(store):
+    store.store_bundle("farm", bundle(18.0))
+
+    synced = asyncio.run(store.sync(FakeService(fail=True), min_interval=0))
+
+    assert synced == {"farm": False}
+    assert store.get_current("farm")["temperature"] == 18.0
@@ -100,8 +100,16 @@ def is_spraying_weather(wind_speed: float, humidity: float, temp: float) -> Dict
         "reasons": reasons if reasons else ["Good conditions for spraying"]
     }
 
-def calculate_growing_degree_days(temp_max: float, temp_min: float, base_temp: float = 10) -> float:
-    """Calculate growing degree days for crop development tracking"""
+def calculate_growing_degree_days(temp_max: float, temp_min: float, base_temp: float = 10,
+                                  upper_temp: Optional[float] = None) -> float:
+    """Calculate growing degree days for crop development tracking.
+    
+    With ``upper_temp``, max/min are clamped to [base, upper] first, since
+    development stalls above the crop's upper threshold.
+    """
+    if upper_temp is not None:
+        temp_max = min(max(temp_max, base_temp), upper_temp)
+        temp_min = min(max(temp_min, base_temp), upper_temp)
     avg_temp = (temp_max + temp_min) / 2
     
     # Standard GDD calculation
@@ -0,0 +1,137 @@
+"""Vectorized weather alert engine: declarative rules evaluated as NumPy masks over forecast horizons"""
+import operator
+from typing import Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from forecast_frame import ForecastFrame
+
+_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq
+}
+
+class AlertRule(NamedTuple):
+    """A condition on one forecast block that raises an alert while it holds.
+    
+    ``conditions`` are ``(column, operator, threshold)`` clauses that must all
+    hold; the alert fires for runs of at least ``min_steps`` consecutive
+    hours (hourly block) or days (daily block).
+    """
+    type: str
+    block: str
+    conditions: Tuple[Tuple[str, str, float], ...]
+    severity: str
+    message: str
+    min_steps: int = 1
+
+DEFAULT_RULES = (
+    AlertRule("Frost Risk", "hourly", (("temperature", "<=", 0),), "error",
+              "Freezing temperatures forecast. Cover sensitive crops or irrigate before the cold night."),
+    AlertRule("Heat Stress", "hourly", (("temperature", ">", 35),), "warning",
+              "Sustained high temperatures may stress crops. Ensure adequate irrigation.", 3),
+    AlertRule("Heavy Rain Expected", "daily", (("precipitation", ">", 25),), "warning",
+              "Heavy rainfall forecasted. Avoid field operations and monitor for waterlogging."),
+    # Daily mean humidity, so every forecast day is judged; the single-day check uses current humidity
+    AlertRule("Dry Conditions", "daily", (("precipitation", "==", 0), ("humidity", "<", 30)), "info",
+              "Low humidity and no precipitation. Consider irrigation needs."),
+    AlertRule("High Wind", "hourly", (("wind_speed", ">", 50),), "warning",
+              "Strong winds may damage crops and affect spraying operations."),
+    AlertRule("Disease Risk", "hourly", (("humidity", ">", 90),), "warning",
+              "Prolonged very high humidity increases fungal disease risk. Monitor crops closely.", 6)
+)
+
+# Fires in ordinary good weather, so it is advice rather than an alert; opt in with
+# AlertEngine(DEFAULT_RULES + (SPRAY_WINDOW,))
+SPRAY_WINDOW = AlertRule("Spray Window", "hourly",
+                         (("wind_speed", "<", 15), ("precipitation", "==", 0), ("temperature", ">=", 10),
+                          ("temperature", "<=", 30)),
+                         "info", "Calm, dry and mild conditions suitable for spraying.", 3)
+
+def _stack(frames: Sequence[Optional[ForecastFrame]],
+           columns: Sequence[str]) -> Tuple[Dict[str, np.ndarray], List[np.ndarray]]:
+    """Stack per-farm frames into (farms, steps) arrays, padding shorter horizons with NaN.
+    
+    Timestamps stay as each farm's own array; they are only read at alert edges.
+    """
+    steps = max((len(frame) for frame in frames if frame is not None), default=0)
+    stacked = {name: np.full((len(frames), steps), np.nan) for name in columns}
+    times = []
+    for row, frame in enumerate(frames):
+        if frame is None or not len(frame):
+            times.append(np.array([], dtype=str))
+            continue
+        times.append(frame.column(frame.time_column))
+        for name in columns:
+            if name in frame.columns:
+                stacked[name][row, :len(frame)] = frame.column(name)
+    return stacked, times
+
+def find_runs(mask: np.ndarray, min_steps: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Runs of True along the last axis of a (rows, steps) mask.
+    
+    Returns ``(rows, starts, ends)`` with ``ends`` exclusive, for runs of at
+    least ``min_steps``.
+    """
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    # Row-major order pairs each rising edge with the falling edge that follows it
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    keep = (ends - starts) >= min_steps
+    return rows[keep], starts[keep], ends[keep]
+
+class AlertEngine:
+    """Evaluate alert rules over the full daily and hourly horizons of many farms at once"""
+    
+    def __init__(self, rules: Sequence[AlertRule] = DEFAULT_RULES):
+        self.rules = list(rules)
+    
+    def evaluate_arrays(self, blocks: Dict[str, Tuple[Dict[str, np.ndarray], Sequence[np.ndarray]]]) -> List[List[Dict]]:
+        """Alerts per farm from ``{block: (columns, times)}``.
+        
+        Columns are (farms, steps) arrays; ``times`` holds each farm's timestamps.
+        """
+        farms = max((len(times) for _, times in blocks.values()), default=0)
+        alerts: List[List[Dict]] = [[] for _ in range(farms)]
+        for rule in self.rules:
+            if rule.block not in blocks:
+                continue
+            columns, times = blocks[rule.block]
+            if any(name not in columns for name, _, _ in rule.conditions):
+                continue
+            mask = None
+            for name, op, threshold in rule.conditions:
+                # NaN (missing data or padding) compares False, so it never raises an alert
+                clause = _OPERATORS[op](columns[name], threshold)
+                mask = clause if mask is None else mask & clause
+            
+            rows, starts, ends = find_runs(mask, rule.min_steps)
+            for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+                alerts[row].append({
+                    "type": rule.type,
+                    "message": rule.message,
+                    "severity": rule.severity,
+                    "start": str(times[row][start]),
+                    "end": str(times[row][end - 1]),
+                    "steps": end - start
+                })
+        return alerts
+    
+    def evaluate(self, daily: Optional[ForecastFrame] = None, hourly: Optional[ForecastFrame] = None) -> List[Dict]:
+        """Alert intervals for one farm's forecasts"""
+        return self.evaluate_many({0: {"daily": daily, "hourly": hourly}})[0]
+    
+    def evaluate_many(self, forecasts: Dict[Hashable, Dict[str, Optional[ForecastFrame]]]) -> Dict[Hashable, List[Dict]]:
+        """Alert intervals keyed by farm, from ``{farm_id: {"daily": frame, "hourly": frame}}``"""
+        farm_ids = list(forecasts)
+        blocks = {}
+        for block in ("daily", "hourly"):
+            frames = [forecasts[farm_id].get(block) for farm_id in farm_ids]
+            if any(frame is not None for frame in frames):
+                columns = {name for rule in self.rules if rule.block == block for name, _, _ in rule.conditions}
+                blocks[block] = _stack(frames, sorted(columns))
+        alerts = self.evaluate_arrays(blocks) if blocks else [[] for _ in farm_ids]
+        return dict(zip(farm_ids, alerts))
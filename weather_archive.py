@@ -0,0 +1,178 @@
+"""Daily weather history on disk: memory-mapped NumPy partitions per location and month"""
+import asyncio
+import calendar
+import json
+import os
+import re
+import threading
+from datetime import date, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from forecast_frame import ForecastFrame
+from geo_grid import CoordinateQuantizer
+
+# ForecastFrame column name -> Open-Meteo archive variable
+ARCHIVE_DAILY_COLUMNS = {
+    "temp_max": "temperature_2m_max",
+    "temp_min": "temperature_2m_min",
+    "temp_mean": "temperature_2m_mean",
+    "precipitation": "precipitation_sum",
+    "humidity": "relative_humidity_2m_mean",
+    "wind_speed": "wind_speed_10m_max",
+    "et0": "et0_fao_evapotranspiration"
+}
+COLUMNS = list(ARCHIVE_DAILY_COLUMNS)
+
+# The archive API lags real time by a few days; newer days are left for a later run
+ARCHIVE_DELAY_DAYS = 5
+
+DateLike = Union[date, str]
+
+def _to_date(value: DateLike) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+def _months(start: date, end: date) -> List[Tuple[int, int]]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+class WeatherArchive:
+    """Season-to-date daily weather kept under ``root/<grid cell>/<YYYY-MM>.npy``.
+    
+    Each partition is a float32 ``(days_in_month, len(COLUMNS) + 1)`` array;
+    the last column flags days that have been filled, so later backfills only
+    request the gaps. Reads memory-map the partitions instead of loading them.
+    """
+    
+    def __init__(self, root: str, quantizer: Optional[CoordinateQuantizer] = None):
+        self.root = root
+        self.quantizer = quantizer if quantizer is not None else CoordinateQuantizer()
+        self._lock = threading.Lock()
+    
+    def _location_dir(self, latitude: float, longitude: float, create: bool = False) -> str:
+        """Directory for the grid cell; only writes create it, reads of a missing one find no partitions"""
+        cell = self.quantizer.snap(latitude, longitude)
+        directory = os.path.join(self.root, re.sub(r"[^\w.-]", "_", cell["key"]))
+        meta_path = os.path.join(directory, "meta.json")
+        if create and not os.path.exists(meta_path):
+            os.makedirs(directory, exist_ok=True)
+            with open(meta_path, "w") as f:
+                json.dump({"grid_cell": cell, "columns": COLUMNS}, f)
+        return directory
+    
+    def _partition(self, directory: str, year: int, month: int, writable: bool = False) -> Optional[np.ndarray]:
+        path = os.path.join(directory, f"{year:04d}-{month:02d}.npy")
+        if os.path.exists(path):
+            return np.load(path, mmap_mode="r+" if writable else "r")
+        if not writable:
+            return None
+        days = calendar.monthrange(year, month)[1]
+        partition = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(days, len(COLUMNS) + 1))
+        partition[:, :-1] = np.nan
+        partition[:, -1] = 0
+        return partition
+    
+    def missing_ranges(self, latitude: float, longitude: float, start: DateLike,
+                       end: DateLike) -> List[Tuple[date, date]]:
+        """Inclusive date ranges between ``start`` and ``end`` with no stored data"""
+        start, end = _to_date(start), _to_date(end)
+        directory = self._location_dir(latitude, longitude)
+        filled = np.zeros((end - start).days + 1, dtype=bool)
+        for year, month in _months(start, end):
+            partition = self._partition(directory, year, month)
+            if partition is None:
+                continue
+            first = max(start, date(year, month, 1))
+            last = min(end, date(year, month, partition.shape[0]))
+            offset = (first - start).days
+            filled[offset:offset + (last - first).days + 1] = partition[first.day - 1:last.day, -1] > 0
+        
+        # Edges of the unfilled runs become the ranges to request
+        padded = np.concatenate(([True], filled, [True]))
+        edges = np.diff(padded.astype(np.int8))
+        starts = np.nonzero(edges == -1)[0]
+        ends = np.nonzero(edges == 1)[0]
+        return [(start + timedelta(days=int(s)), start + timedelta(days=int(e) - 1)) for s, e in zip(starts, ends)]
+    
+    def write(self, latitude: float, longitude: float, frame: ForecastFrame):
+        """Store daily rows (``date`` plus archive columns); days with no data stay unfilled"""
+        if not len(frame):
+            return
+        directory = self._location_dir(latitude, longitude, create=True)
+        dates = frame.column(frame.time_column).astype("datetime64[D]")
+        values = np.column_stack([
+            frame.column(name).astype(np.float32) if name in frame.columns else np.full(len(frame), np.nan, np.float32)
+            for name in COLUMNS
+        ])
+        # Days the archive hasn't published yet come back all-null; fetch them again later
+        has_data = ~np.isnan(values).all(axis=1)
+        
+        months = dates.astype("datetime64[M]")
+        with self._lock:
+            for month in np.unique(months):
+                rows = months == month
+                year, month_number = int(str(month)[:4]), int(str(month)[5:7])
+                partition = self._partition(directory, year, month_number, writable=True)
+                days = (dates[rows] - month.astype("datetime64[D]")).astype(int)
+                partition[days, :-1] = values[rows]
+                partition[days, -1] = has_data[rows]
+                partition.flush()
+    
+    def query(self, latitude: float, longitude: float, start: DateLike, end: DateLike) -> ForecastFrame:
+        """Stored daily history from ``start`` to ``end`` inclusive; unfilled days are NaN"""
+        start, end = _to_date(start), _to_date(end)
+        directory = self._location_dir(latitude, longitude)
+        total = (end - start).days + 1
+        values = np.full((total, len(COLUMNS)), np.nan, dtype=np.float32)
+        for year, month in _months(start, end):
+            partition = self._partition(directory, year, month)
+            if partition is None:
+                continue
+            first = max(start, date(year, month, 1))
+            last = min(end, date(year, month, partition.shape[0]))
+            offset = (first - start).days
+            values[offset:offset + (last - first).days + 1] = partition[first.day - 1:last.day, :-1]
+        
+        dates = np.arange(np.datetime64(start), np.datetime64(end) + 1).astype(str)
+        columns = {"date": dates}
+        columns.update({name: values[:, i] for i, name in enumerate(COLUMNS)})
+        return ForecastFrame(columns, "date", {"grid_cell": self.quantizer.snap(latitude, longitude)})
+    
+    async def backfill(self, fetch: Callable[[float, float, str, str], Awaitable[Optional[ForecastFrame]]],
+                       latitude: float, longitude: float, start: DateLike, end: DateLike) -> int:
+        """Fetch and store only the missing days; returns how many ranges were requested"""
+        start = _to_date(start)
+        end = min(_to_date(end), date.today() - timedelta(days=ARCHIVE_DELAY_DAYS))
+        if end < start:
+            return 0
+        ranges = self.missing_ranges(latitude, longitude, start, end)
+        frames = await asyncio.gather(*(fetch(latitude, longitude, first.isoformat(), last.isoformat())
+                                        for first, last in ranges))
+        for frame in frames:
+            if frame is not None:
+                self.write(latitude, longitude, frame)
+        return len(ranges)
+    
+    def ingest_csv(self, latitude: float, longitude: float, path: str):
+        """Load a local fixture: a CSV with a ``date`` column and any of the archive columns"""
+        df = pd.read_csv(path)
+        columns = {"date": df["date"].astype(str).to_numpy()}
+        columns.update({name: df[name].to_numpy(dtype=np.float64) for name in COLUMNS if name in df})
+        self.write(latitude, longitude, ForecastFrame(columns, "date"))
+
+_default_archive: Optional[WeatherArchive] = None
+_default_archive_lock = threading.Lock()
+
+def get_default_archive() -> WeatherArchive:
+    """Process-wide archive at ``AGRI_ARCHIVE_PATH`` (default ``~/.agri_assistant/archive``)"""
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = WeatherArchive(os.environ.get(
+                "AGRI_ARCHIVE_PATH", os.path.join(os.path.expanduser("~"), ".agri_assistant", "archive")
+            ))
+        return _default_archive
@@ -1,151 +1,587 @@
-import requests
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import asyncio
+import contextvars
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
 import streamlit as st
+from cache_backend import CacheBackend, get_default_cache, make_key
+from forecast_frame import ForecastFrame
+from geo_grid import CoordinateQuantizer
+from geocoding import Gazetteer, LocationSearch
+from reverse_geocoder import ReverseGeocoder, get_reverse_geocoder
+from weather_alerts import AlertEngine
+from weather_archive import ARCHIVE_DAILY_COLUMNS, WeatherArchive, get_default_archive
 
-class WeatherService:
-    """Service for fetching weather data from Open-Meteo API"""
+logger = logging.getLogger(__name__)
+
+# Variables requested from the Open-Meteo /forecast endpoint for each block
+CURRENT_VARIABLES = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "precipitation",
+    "wind_speed_10m",
+    "wind_direction_10m"
+]
+DAILY_VARIABLES = [
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "precipitation_sum",
+    "wind_speed_10m_max",
+    "relative_humidity_2m_mean"
+]
+HOURLY_VARIABLES = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "precipitation",
+    "wind_speed_10m"
+]
+
+# ForecastFrame column name -> Open-Meteo variable
+DAILY_COLUMNS = {
+    "temp_max": "temperature_2m_max",
+    "temp_min": "temperature_2m_min",
+    "precipitation": "precipitation_sum",
+    "wind_speed": "wind_speed_10m_max",
+    "humidity": "relative_humidity_2m_mean"
+}
+HOURLY_COLUMNS = {
+    "temperature": "temperature_2m",
+    "humidity": "relative_humidity_2m",
+    "precipitation": "precipitation",
+    "wind_speed": "wind_speed_10m"
+}
+
+# Seconds cached results stay valid
+WEATHER_CACHE_TTL = 300
+GEOCODING_CACHE_TTL = 3600
+
+# Coordinates sent per multi-location request (keeps the query string a few KB)
+MAX_LOCATIONS_PER_REQUEST = 100
+
+# Responses worth retrying with backoff
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Cache keys whose hits are counted for refresh-ahead; the least recently hit are forgotten
+HIT_COUNT_ENTRIES = 4096
+
+# (level, message) pairs collected for the caller of the sync wrapper
+_reports: contextvars.ContextVar[Optional[List[Tuple[str, str]]]] = contextvars.ContextVar(
+    "weather_service_reports", default=None
+)
+
+class AsyncWeatherService:
+    """Asynchronous service for fetching weather data from Open-Meteo API"""
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_concurrency: int = 10, per_host_limit: int = 6,
+                 max_keepalive: Optional[int] = None, timeout: float = 10,
+                 cache: Optional[CacheBackend] = None, quantizer: Optional[CoordinateQuantizer] = None,
+                 max_staleness: float = 0, refresh_ahead_fraction: float = 0.8, popular_threshold: int = 3,
+                 gazetteer: Optional[Gazetteer] = None, reverse_geocoder: Optional[ReverseGeocoder] = None,
+                 offline_radius_km: float = 40.0, archive: Optional[WeatherArchive] = None):
         self.base_url = "https://api.open-meteo.com/v1"
+        self.archive_url = "https://archive-api.open-meteo.com/v1/archive"
         self.geocoding_url = "https://geocoding-api.open-meteo.com/v1"
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size if max_keepalive is None else max_keepalive
+        )
+        
+        # Created on first use so they bind to the event loop that runs the service
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        # Results keyed on quantized grid cells, shared by the single and batch fetchers
+        self.cache = cache if cache is not None else get_default_cache()
+        # Nearby coordinates snap to one cell so they share an upstream call
+        self.quantizer = quantizer if quantizer is not None else CoordinateQuantizer()
+        
+        # Stale-while-revalidate: seconds past expiry an entry may still be served
+        # while it refreshes in the background (0 disables it)
+        self.max_staleness = max_staleness
+        self.refresh_ahead_fraction = refresh_ahead_fraction
+        self.popular_threshold = popular_threshold
+        self._hit_counts: "OrderedDict[str, int]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        
+        # Single-flight: identical concurrent requests share one upstream call
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self.requests_issued = 0
+        self.requests_coalesced = 0
+        
+        # Place search: gazetteer and prefix cache first, then rate-limited Nominatim
+        self.geocoder = LocationSearch(self._get_json, self.cache, gazetteer)
+        # Coordinates within this distance of a bundled place are named without a network call
+        self._reverse_geocoder = reverse_geocoder
+        self.offline_radius_km = offline_radius_km
+        
+        self.alert_engine = AlertEngine()
+        
+        # Season-to-date history on disk, created on first use
+        self._archive = archive
     
-    @st.cache_data(ttl=300)  # Cache for 5 minutes
-    def get_current_weather(_self, latitude: float, longitude: float) -> Optional[Dict]:
+    async def __aenter__(self) -> "AsyncWeatherService":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Cancel pending background refreshes and close pooled connections"""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                headers={'User-Agent': 'Agricultural-Assistant/1.0'}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+    
+    async def _get_json(self, url: str, params: Dict):
+        """GET a JSON document, joining an identical request already in flight.
+        
+        Coalesced callers share the decoded document, so parsers must not mutate it.
+        """
+        flight_key = (url, tuple(sorted(
+            (name, ",".join(map(str, value)) if isinstance(value, list) else str(value))
+            for name, value in params.items()
+        )))
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            self.requests_issued += 1
+            task = asyncio.ensure_future(self._request_json(url, params))
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda done: self._in_flight.pop(flight_key, None))
+        else:
+            self.requests_coalesced += 1
+        # Shielded so one caller giving up doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    def flight_stats(self) -> Dict:
+        """Upstream requests issued versus callers that joined one already in flight"""
+        calls = self.requests_issued + self.requests_coalesced
+        return {
+            "issued": self.requests_issued,
+            "coalesced": self.requests_coalesced,
+            "in_flight": len(self._in_flight),
+            "coalesced_rate": self.requests_coalesced / calls if calls else 0.0
+        }
+    
+    async def _request_json(self, url: str, params: Dict):
+        """GET a JSON document, retrying throttling and server errors with exponential backoff"""
+        client = self._get_client()
+        host = urlsplit(url).netloc
+        host_semaphore = self._host_semaphores.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+        
+        attempt = 0
+        while True:
+            async with self._semaphore, host_semaphore:
+                try:
+                    response = await client.get(url, params=params)
+                except httpx.TransportError:
+                    if attempt >= self.max_retries:
+                        raise
+                    response = None
+            
+            if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= self.max_retries):
+                response.raise_for_status()
+                return response.json()
+            
+            # Sleep outside the semaphores so other requests can proceed
+            await asyncio.sleep(self._retry_delay(response, attempt))
+            attempt += 1
+    
+    def _retry_delay(self, response: Optional[httpx.Response], attempt: int) -> float:
+        """Backoff delay, honouring a Retry-After header when the server sends one"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now().astimezone()).total_seconds())
+                except (TypeError, ValueError):
+                    pass
+        return self.backoff_factor * (2 ** attempt)
+    
+    @staticmethod
+    def _report(level: str, message: str):
+        """Hand an error message to the sync wrapper's caller, or log it"""
+        reports = _reports.get()
+        if reports is not None:
+            reports.append((level, message))
+        else:
+            logger.log(logging.ERROR if level == "error" else logging.WARNING, message)
+    
+    @staticmethod
+    def _cache_key(kind: str, *parts: Hashable) -> str:
+        return make_key(f"weather:{kind}", *parts)
+    
+    def clear_cache(self):
+        """Drop all cached weather and geocoding results"""
+        self.cache.clear("weather:")
+    
+    async def _cached(self, key: str, fetch: Callable[[], Awaitable], ttl: float = WEATHER_CACHE_TTL):
+        """Serve ``key`` from cache, falling back to ``fetch``.
+        
+        With ``max_staleness`` set, an expired entry younger than that is served
+        immediately while a background task refreshes it; popular entries are
+        refreshed ahead of expiry. Returns ``(value, age_seconds)``.
+        """
+        entry = self.cache.get_entry(key)
+        if entry is not None:
+            age = entry.age
+            if entry.is_fresh:
+                # Re-inserting keeps the dict in least-recently-hit order
+                hits = self._hit_counts.pop(key, 0) + 1
+                self._hit_counts[key] = hits
+                if len(self._hit_counts) > HIT_COUNT_ENTRIES:
+                    self._hit_counts.popitem(last=False)
+                if (self.max_staleness > 0 and hits >= self.popular_threshold and
+                        age >= ttl * self.refresh_ahead_fraction):
+                    self._schedule_refresh(key, fetch, ttl)
+                return entry.value, age
+            if age - ttl <= self.max_staleness:
+                self._schedule_refresh(key, fetch, ttl)
+                return entry.value, age
+        
+        value = await fetch()
+        self.cache.set(key, value, ttl, stale_ttl=self.max_staleness)
+        return value, 0.0
+    
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable], ttl: float):
+        """Refresh a cache entry on the running event loop unless a refresh is already underway"""
+        if key in self._refreshing:
+            return
+        
+        async def refresh():
+            try:
+                value = await fetch()
+                self.cache.set(key, value, ttl, stale_ttl=self.max_staleness)
+                self._hit_counts.pop(key, None)
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+            finally:
+                self._refreshing.pop(key, None)
+        
+        # Keep a reference so the task isn't garbage collected mid-flight
+        self._refreshing[key] = asyncio.get_running_loop().create_task(refresh())
+    
+    @staticmethod
+    def _with_age(value, age: float):
+        """Copy of a served weather result tagged with its cache age (data is not copied)"""
+        age = round(age, 1)
+        if isinstance(value, ForecastFrame):
+            return value.with_meta(age_seconds=age)
+        if isinstance(value, dict):
+            served = dict(value, age_seconds=age)
+            for part in ("current", "daily", "hourly"):
+                if part in served:
+                    served[part] = AsyncWeatherService._with_age(served[part], age)
+            return served
+        return value
+    
+    async def get_current_weather(self, latitude: float, longitude: float) -> Optional[Dict]:
         """Fetch current weather conditions"""
-        try:
-            url = f"{_self.base_url}/forecast"
+        cell = self.quantizer.snap(latitude, longitude)
+        
+        async def fetch():
+            url = f"{self.base_url}/forecast"
             params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "current": [
-                    "temperature_2m",
-                    "relative_humidity_2m", 
-                    "precipitation",
-                    "wind_speed_10m",
-                    "wind_direction_10m"
-                ],
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+                "current": CURRENT_VARIABLES,
                 "timezone": "auto"
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            current = data["current"]
-            return {
-                "temperature": current["temperature_2m"],
-                "humidity": current["relative_humidity_2m"],
-                "precipitation": current["precipitation"],
-                "wind_speed": current["wind_speed_10m"],
-                "wind_direction": current["wind_direction_10m"],
-                "timestamp": current["time"]
-            }
-            
+            data = await self._get_json(url, params)
+            return self._parse_current(data["current"], cell)
+        
+        try:
+            current, age = await self._cached(self._cache_key("current", cell["key"]), fetch)
+            return self._with_age(current, age)
+        
         except Exception as e:
-            st.error(f"Error fetching current weather: {str(e)}")
+            self._report("error", f"Error fetching current weather: {str(e)}")
             return None
     
-    @st.cache_data(ttl=300)
-    def get_daily_forecast(_self, latitude: float, longitude: float, days: int = 7) -> Optional[List[Dict]]:
+    async def get_daily_forecast(self, latitude: float, longitude: float, days: int = 7) -> Optional[ForecastFrame]:
         """Fetch daily weather forecast"""
-        try:
-            url = f"{_self.base_url}/forecast"
+        cell = self.quantizer.snap(latitude, longitude)
+        
+        async def fetch():
+            url = f"{self.base_url}/forecast"
             params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "daily": [
-                    "temperature_2m_max",
-                    "temperature_2m_min",
-                    "precipitation_sum",
-                    "wind_speed_10m_max",
-                    "relative_humidity_2m_mean"
-                ],
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+                "daily": DAILY_VARIABLES,
                 "forecast_days": days,
                 "timezone": "auto"
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            daily = data["daily"]
-            forecast = []
-            
-            for i in range(len(daily["time"])):
-                forecast.append({
-                    "date": daily["time"][i],
-                    "temp_max": daily["temperature_2m_max"][i],
-                    "temp_min": daily["temperature_2m_min"][i],
-                    "precipitation": daily["precipitation_sum"][i],
-                    "wind_speed": daily["wind_speed_10m_max"][i],
-                    "humidity": daily["relative_humidity_2m_mean"][i]
-                })
-            
-            return forecast
-            
+            data = await self._get_json(url, params)
+            return self._parse_daily(data["daily"], cell)
+        
+        try:
+            forecast, age = await self._cached(self._cache_key("daily", cell["key"], days), fetch)
+            return self._with_age(forecast, age)
+        
         except Exception as e:
-            st.error(f"Error fetching daily forecast: {str(e)}")
+            self._report("error", f"Error fetching daily forecast: {str(e)}")
             return None
     
-    @st.cache_data(ttl=300)
-    def get_hourly_forecast(_self, latitude: float, longitude: float, hours: int = 24) -> Optional[List[Dict]]:
+    async def get_hourly_forecast(self, latitude: float, longitude: float, hours: int = 24) -> Optional[ForecastFrame]:
         """Fetch hourly weather forecast"""
-        try:
-            url = f"{_self.base_url}/forecast"
+        cell = self.quantizer.snap(latitude, longitude)
+        
+        async def fetch():
+            url = f"{self.base_url}/forecast"
             params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "hourly": [
-                    "temperature_2m",
-                    "relative_humidity_2m",
-                    "precipitation",
-                    "wind_speed_10m"
-                ],
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+                "hourly": HOURLY_VARIABLES,
                 "forecast_hours": hours,
                 "timezone": "auto"
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(url, params)
+            return self._parse_hourly(data["hourly"], cell)
+        
+        try:
+            forecast, age = await self._cached(self._cache_key("hourly", cell["key"], hours), fetch)
+            return self._with_age(forecast, age)
+        
+        except Exception as e:
+            self._report("error", f"Error fetching hourly forecast: {str(e)}")
+            return None
+    
+    async def get_weather_bundle(self, latitude: float, longitude: float, days: int = 7,
+                                 hours: int = 24, past_days: int = 0) -> Optional[Dict]:
+        """Fetch current conditions, daily and hourly forecast in a single request.
+        
+        ``past_days`` prepends that many days of recent history to the daily and
+        hourly blocks (used to back-fill offline stores).
+        """
+        cell = self.quantizer.snap(latitude, longitude)
+        
+        async def fetch():
+            url = f"{self.base_url}/forecast"
+            params = {
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+                "current": CURRENT_VARIABLES,
+                "daily": DAILY_VARIABLES,
+                "hourly": HOURLY_VARIABLES,
+                "forecast_days": days,
+                "forecast_hours": hours,
+                "timezone": "auto"
+            }
+            if past_days:
+                params["past_days"] = past_days
+                params["past_hours"] = past_days * 24
             
-            hourly = data["hourly"]
-            forecast = []
+            data = await self._get_json(url, params)
             
-            for i in range(len(hourly["time"])):
-                forecast.append({
-                    "time": hourly["time"][i],
-                    "temperature": hourly["temperature_2m"][i],
-                    "humidity": hourly["relative_humidity_2m"][i],
-                    "precipitation": hourly["precipitation"][i],
-                    "wind_speed": hourly["wind_speed_10m"][i]
+            bundle = {
+                "current": self._parse_current(data["current"], cell),
+                "daily": self._parse_daily(data["daily"], cell),
+                "hourly": self._parse_hourly(data["hourly"], cell),
+                "grid_cell": cell
+            }
+            if past_days:
+                return bundle
+            # Later single-block lookups for this cell are cache hits too
+            for key, value in ((self._cache_key("current", cell["key"]), bundle["current"]),
+                               (self._cache_key("daily", cell["key"], days), bundle["daily"]),
+                               (self._cache_key("hourly", cell["key"], hours), bundle["hourly"])):
+                self.cache.set(key, value, WEATHER_CACHE_TTL, stale_ttl=self.max_staleness)
+            return bundle
+        
+        try:
+            bundle, age = await self._cached(self._cache_key("bundle", cell["key"], days, hours, past_days), fetch)
+            return self._with_age(bundle, age)
+        
+        except Exception as e:
+            self._report("error", f"Error fetching weather data: {str(e)}")
+            return None
+    
+    async def get_current_weather_many(self, locations: Dict[Hashable, Tuple[float, float]],
+                                       chunk_size: int = MAX_LOCATIONS_PER_REQUEST) -> Dict[Hashable, Optional[Dict]]:
+        """Fetch current conditions for many plots, keyed by plot ID"""
+        return await self._fetch_many(
+            locations, "current", (), {"current": CURRENT_VARIABLES},
+            lambda data, cell: self._parse_current(data["current"], cell), chunk_size
+        )
+    
+    async def get_daily_forecast_many(self, locations: Dict[Hashable, Tuple[float, float]], days: int = 7,
+                                      chunk_size: int = MAX_LOCATIONS_PER_REQUEST) -> Dict[Hashable, Optional[ForecastFrame]]:
+        """Fetch daily forecasts for many plots, keyed by plot ID"""
+        return await self._fetch_many(
+            locations, "daily", (days,), {"daily": DAILY_VARIABLES, "forecast_days": days},
+            lambda data, cell: self._parse_daily(data["daily"], cell), chunk_size
+        )
+    
+    async def _fetch_many(self, locations: Dict[Hashable, Tuple[float, float]], kind: str, extra: Tuple,
+                          params: Dict, parse, chunk_size: int) -> Dict:
+        """Resolve plots from the grid-cell cache, fetching the rest in concurrent multi-location requests"""
+        results = {}
+        # Plots in the same grid cell share one slot in the request
+        cells: Dict[str, Dict] = {}
+        pending: Dict[str, List[Hashable]] = {}
+        for plot_id, (latitude, longitude) in locations.items():
+            cell = self.quantizer.snap(latitude, longitude)
+            entry = self.cache.get_entry(self._cache_key(kind, cell["key"], *extra))
+            if entry is not None and entry.is_fresh:
+                results[plot_id] = self._with_age(entry.value, entry.age)
+            else:
+                cells[cell["key"]] = cell
+                pending.setdefault(cell["key"], []).append(plot_id)
+        
+        async def fetch_chunk(chunk: List[str]):
+            try:
+                url = f"{self.base_url}/forecast"
+                chunk_params = dict(params)
+                chunk_params.update({
+                    "latitude": ",".join(str(cells[cell_key]["latitude"]) for cell_key in chunk),
+                    "longitude": ",".join(str(cells[cell_key]["longitude"]) for cell_key in chunk),
+                    "timezone": "auto"
                 })
+                
+                data = await self._get_json(url, chunk_params)
+                # Open-Meteo returns a list for several coordinates, a single object for one
+                if isinstance(data, dict):
+                    data = [data]
+                # Results are matched to plots by position, so a short reply would misattribute them
+                if not isinstance(data, list) or len(data) != len(chunk):
+                    received = len(data) if isinstance(data, list) else type(data).__name__
+                    raise ValueError(f"expected {len(chunk)} locations in response, got {received}")
+                
+                for cell_key, location_data in zip(chunk, data):
+                    value = parse(location_data, cells[cell_key])
+                    self.cache.set(self._cache_key(kind, cell_key, *extra), value, WEATHER_CACHE_TTL,
+                                   stale_ttl=self.max_staleness)
+                    for plot_id in pending[cell_key]:
+                        results[plot_id] = self._with_age(value, 0.0)
             
-            return forecast
+            except Exception as e:
+                self._report("error", f"Error fetching weather for {len(chunk)} locations: {str(e)}")
+        
+        keys = list(pending)
+        await asyncio.gather(*(fetch_chunk(keys[start:start + chunk_size])
+                               for start in range(0, len(keys), chunk_size)))
+        
+        return {plot_id: results.get(plot_id) for plot_id in locations}
+    
+    @property
+    def archive(self) -> WeatherArchive:
+        if self._archive is None:
+            self._archive = get_default_archive()
+        return self._archive
+    
+    async def get_daily_archive(self, latitude: float, longitude: float, start_date: str,
+                                end_date: str) -> Optional[ForecastFrame]:
+        """Fetch observed daily weather for a past date range from the Open-Meteo archive"""
+        cell = self.quantizer.snap(latitude, longitude)
+        try:
+            params = {
+                "latitude": cell["latitude"],
+                "longitude": cell["longitude"],
+                "start_date": start_date,
+                "end_date": end_date,
+                "daily": list(ARCHIVE_DAILY_COLUMNS.values()),
+                "timezone": "auto"
+            }
             
+            data = await self._get_json(self.archive_url, params)
+            history = ForecastFrame.from_open_meteo(data["daily"], ARCHIVE_DAILY_COLUMNS, "date")
+            history.meta["grid_cell"] = cell
+            return history
+        
         except Exception as e:
-            st.error(f"Error fetching hourly forecast: {str(e)}")
+            self._report("error", f"Error fetching weather history: {str(e)}")
             return None
     
-    def check_weather_alerts(self, current_weather: Dict, daily_forecast: Dict) -> List[Dict]:
-        """Check for weather conditions that might affect crops"""
+    async def get_weather_history(self, latitude: float, longitude: float, start_date: str,
+                                  end_date: str) -> ForecastFrame:
+        """Daily history for a season, downloading only the days not yet archived on disk"""
+        await self.archive.backfill(self.get_daily_archive, latitude, longitude, start_date, end_date)
+        return self.archive.query(latitude, longitude, start_date, end_date)
+    
+    @staticmethod
+    def _parse_current(current: Dict, cell: Optional[Dict] = None) -> Dict:
+        """Convert an Open-Meteo ``current`` block to our current-weather shape"""
+        return {
+            "temperature": current["temperature_2m"],
+            "humidity": current["relative_humidity_2m"],
+            "precipitation": current["precipitation"],
+            "wind_speed": current["wind_speed_10m"],
+            "wind_direction": current["wind_direction_10m"],
+            "timestamp": current["time"],
+            "grid_cell": cell
+        }
+    
+    @staticmethod
+    def _parse_daily(daily: Dict, cell: Optional[Dict] = None) -> ForecastFrame:
+        """Convert an Open-Meteo ``daily`` block to a ForecastFrame keyed by ``date``"""
+        forecast = ForecastFrame.from_open_meteo(daily, DAILY_COLUMNS, "date")
+        forecast.meta["grid_cell"] = cell
+        return forecast
+    
+    @staticmethod
+    def _parse_hourly(hourly: Dict, cell: Optional[Dict] = None) -> ForecastFrame:
+        """Convert an Open-Meteo ``hourly`` block to a ForecastFrame keyed by ``time``"""
+        forecast = ForecastFrame.from_open_meteo(hourly, HOURLY_COLUMNS, "time")
+        forecast.meta["grid_cell"] = cell
+        return forecast
+    
+    def check_weather_alerts(self, current_weather: Dict, daily_forecast,
+                             hourly_forecast: Optional[ForecastFrame] = None) -> List[Dict]:
+        """Check for weather conditions that might affect crops.
+        
+        ``daily_forecast`` may be a single day (dict) or a full ForecastFrame; with
+        frames, forecast alerts come from the alert engine as intervals with
+        ``start``/``end`` times over the whole horizon. With an hourly forecast,
+        the engine's Frost Risk, Heat Stress and High Wind rules cover the
+        current hour too, so the current-conditions versions are skipped.
+        """
         alerts = []
+        hourly = hourly_forecast is not None
         
         # Temperature alerts
         if current_weather["temperature"] < 0:
-            alerts.append({
-                "type": "Frost Warning",
-                "message": "Freezing temperatures detected. Protect sensitive crops immediately.",
-                "severity": "error"
-            })
+            if not hourly:
+                alerts.append({
+                    "type": "Frost Warning",
+                    "message": "Freezing temperatures detected. Protect sensitive crops immediately.",
+                    "severity": "error"
+                })
         elif current_weather["temperature"] < 5:
             alerts.append({
                 "type": "Cold Warning",
                 "message": "Low temperatures may slow crop growth and increase disease risk.",
                 "severity": "warning"
             })
-        elif current_weather["temperature"] > 35:
+        elif current_weather["temperature"] > 35 and not hourly:
             alerts.append({
                 "type": "Heat Stress",
                 "message": "High temperatures may stress crops. Ensure adequate irrigation.",
@@ -153,15 +589,19 @@ class WeatherService:
             })
         
         # Wind alerts
-        if current_weather["wind_speed"] > 50:
+        if current_weather["wind_speed"] > 50 and not hourly:
             alerts.append({
                 "type": "High Wind Warning",
                 "message": "Strong winds may damage crops and affect spraying operations.",
                 "severity": "warning"
             })
         
+        if isinstance(daily_forecast, ForecastFrame) or hourly_forecast is not None:
+            daily = daily_forecast if isinstance(daily_forecast, ForecastFrame) else None
+            alerts.extend(self.alert_engine.evaluate(daily, hourly_forecast))
+        
         # Precipitation alerts
-        if daily_forecast["precipitation"] > 25:
+        elif daily_forecast["precipitation"] > 25:
             alerts.append({
                 "type": "Heavy Rain Expected",
                 "message": "Heavy rainfall forecasted. Avoid field operations and monitor for waterlogging.",
@@ -184,9 +624,25 @@ class WeatherService:
         
         return alerts
     
-    @st.cache_data(ttl=3600)  # Cache for 1 hour since location names don't change frequently
-    def get_location_name(_self, latitude: float, longitude: float) -> Optional[str]:
-        """Get location name from coordinates using reverse geocoding"""
+    @property
+    def reverse_geocoder(self) -> ReverseGeocoder:
+        if self._reverse_geocoder is None:
+            self._reverse_geocoder = get_reverse_geocoder()
+        return self._reverse_geocoder
+    
+    async def get_location_name(self, latitude: float, longitude: float) -> Optional[str]:
+        """Get location name from coordinates, offline when a bundled place is close enough"""
+        key = self._cache_key("location_name", latitude, longitude)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        place, distance = self.reverse_geocoder.nearest(latitude, longitude)
+        if distance <= self.offline_radius_km:
+            name = self.reverse_geocoder.format_place(place)
+            self.cache.set(key, name, GEOCODING_CACHE_TTL)
+            return name
+        
         try:
             # Use a simple reverse geocoding API to get location name
             url = "https://api.bigdatacloud.net/data/reverse-geocode-client"
@@ -196,9 +652,7 @@ class WeatherService:
                 "localityLanguage": "en"
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._get_json(url, params)
             
             # Extract location components
             city = data.get('city', '')
@@ -221,81 +675,30 @@ class WeatherService:
                 location_parts.append(country)
             
             if location_parts:
-                return ", ".join(location_parts[:3])  # Limit to 3 components max
+                name = ", ".join(location_parts[:3])  # Limit to 3 components max
             else:
-                return f"Location ({latitude:.2f}, {longitude:.2f})"
-                
+                name = f"Location ({latitude:.2f}, {longitude:.2f})"
+            self.cache.set(key, name, GEOCODING_CACHE_TTL)
+            return name
+        
         except Exception as e:
-            st.warning(f"Could not detect location name: {str(e)}")
+            self._report("warning", f"Could not detect location name: {str(e)}")
+            if distance <= 4 * self.offline_radius_km:
+                return f"Near {self.reverse_geocoder.format_place(place)}"
             return f"Farm Location ({latitude:.2f}, {longitude:.2f})"
     
-    @st.cache_data(ttl=3600)
-    def search_locations(_self, query: str) -> List[Dict]:
-        """Search for locations using geocoding API"""
-        if not query or len(query) < 2:
-            return []
-        
+    async def search_locations(self, query: str) -> List[Dict]:
+        """Search for locations by name"""
         try:
-            # Use OpenStreetMap Nominatim for location search
-            url = "https://nominatim.openstreetmap.org/search"
-            params = {
-                "q": query,
-                "format": "json",
-                "limit": 8,
-                "addressdetails": 1,
-                "extratags": 1
-            }
-            
-            headers = {
-                'User-Agent': 'Agricultural-Assistant/1.0'
-            }
-            
-            response = requests.get(url, params=params, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            locations = []
-            for item in data:
-                # Extract relevant information
-                display_name = item.get('display_name', '')
-                lat = float(item.get('lat', 0))
-                lon = float(item.get('lon', 0))
-                
-                # Build clean location name
-                address = item.get('address', {})
-                city = address.get('city', address.get('town', address.get('village', '')))
-                state = address.get('state', address.get('region', ''))
-                country = address.get('country', '')
-                
-                # Create a clean, readable location name
-                location_parts = []
-                if city:
-                    location_parts.append(city)
-                if state and state != city:
-                    location_parts.append(state)
-                if country and len(location_parts) < 2:
-                    location_parts.append(country)
-                
-                clean_name = ", ".join(location_parts[:3]) if location_parts else display_name
-                
-                locations.append({
-                    'name': clean_name,
-                    'display_name': display_name,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'address': address
-                })
-            
-            return locations
-            
+            return await self.geocoder.search(query)
+        
         except Exception as e:
-            st.warning(f"Location search failed: {str(e)}")
+            self._report("warning", f"Location search failed: {str(e)}")
             return []
     
-    @st.cache_data(ttl=3600)
-    def get_coordinates_from_location(_self, location_name: str) -> Optional[Dict]:
+    async def get_coordinates_from_location(self, location_name: str) -> Optional[Dict]:
         """Get coordinates from location name"""
-        locations = _self.search_locations(location_name)
+        locations = await self.search_locations(location_name)
         if locations:
             return {
                 'latitude': locations[0]['latitude'],
@@ -304,3 +707,137 @@ class WeatherService:
                 'display_name': locations[0]['display_name']
             }
         return None
+
+
+class _EventLoopThread:
+    """Event loop running on a daemon thread, shared by every sync WeatherService"""
+    
+    _lock = threading.Lock()
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @classmethod
+    def get_loop(cls) -> asyncio.AbstractEventLoop:
+        with cls._lock:
+            if cls._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="weather-service-loop", daemon=True).start()
+                cls._loop = loop
+            return cls._loop
+
+
+async def _collect_reports(coro: Awaitable):
+    """Run a coroutine and return its result with any error messages it reported"""
+    reports: List[Tuple[str, str]] = []
+    _reports.set(reports)
+    return await coro, reports
+
+
+class WeatherService:
+    """Service for fetching weather data from Open-Meteo API"""
+    
+    def __init__(self, pool_size: int = 10, max_retries: int = 3, backoff_factor: float = 0.5,
+                 max_concurrency: int = 10, per_host_limit: int = 6, max_keepalive: Optional[int] = None,
+                 cache: Optional[CacheBackend] = None, quantizer: Optional[CoordinateQuantizer] = None,
+                 max_staleness: float = 0, gazetteer: Optional[Gazetteer] = None,
+                 reverse_geocoder: Optional[ReverseGeocoder] = None):
+        self.async_service = AsyncWeatherService(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            max_concurrency=max_concurrency,
+            per_host_limit=per_host_limit,
+            max_keepalive=max_keepalive,
+            cache=cache,
+            quantizer=quantizer,
+            max_staleness=max_staleness,
+            gazetteer=gazetteer,
+            reverse_geocoder=reverse_geocoder
+        )
+    
+    @property
+    def cache(self) -> CacheBackend:
+        return self.async_service.cache
+    
+    @property
+    def base_url(self) -> str:
+        return self.async_service.base_url
+    
+    @base_url.setter
+    def base_url(self, value: str):
+        self.async_service.base_url = value
+    
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the background loop without blocking the caller"""
+        return asyncio.run_coroutine_threadsafe(coro, _EventLoopThread.get_loop())
+    
+    def _run(self, coro: Awaitable):
+        """Run a coroutine on the background loop and surface its messages in Streamlit"""
+        result, reports = self.submit(_collect_reports(coro)).result()
+        for level, message in reports:
+            getattr(st, level)(message)
+        return result
+    
+    def close(self):
+        """Close pooled connections"""
+        self._run(self.async_service.aclose())
+    
+    def clear_cache(self):
+        """Drop cached weather and geocoding results"""
+        self.async_service.clear_cache()
+    
+    def flight_stats(self) -> Dict:
+        """Issued versus coalesced upstream requests"""
+        return self.async_service.flight_stats()
+    
+    def get_current_weather(self, latitude: float, longitude: float) -> Optional[Dict]:
+        """Fetch current weather conditions"""
+        return self._run(self.async_service.get_current_weather(latitude, longitude))
+    
+    def get_daily_forecast(self, latitude: float, longitude: float, days: int = 7) -> Optional[ForecastFrame]:
+        """Fetch daily weather forecast"""
+        return self._run(self.async_service.get_daily_forecast(latitude, longitude, days))
+    
+    def get_hourly_forecast(self, latitude: float, longitude: float, hours: int = 24) -> Optional[ForecastFrame]:
+        """Fetch hourly weather forecast"""
+        return self._run(self.async_service.get_hourly_forecast(latitude, longitude, hours))
+    
+    def get_weather_bundle(self, latitude: float, longitude: float, days: int = 7,
+                           hours: int = 24, past_days: int = 0) -> Optional[Dict]:
+        """Fetch current conditions, daily and hourly forecast in a single request"""
+        return self._run(self.async_service.get_weather_bundle(latitude, longitude, days, hours, past_days))
+    
+    def get_current_weather_many(self, locations: Dict[Hashable, Tuple[float, float]],
+                                 chunk_size: int = MAX_LOCATIONS_PER_REQUEST) -> Dict[Hashable, Optional[Dict]]:
+        """Fetch current conditions for many plots, keyed by plot ID"""
+        return self._run(self.async_service.get_current_weather_many(locations, chunk_size))
+    
+    def get_daily_forecast_many(self, locations: Dict[Hashable, Tuple[float, float]], days: int = 7,
+                                chunk_size: int = MAX_LOCATIONS_PER_REQUEST) -> Dict[Hashable, Optional[ForecastFrame]]:
+        """Fetch daily forecasts for many plots, keyed by plot ID"""
+        return self._run(self.async_service.get_daily_forecast_many(locations, days, chunk_size))
+    
+    def get_weather_history(self, latitude: float, longitude: float, start_date: str,
+                            end_date: str) -> ForecastFrame:
+        """Daily history for a season, served from the on-disk archive"""
+        return self._run(self.async_service.get_weather_history(latitude, longitude, start_date, end_date))
+    
+    def check_weather_alerts(self, current_weather: Dict, daily_forecast,
+                             hourly_forecast: Optional[ForecastFrame] = None) -> List[Dict]:
+        """Check for weather conditions that might affect crops"""
+        return self.async_service.check_weather_alerts(current_weather, daily_forecast, hourly_forecast)
+    
+    def get_location_name(self, latitude: float, longitude: float) -> Optional[str]:
+        """Get location name from coordinates using reverse geocoding"""
+        return self._run(self.async_service.get_location_name(latitude, longitude))
+    
+    def search_locations(self, query: str) -> List[Dict]:
+        """Search for locations by name"""
+        return self._run(self.async_service.search_locations(query))
+    
+    def remember_location(self, location: Dict):
+        """Rank a chosen search result higher in later searches"""
+        self.async_service.geocoder.gazetteer.record_use(location)
+    
+    def get_coordinates_from_location(self, location_name: str) -> Optional[Dict]:
+        """Get coordinates from location name"""
+        return self._run(self.async_service.get_coordinates_from_location(location_name))
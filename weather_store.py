@@ -0,0 +1,219 @@
+"""Offline-first weather store: recent weather for saved locations kept in SQLite"""
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+from forecast_frame import ForecastFrame
+from weather_service import AsyncWeatherService, DAILY_COLUMNS, HOURLY_COLUMNS
+
+CURRENT_FIELDS = ["temperature", "humidity", "precipitation", "wind_speed", "wind_direction"]
+
+# Seconds between network syncs of the same location
+SYNC_INTERVAL = 900
+
+class WeatherStore:
+    """Last ``retention_days`` of current, daily and hourly weather per saved location.
+    
+    Reads never touch the network, so the app can show the most recent data
+    instantly (and in the field with no signal). ``sync`` pulls new data when
+    the network is available: rows are upserted by timestamp, and a location
+    that has been offline for a while gets the missed hours back-filled.
+    """
+    
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, path: str, retention_days: int = 7):
+        self.path = path
+        self.retention_days = retention_days
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        # Read from the UI thread, written from sync's worker threads
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS locations (
+                location_id TEXT PRIMARY KEY, name TEXT, latitude REAL NOT NULL,
+                longitude REAL NOT NULL, synced_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS current (
+                location_id TEXT NOT NULL, time TEXT NOT NULL, fetched_at REAL NOT NULL,
+                {", ".join(f"{name} REAL" for name in CURRENT_FIELDS)},
+                PRIMARY KEY (location_id, time)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS daily (
+                location_id TEXT NOT NULL, date TEXT NOT NULL,
+                {", ".join(f"{name} REAL" for name in DAILY_COLUMNS)},
+                PRIMARY KEY (location_id, date)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS hourly (
+                location_id TEXT NOT NULL, time TEXT NOT NULL,
+                {", ".join(f"{name} REAL" for name in HOURLY_COLUMNS)},
+                PRIMARY KEY (location_id, time)
+            ) WITHOUT ROWID;
+        """)
+    
+    def save_location(self, location_id: str, latitude: float, longitude: float, name: Optional[str] = None):
+        """Add or move a saved location; its stored weather is kept if the coordinates are unchanged"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latitude, longitude FROM locations WHERE location_id = ?", (location_id,)
+            ).fetchone()
+            if row is not None and (row[0], row[1]) != (latitude, longitude):
+                self._delete_weather(location_id)
+                row = None
+            if row is None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO locations (location_id, name, latitude, longitude, synced_at) "
+                    "VALUES (?, ?, ?, ?, NULL)",
+                    (location_id, name, latitude, longitude)
+                )
+            else:
+                self._conn.execute("UPDATE locations SET name = ? WHERE location_id = ?", (name, location_id))
+    
+    def remove_location(self, location_id: str):
+        with self._lock:
+            self._delete_weather(location_id)
+            self._conn.execute("DELETE FROM locations WHERE location_id = ?", (location_id,))
+    
+    def _delete_weather(self, location_id: str):
+        for table in ("current", "daily", "hourly"):
+            self._conn.execute(f"DELETE FROM {table} WHERE location_id = ?", (location_id,))
+    
+    def locations(self) -> List[Dict]:
+        """Saved locations with the time of their last successful sync"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT location_id, name, latitude, longitude, synced_at FROM locations ORDER BY location_id"
+            ).fetchall()
+        return [
+            {"location_id": row[0], "name": row[1], "latitude": row[2], "longitude": row[3], "synced_at": row[4]}
+            for row in rows
+        ]
+    
+    def get_current(self, location_id: str) -> Optional[Dict]:
+        """Most recent stored conditions, with ``age_seconds`` since they were fetched"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT time, fetched_at, {', '.join(CURRENT_FIELDS)} FROM current "
+                "WHERE location_id = ? ORDER BY time DESC LIMIT 1",
+                (location_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        current = dict(zip(CURRENT_FIELDS, row[2:]))
+        current["timestamp"] = row[0]
+        current["age_seconds"] = round(time.time() - row[1], 1)
+        return current
+    
+    def get_daily(self, location_id: str, since: Optional[str] = None) -> ForecastFrame:
+        """Stored daily rows (history and forecast) from ``since`` (``YYYY-MM-DD``) onwards"""
+        return self._read_frame("daily", "date", list(DAILY_COLUMNS), location_id, since)
+    
+    def get_hourly(self, location_id: str, since: Optional[str] = None) -> ForecastFrame:
+        """Stored hourly rows from ``since`` (``YYYY-MM-DDTHH:MM``) onwards"""
+        return self._read_frame("hourly", "time", list(HOURLY_COLUMNS), location_id, since)
+    
+    def _read_frame(self, table: str, time_column: str, names: List[str], location_id: str,
+                    since: Optional[str]) -> ForecastFrame:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {time_column}, {', '.join(names)} FROM {table} "
+                f"WHERE location_id = ? AND {time_column} >= ? ORDER BY {time_column}",
+                (location_id, since or "")
+            ).fetchall()
+        # Transpose once into columns; NULLs become NaN like the API's missing values
+        values = list(zip(*rows)) if rows else [()] * (len(names) + 1)
+        columns = {time_column: np.asarray(values[0], dtype=str)}
+        for name, column in zip(names, values[1:]):
+            columns[name] = np.asarray(column, dtype=np.float64)
+        return ForecastFrame(columns, time_column, {"location_id": location_id})
+    
+    def last_synced(self, location_id: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM locations WHERE location_id = ?", (location_id,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def store_bundle(self, location_id: str, bundle: Dict):
+        """Upsert a ``get_weather_bundle`` result and drop rows past the retention window"""
+        now = time.time()
+        current = bundle["current"]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO current (location_id, time, fetched_at, {', '.join(CURRENT_FIELDS)}) "
+                    f"VALUES (?, ?, ?, {', '.join('?' * len(CURRENT_FIELDS))})",
+                    (location_id, current["timestamp"], now, *(current[name] for name in CURRENT_FIELDS))
+                )
+                self._upsert_frame("daily", "date", list(DAILY_COLUMNS), location_id, bundle["daily"])
+                self._upsert_frame("hourly", "time", list(HOURLY_COLUMNS), location_id, bundle["hourly"])
+                self._conn.execute("UPDATE locations SET synced_at = ? WHERE location_id = ?", (now, location_id))
+                self._prune(location_id)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def _upsert_frame(self, table: str, time_column: str, names: List[str], location_id: str,
+                      frame: ForecastFrame):
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {table} (location_id, {time_column}, {', '.join(names)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(names))})",
+            ((location_id, row[time_column], *(row[name] for name in names)) for row in frame)
+        )
+    
+    def _prune(self, location_id: str):
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        self._conn.execute("DELETE FROM current WHERE location_id = ? AND time < ?",
+                           (location_id, cutoff.strftime("%Y-%m-%dT%H:%M")))
+        self._conn.execute("DELETE FROM daily WHERE location_id = ? AND date < ?",
+                           (location_id, cutoff.strftime("%Y-%m-%d")))
+        self._conn.execute("DELETE FROM hourly WHERE location_id = ? AND time < ?",
+                           (location_id, cutoff.strftime("%Y-%m-%dT%H:%M")))
+    
+    async def sync(self, service: AsyncWeatherService, min_interval: float = SYNC_INTERVAL,
+                   days: int = 7, hours: int = 24) -> Dict[str, bool]:
+        """Fetch new data for saved locations not synced within ``min_interval`` seconds.
+        
+        Returns ``{location_id: synced}``; locations that fail (e.g. no network)
+        keep their stored data and are retried on the next call.
+        """
+        now = time.time()
+        # SQLite calls wait on the lock the UI thread reads under, so they run
+        # in worker threads to keep the event loop free for other requests
+        locations = await asyncio.to_thread(self.locations)
+        due = [location for location in locations
+               if location["synced_at"] is None or now - location["synced_at"] >= min_interval]
+        
+        async def sync_location(location: Dict) -> bool:
+            # Back-fill the hours missed since the last sync (the stored hourly
+            # block only reaches ``hours`` ahead of it)
+            past_days = 0
+            if location["synced_at"] is not None:
+                gap_hours = (now - location["synced_at"]) / 3600
+                if gap_hours > hours:
+                    past_days = min(self.retention_days, math.ceil(gap_hours / 24))
+            bundle = await service.get_weather_bundle(location["latitude"], location["longitude"],
+                                                      days, hours, past_days)
+            if bundle is None:
+                return False
+            await asyncio.to_thread(self.store_bundle, location["location_id"], bundle)
+            return True
+        
+        results = await asyncio.gather(*(sync_location(location) for location in due))
+        return {location["location_id"]: synced for location, synced in zip(due, results)}
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()